@@ -0,0 +1,85 @@
+"""
+Motor de reglas de alertas evaluadas al escribir
+Las reglas salen de la caché de referencia (ConfiguracionAlertas por granja);
+cada escritura evalúa solo el lote que tocó, dentro de su propia transacción.
+"""
+
+from datetime import datetime, timedelta
+from models import db, Notificacion
+from referencia import datos_referencia
+
+# Umbrales por defecto si la configuración no define uno
+UMBRALES_POR_DEFECTO = {
+    'alerta_capital_bajo': 20,
+    'alerta_mortalidad_alta': 5,
+}
+
+# Días sin repetir la alerta de capital bajo para un mismo lote
+DIAS_REPETICION_CAPITAL_BAJO = 3
+
+
+def obtener_reglas():
+    """Reglas activas {tipo_alerta: {'activa', 'umbral', 'dias_anticipacion'}}"""
+    return {
+        config['tipo_alerta']: {
+            'activa': config['activa'],
+            'umbral': config['umbral'] if config['umbral'] is not None else UMBRALES_POR_DEFECTO.get(config['tipo_alerta']),
+            'dias_anticipacion': config['dias_anticipacion']
+        }
+        for config in datos_referencia('configuracion_alertas')
+    }
+
+
+def _regla(tipo_alerta):
+    """Regla de un tipo; sin configuración se usa el umbral por defecto"""
+    regla = obtener_reglas().get(tipo_alerta)
+    if regla is None:
+        return {'activa': True, 'umbral': UMBRALES_POR_DEFECTO.get(tipo_alerta), 'dias_anticipacion': 0}
+    return regla
+
+
+def evaluar_capital(capital):
+    """Agrega a la sesión una alerta de capital bajo si el capital del lote cruzó el umbral"""
+    regla = _regla('alerta_capital_bajo')
+    if not regla['activa'] or capital is None or not capital.capital_inicial:
+        return None
+    
+    porcentaje_capital = float(capital.capital_actual / capital.capital_inicial * 100)
+    if porcentaje_capital >= regla['umbral']:
+        return None
+    
+    fecha_limite = datetime.utcnow() - timedelta(days=DIAS_REPETICION_CAPITAL_BAJO)
+    existe = db.session.query(Notificacion.id_notificacion).filter(
+        Notificacion.id_lote == capital.id_lote,
+        Notificacion.tipo_notificacion == 'alerta_capital_bajo',
+        Notificacion.fecha_creacion >= fecha_limite
+    ).first()
+    if existe:
+        return None
+    
+    notificacion = Notificacion(
+        id_lote=capital.id_lote,
+        tipo_notificacion='alerta_capital_bajo',
+        prioridad='alta',
+        titulo=f'💰 Capital Bajo en {capital.lote.nombre_lote}',
+        mensaje=f'El capital actual es {porcentaje_capital:.1f}% del inicial. Capital disponible: ${capital.capital_actual:,.0f}'
+    )
+    db.session.add(notificacion)
+    return notificacion
+
+
+def evaluar_mortalidad(lote, porcentaje_dia, cantidad_muertos):
+    """Agrega a la sesión una alerta si la mortalidad del día supera el umbral"""
+    regla = _regla('alerta_mortalidad_alta')
+    if not regla['activa'] or porcentaje_dia <= regla['umbral']:
+        return None
+    
+    notificacion = Notificacion(
+        id_lote=lote.id_lote,
+        tipo_notificacion='alerta_mortalidad_alta',
+        prioridad='alta',
+        titulo=f'⚠️ Mortalidad Alta en {lote.nombre_lote}',
+        mensaje=f'Se registró una mortalidad del {porcentaje_dia:.2f}% ({cantidad_muertos} pollos). Revisar el lote inmediatamente.'
+    )
+    db.session.add(notificacion)
+    return notificacion
@@ -0,0 +1,276 @@
+"""
+Archivo en frío de lotes cerrados
+Mueve el detalle de los lotes cerrados (movimientos, compras, ventas con sus
+créditos y pagos, mortalidad y cronograma) a las tablas *_archivo para que las
+tablas activas crezcan con la producción en curso y no con todo el histórico.
+Del lote quedan en caliente la fila del lote, su capital y el resumen de cierre.
+"""
+
+import time
+from datetime import date, timedelta
+from sqlalchemy import delete, exists, func, insert, select, union_all
+from models import (
+    db, Lote, LoteArchivado, MovimientoCapital, CompraMateriaPrima, Venta, VentaCredito,
+    PagoCliente, EventoCronograma, MortalidadLote, MovimientoCapitalArchivado,
+    CompraMateriaPrimaArchivada, VentaArchivada, VentaCreditoArchivada, PagoClienteArchivado,
+    EventoCronogramaArchivado, MortalidadLoteArchivada
+)
+from utils import invalidar_reportes
+
+# Modelo activo -> modelo de archivo, en orden de borrado (hijos antes que padres)
+MODELOS_ARCHIVO = {
+    MovimientoCapital: MovimientoCapitalArchivado,
+    CompraMateriaPrima: CompraMateriaPrimaArchivada,
+    MortalidadLote: MortalidadLoteArchivada,
+    EventoCronograma: EventoCronogramaArchivado,
+    PagoCliente: PagoClienteArchivado,
+    VentaCredito: VentaCreditoArchivada,
+    Venta: VentaArchivada,
+}
+
+
+# ============================================
+# LECTURA
+# ============================================
+
+def lote_archivado(id_lote):
+    """Indica si el detalle del lote ya se lee del archivo"""
+    return db.session.get(LoteArchivado, id_lote) is not None
+
+
+def modelo_detalle(modelo, id_lote):
+    """Modelo a consultar para el detalle de un lote: el de archivo si el lote se archivó"""
+    return MODELOS_ARCHIVO[modelo] if lote_archivado(id_lote) else modelo
+
+
+def modelo_pagos(id_credito):
+    """Modelo de pagos de un crédito: el de archivo si el crédito solo existe archivado"""
+    if db.session.get(VentaCredito, id_credito) is None and db.session.get(VentaCreditoArchivada, id_credito):
+        return PagoClienteArchivado
+    return PagoCliente
+
+
+def lote_admite_detalle(id_lote):
+    """Indica si el lote acepta nuevas filas de detalle (False si ya está archivado).
+    
+    Deja la fila del lote con un bloqueo compartido hasta el commit, como ya hace
+    la clave foránea del detalle que se inserta: archivar_lote la bloquea en
+    exclusiva para marcar el lote, así una escritura que pasó esta comprobación
+    se confirma antes de la marca y se copia con ella.
+    """
+    db.session.query(Lote.id_lote).filter_by(id_lote=id_lote).with_for_update(read=True).scalar()
+    return db.session.query(LoteArchivado.id_lote).filter_by(
+        id_lote=id_lote
+    ).with_for_update(read=True).scalar() is None
+
+
+def union_con_archivo(modelo, columnas, condicion=None):
+    """Subconsulta UNION ALL de la tabla activa y su archivo (modelo con id_lote).
+    
+    Cada lote se lee de una sola rama: el archivo para los lotes marcados en
+    lotes_archivados y la tabla activa para el resto. Mientras se archiva un
+    lote sus filas están en ambas tablas y así no se cuentan dos veces.
+    condicion recibe cada tabla y devuelve el filtro, que se aplica dentro de
+    cada rama para que use los índices de ambas tablas.
+    """
+    archivados = select(LoteArchivado.id_lote)
+    activa = modelo.__table__
+    archivo = MODELOS_ARCHIVO[modelo].__table__
+    
+    partes = []
+    for tabla, filtro in (
+        (activa, activa.c.id_lote.notin_(archivados)),
+        (archivo, archivo.c.id_lote.in_(archivados)),
+    ):
+        filtros = [filtro] if condicion is None else [filtro, condicion(tabla)]
+        partes.append(select(*[tabla.c[columna] for columna in columnas]).where(*filtros))
+    return union_all(*partes).subquery(modelo.__tablename__)
+
+
+# ============================================
+# ARCHIVADO
+# ============================================
+
+def _condicion_lote(modelo, id_lote):
+    """Filtro de las filas del lote en la tabla activa del modelo"""
+    ventas_lote = select(Venta.id_venta).where(Venta.id_lote == id_lote)
+    if modelo is VentaCredito:
+        return VentaCredito.id_venta.in_(ventas_lote)
+    if modelo is PagoCliente:
+        return PagoCliente.id_credito.in_(
+            select(VentaCredito.id_credito).where(VentaCredito.id_venta.in_(ventas_lote))
+        )
+    return modelo.id_lote == id_lote
+
+
+def _pk(tabla):
+    return tabla.primary_key.columns[0]
+
+
+def _mover_en_bloques(sentencias_bloque, tamano_lote):
+    """Ejecuta bloques (una transacción por bloque) hasta que uno queda incompleto"""
+    filas = 0
+    while True:
+        ids, sentencia = sentencias_bloque()
+        if not ids:
+            break
+        try:
+            db.session.execute(sentencia(ids))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        filas += len(ids)
+        if len(ids) < tamano_lote:
+            break
+    return filas
+
+
+def _copiar(modelo, id_lote, tamano_lote):
+    """Copia al archivo las filas del lote que aún no están allí"""
+    origen = modelo.__table__
+    archivo = MODELOS_ARCHIVO[modelo].__table__
+    pendientes = select(_pk(origen)).where(
+        _condicion_lote(modelo, id_lote),
+        ~exists().where(_pk(archivo) == _pk(origen))
+    ).order_by(_pk(origen)).limit(tamano_lote)
+    
+    def bloque():
+        ids = db.session.execute(pendientes).scalars().all()
+        return ids, lambda ids: insert(archivo).from_select(
+            [columna.name for columna in origen.columns],
+            select(*origen.columns).where(_pk(origen).in_(ids))
+        )
+    
+    return _mover_en_bloques(bloque, tamano_lote)
+
+
+def _copiar_restantes(modelo, id_lote):
+    """Copia en la transacción actual las filas del lote escritas después de la fase 1"""
+    origen = modelo.__table__
+    archivo = MODELOS_ARCHIVO[modelo].__table__
+    return db.session.execute(insert(archivo).from_select(
+        [columna.name for columna in origen.columns],
+        select(*origen.columns).where(
+            _condicion_lote(modelo, id_lote),
+            ~exists().where(_pk(archivo) == _pk(origen))
+        )
+    )).rowcount
+
+
+def _rango_fechas(id_lote):
+    """(primera, última) fecha del detalle del lote que leen los reportes; (None, None) sin detalle"""
+    fechas = union_all(*[
+        select(columna.label('fecha')).where(modelo.id_lote == id_lote)
+        for modelo, columna in (
+            (MovimientoCapital, MovimientoCapital.fecha_movimiento),
+            (CompraMateriaPrima, CompraMateriaPrima.fecha_compra),
+            (Venta, Venta.fecha_venta),
+        )
+    ]).subquery()
+    return db.session.execute(select(func.min(fechas.c.fecha), func.max(fechas.c.fecha))).one()
+
+
+def _marcar_archivado(id_lote, copiadas):
+    """Fase 2 en una sola transacción: completa la copia y marca el lote.
+    
+    El bloqueo exclusivo de la fila del lote espera a las escrituras que ya
+    pasaron lote_admite_detalle y frena las nuevas hasta el commit: al marcarlo
+    el archivo tiene todo el detalle del lote.
+    """
+    try:
+        db.session.query(Lote.id_lote).filter_by(id_lote=id_lote).with_for_update().scalar()
+        copiadas += sum(_copiar_restantes(modelo, id_lote) for modelo in MODELOS_ARCHIVO)
+        db.session.add(LoteArchivado(id_lote=id_lote, filas_archivadas=copiadas))
+        
+        # Reportes guardados durante el archivado (o antes de corregirse la lectura doble)
+        desde, hasta = _rango_fechas(id_lote)
+        if desde is not None:
+            invalidar_reportes(desde, hasta)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return copiadas
+
+
+def _borrar(modelo, id_lote, tamano_lote):
+    """Borra de la tabla activa las filas del lote que ya están en el archivo"""
+    origen = modelo.__table__
+    archivo = MODELOS_ARCHIVO[modelo].__table__
+    copiadas = select(_pk(origen)).where(
+        _condicion_lote(modelo, id_lote),
+        exists().where(_pk(archivo) == _pk(origen))
+    ).order_by(_pk(origen)).limit(tamano_lote)
+    
+    def bloque():
+        ids = db.session.execute(copiadas).scalars().all()
+        return ids, lambda ids: delete(origen).where(_pk(origen).in_(ids))
+    
+    return _mover_en_bloques(bloque, tamano_lote)
+
+
+def archivar_lote(id_lote, tamano_lote):
+    """Archiva el detalle de un lote en tres fases.
+    
+    1. Copia al archivo en bloques acotados (las lecturas siguen en la tabla activa).
+    2. Copia lo escrito entretanto y marca el lote en la misma transacción (las
+       lecturas pasan al archivo, ya completo; las escrituras se rechazan).
+    3. Borra de la tabla activa, en bloques, lo ya copiado.
+    Las lecturas de union_con_archivo toman cada lote de una sola tabla, así
+    que en ninguna fase ven filas de menos ni duplicadas. Repetirlo tras una
+    interrupción continúa donde quedó.
+    """
+    copiadas = 0
+    if not lote_archivado(id_lote):
+        copiadas = sum(_copiar(modelo, id_lote, tamano_lote) for modelo in MODELOS_ARCHIVO)
+        copiadas = _marcar_archivado(id_lote, copiadas)
+    
+    borradas = sum(_borrar(modelo, id_lote, tamano_lote) for modelo in MODELOS_ARCHIVO)
+    return copiadas, borradas
+
+
+def lotes_para_archivar(dias_cerrado):
+    """Lotes cerrados hace más de dias_cerrado días, sin créditos pendientes y aún con detalle en caliente"""
+    limite = date.today() - timedelta(days=dias_cerrado)
+    
+    creditos_pendientes = select(Venta.id_lote).join(
+        VentaCredito, VentaCredito.id_venta == Venta.id_venta
+    ).where(VentaCredito.estado_deuda != 'pagado')
+    
+    con_detalle = union_all(*[
+        select(modelo.id_lote)
+        for modelo in (MovimientoCapital, CompraMateriaPrima, MortalidadLote, EventoCronograma, Venta)
+    ])
+    
+    return db.session.execute(
+        select(Lote.id_lote).where(
+            Lote.estado == 'cerrado',
+            Lote.fecha_cierre <= limite,
+            Lote.id_lote.notin_(creditos_pendientes),
+            Lote.id_lote.in_(con_detalle)
+        ).order_by(Lote.id_lote)
+    ).scalars().all()
+
+
+def archivar_lotes_cerrados(dias_cerrado, tamano_lote, id_lote=None):
+    """Archiva los lotes elegibles (o solo id_lote, sin exigir antigüedad); devuelve lotes, filas y duración"""
+    inicio = time.perf_counter()
+    if id_lote:
+        lotes = [id_actual for id_actual in lotes_para_archivar(0) if id_actual == id_lote]
+    else:
+        lotes = lotes_para_archivar(dias_cerrado)
+    
+    copiadas = 0
+    borradas = 0
+    for id_actual in lotes:
+        filas_copiadas, filas_borradas = archivar_lote(id_actual, tamano_lote)
+        copiadas += filas_copiadas
+        borradas += filas_borradas
+    
+    return {
+        'lotes': lotes,
+        'copiadas': copiadas,
+        'borradas': borradas,
+        'duracion_ms': round((time.perf_counter() - inicio) * 1000, 1)
+    }
@@ -0,0 +1,56 @@
+"""
+Medición del arranque en frío de la aplicación
+Cada repetición corre en un proceso nuevo y mide importar app.py,
+ejecutar create_app() y atender la primera petición.
+
+Uso:
+    python benchmarks/arranque_en_frio.py [repeticiones]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SONDA = r'''
+import json, time
+inicio = time.perf_counter()
+from app import create_app
+importado = time.perf_counter()
+app = create_app()
+creada = time.perf_counter()
+app.test_client().get('/')
+primera = time.perf_counter()
+print(json.dumps({
+    'importar': (importado - inicio) * 1000,
+    'create_app': (creada - importado) * 1000,
+    'primera_peticion': (primera - creada) * 1000,
+}))
+'''
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    entorno = dict(os.environ)
+    entorno.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'arranque.db')}")
+    
+    muestras = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, '-c', SONDA], cwd=RAIZ, env=entorno,
+            capture_output=True, text=True, check=True
+        )
+        muestras.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+    
+    print(f"{'fase':<20}{'mediana ms':>12}{'máx ms':>10}")
+    for fase in ('importar', 'create_app', 'primera_peticion'):
+        valores = [m[fase] for m in muestras]
+        print(f'{fase:<20}{statistics.median(valores):>12.1f}{max(valores):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark de la búsqueda (typeahead) de clientes
+Siembra N clientes con nombres y teléfonos realistas, indexa sus términos
+(como flask normalizar-busqueda) y mide /api/clientes/buscar con términos
+que ejercitan cada fase: prefijo del nombre, prefijo del teléfono, inicio de
+palabra y subcadena.
+
+Uso:
+    python benchmarks/busqueda_clientes.py [--clientes 50000] [--repeticiones 50]
+    DATABASE_URL=mysql+pymysql://... python benchmarks/busqueda_clientes.py
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+_directorio = tempfile.mkdtemp(prefix='bench_busqueda_')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(_directorio, 'bench.db')}")
+
+from sqlalchemy import insert  # noqa: E402
+from app import create_app  # noqa: E402
+from models import db, Cliente, normalizar_busqueda  # noqa: E402
+
+NOMBRES = ['juan', 'pedro', 'maría', 'josé', 'luis', 'ana', 'carlos', 'sofía', 'andrés', 'lucía']
+APELLIDOS = ['pérez', 'gómez', 'rodríguez', 'lópez', 'martínez', 'sánchez', 'ramírez', 'torres', 'díaz', 'núñez']
+
+# Término -> fase que debería resolverlo
+TERMINOS = [
+    ('jos', 'prefijo del nombre'),
+    ('maría gómez', 'prefijo del nombre'),
+    ('300004', 'prefijo del teléfono'),
+    ('gomez', 'inicio de palabra'),
+    ('perez jose', 'inicio de palabra'),
+    ('iguez', 'subcadena'),
+    ('zzz', 'sin resultados'),
+]
+
+
+def sembrar(n_clientes, tamano_lote=5000):
+    """Inserta los clientes en bloques y construye el índice de términos"""
+    db.create_all()
+    aleatorio = random.Random(42)
+    for inicio in range(0, n_clientes, tamano_lote):
+        filas = []
+        for i in range(inicio, min(inicio + tamano_lote, n_clientes)):
+            nombre = f'{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)} {aleatorio.choice(APELLIDOS)}'
+            telefono = str(3000000000 + i)
+            filas.append({
+                'nombre': nombre.title(),
+                'telefono': telefono,
+                'estado': 'activo',
+                'nombre_normalizado': normalizar_busqueda(nombre),
+                'telefono_normalizado': telefono
+            })
+        db.session.execute(insert(Cliente.__table__), filas)
+        db.session.commit()
+
+
+def medir(cliente, termino, repeticiones):
+    """Devuelve (resultados, mediana ms, p95 ms) de una búsqueda"""
+    cliente.get('/api/clientes/buscar', query_string={'q': termino})
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        respuesta = cliente.get('/api/clientes/buscar', query_string={'q': termino})
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        assert respuesta.status_code == 200, respuesta.data[:200]
+    tiempos.sort()
+    return len(respuesta.json['data']), statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--clientes', type=int, default=50000)
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+    
+    app = create_app()
+    with app.app_context():
+        sembrar(args.clientes)
+    resultado = app.test_cli_runner().invoke(args=['normalizar-busqueda', '--tamano-lote', '5000'])
+    print(resultado.output.strip())
+    
+    cliente = app.test_client()
+    print(f"\n{'término':<14}{'fase':<22}{'filas':>6}{'p50 ms':>9}{'p95 ms':>9}")
+    for termino, fase in TERMINOS:
+        filas, mediana, p95 = medir(cliente, termino, args.repeticiones)
+        print(f'{termino:<14}{fase:<22}{filas:>6}{mediana:>9.2f}{p95:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
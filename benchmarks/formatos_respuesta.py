@@ -0,0 +1,95 @@
+"""
+Benchmark de formatos de respuesta para listados grandes
+Compara tamaño del payload y tiempo de serialización entre el JSON de
+siempre (jsonify + to_dict), el JSON columnar y MessagePack.
+
+Uso:
+    python benchmarks/formatos_respuesta.py [repeticiones]
+"""
+
+import os
+import sys
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+_directorio = tempfile.mkdtemp(prefix='bench_formatos_')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(_directorio, 'bench.db')}")
+
+from app import create_app  # noqa: E402
+from models import db, Lote, CapitalLote, Cliente, Venta, VentaCredito, CompraMateriaPrima  # noqa: E402
+
+
+def sembrar(n_lotes=20, n_clientes=200, ventas_por_lote=50, compras_por_lote=50):
+    """Crea datos de prueba suficientes para llenar los listados"""
+    db.create_all()
+    hoy = date.today()
+    clientes = [Cliente(nombre=f'Cliente {i}', telefono='3000000000', direccion='Vereda El Pollo') for i in range(n_clientes)]
+    db.session.add_all(clientes)
+    db.session.flush()
+    
+    for i in range(n_lotes):
+        lote = Lote(nombre_lote=f'Lote {i}', cantidad_inicial=5000, fecha_inicio=hoy - timedelta(days=40))
+        db.session.add(lote)
+        db.session.flush()
+        db.session.add(CapitalLote(id_lote=lote.id_lote, capital_inicial=10000000, capital_actual=10000000, fecha_asignacion=lote.fecha_inicio))
+        
+        for j in range(compras_por_lote):
+            db.session.add(CompraMateriaPrima(
+                id_lote=lote.id_lote, tipo_materia='Concentrado', cantidad=40, unidad='bulto',
+                costo_unitario=95000, costo_total=3800000, fecha_compra=hoy - timedelta(days=j % 40),
+                observaciones='Compra de prueba'
+            ))
+        for j in range(ventas_por_lote):
+            venta = Venta(
+                id_lote=lote.id_lote, id_cliente=clientes[(i * ventas_por_lote + j) % n_clientes].id_cliente,
+                cantidad_pollos=10, cantidad_kilos=25.5, precio_kilo=9800, valor_total=249900,
+                fecha_venta=hoy - timedelta(days=j % 10)
+            )
+            db.session.add(venta)
+            if j % 3 == 0:
+                db.session.flush()
+                db.session.add(VentaCredito(id_venta=venta.id_venta, valor_total=249900, valor_pagado=0, valor_pendiente=249900))
+    db.session.commit()
+
+
+def medir(cliente, url, headers, repeticiones):
+    """Devuelve (bytes, mediana ms) de una ruta"""
+    tiempos = []
+    tamano = 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        respuesta = cliente.get(url, headers=headers)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        assert respuesta.status_code == 200, respuesta.data[:200]
+        tamano = len(respuesta.data)
+    return tamano, statistics.median(tiempos)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    app = create_app()
+    
+    with app.app_context():
+        sembrar()
+    
+    cliente = app.test_client()
+    formatos = [
+        ('json (to_dict)', {}),
+        ('columnar', {'Accept': 'application/vnd.pollo.columnar+json'}),
+        ('msgpack', {'Accept': 'application/x-msgpack'}),
+    ]
+    
+    print(f"{'ruta':<22}{'formato':<18}{'bytes':>10}{'ms (mediana)':>15}")
+    for url in ('/api/compras/todas', '/api/ventas'):
+        for nombre, headers in formatos:
+            tamano, ms = medir(cliente, url, headers, repeticiones)
+            print(f'{url:<22}{nombre:<18}{tamano:>10}{ms:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
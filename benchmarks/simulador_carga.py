@@ -0,0 +1,354 @@
+"""
+Simulador de carga multiusuario
+Reproduce el patrón de tráfico de static/js/app.js: cada pestaña consulta
+la campana de notificaciones y dispara la generación automática cada 30 s,
+navega al detalle de lotes (lote + movimientos + compras + ventas) y una
+parte de los usuarios registra ventas y mortalidad.
+
+Sin --url levanta un gunicorn local sobre una base SQLite sembrada; con
+--url apunta a un servidor ya en marcha (por ejemplo sobre MySQL).
+
+Uso:
+    python benchmarks/simulador_carga.py --usuarios 5,10,20,40 --duracion 30
+    python benchmarks/simulador_carga.py --url http://127.0.0.1:5000 --usuarios 40
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import date, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mensajes de error que indican contención en la base de datos
+MARCAS_CONTENCION = ('database is locked', 'lock wait timeout', 'deadlock', 'queuepool limit')
+
+
+# ============================================
+# SERVIDOR LOCAL Y DATOS DE PRUEBA
+# ============================================
+
+def sembrar_base(database_url, n_lotes, n_clientes, n_registros):
+    """Crea el esquema y datos representativos directamente con los modelos.
+    
+    Cada lote recibe n_registros compras y ventas de contado con sus
+    movimientos de capital, como las registran los endpoints, para que el
+    detalle de lote y el resumen del dashboard no consulten tablas vacías.
+    """
+    os.environ['DATABASE_URL'] = database_url
+    sys.path.insert(0, RAIZ)
+    from decimal import Decimal
+    from app import create_app
+    from cli import init_db_command
+    from models import (
+        db, Lote, CapitalLote, Cliente, CompraMateriaPrima, EventoCronograma, MovimientoCapital, Venta
+    )
+    
+    app = create_app()
+    app.test_cli_runner().invoke(init_db_command)
+    
+    with app.app_context():
+        hoy = date.today()
+        clientes = [Cliente(nombre=f'Cliente {i}', telefono='3000000000') for i in range(n_clientes)]
+        db.session.add_all(clientes)
+        db.session.flush()
+        for i in range(n_lotes):
+            lote = Lote(
+                nombre_lote=f'Lote {i}', cantidad_inicial=5000,
+                fecha_inicio=hoy - timedelta(days=21 + i), fecha_estimada_salida=hoy + timedelta(days=7)
+            )
+            db.session.add(lote)
+            db.session.flush()
+            capital = CapitalLote(
+                id_lote=lote.id_lote, capital_inicial=Decimal('10000000'), capital_actual=Decimal('10000000'),
+                fecha_asignacion=lote.fecha_inicio
+            )
+            db.session.add(capital)
+            db.session.add(EventoCronograma(
+                id_lote=lote.id_lote, tipo_evento='aplicacion_melaza', descripcion='Aplicación de melaza',
+                fecha_programada=hoy, dias_lote=21 + i
+            ))
+            
+            for j in range(n_registros):
+                fecha = lote.fecha_inicio + timedelta(days=j % 21)
+                compra = CompraMateriaPrima(
+                    id_lote=lote.id_lote, tipo_materia='alimento', cantidad=Decimal('40'), unidad='kg',
+                    costo_unitario=Decimal('2500'), costo_total=Decimal('100000'), fecha_compra=fecha
+                )
+                cliente = clientes[(i * n_registros + j) % n_clientes]
+                venta = Venta(
+                    id_lote=lote.id_lote, id_cliente=cliente.id_cliente, cantidad_pollos=5,
+                    cantidad_kilos=Decimal('12.5'), precio_kilo=Decimal('9800'), valor_total=Decimal('122500'),
+                    fecha_venta=fecha
+                )
+                db.session.add_all([
+                    compra,
+                    venta,
+                    MovimientoCapital(
+                        id_lote=lote.id_lote, tipo_movimiento='compra', valor=compra.costo_total,
+                        descripcion='Compra de alimento', fecha_movimiento=fecha
+                    ),
+                    MovimientoCapital(
+                        id_lote=lote.id_lote, tipo_movimiento='ingreso', valor=venta.valor_total,
+                        descripcion=f'Venta de contado - Cliente: {cliente.nombre}', fecha_movimiento=fecha
+                    ),
+                ])
+                capital.capital_actual += venta.valor_total - compra.costo_total
+        db.session.commit()
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def levantar_gunicorn(database_url, workers, threads):
+    """Arranca gunicorn con la app y espera a que responda"""
+    puerto = _puerto_libre()
+    entorno = dict(os.environ, DATABASE_URL=database_url)
+    proceso = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', '--preload', '-w', str(workers), '--threads', str(threads),
+            '-b', f'127.0.0.1:{puerto}', '--log-level', 'warning', 'app:create_app()'
+        ],
+        cwd=RAIZ, env=entorno
+    )
+    url = f'http://127.0.0.1:{puerto}'
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url + '/', timeout=1)
+            return proceso, url
+        except OSError:
+            time.sleep(0.1)
+    proceso.terminate()
+    raise RuntimeError('gunicorn no respondió a tiempo')
+
+
+# ============================================
+# USUARIO SIMULADO
+# ============================================
+
+class Metricas:
+    """Acumula latencias y errores de un escalón de concurrencia"""
+    
+    def __init__(self):
+        self.candado = threading.Lock()
+        self.latencias = []
+        self.errores = 0
+        self.contencion = 0
+        self.por_etiqueta = {}
+    
+    def registrar(self, etiqueta, segundos, ok, contencion):
+        with self.candado:
+            self.latencias.append(segundos)
+            self.por_etiqueta.setdefault(etiqueta, []).append(segundos)
+            if not ok:
+                self.errores += 1
+            if contencion:
+                self.contencion += 1
+
+
+class UsuarioSimulado(threading.Thread):
+    """Una pestaña de la SPA abierta durante el escalón"""
+    
+    def __init__(self, url, metricas, fin, escala, escritor, ids_lotes, ids_clientes):
+        super().__init__(daemon=True)
+        self.url = url
+        self.metricas = metricas
+        self.fin = fin
+        self.escala = escala
+        self.escritor = escritor
+        self.ids_lotes = ids_lotes
+        self.ids_clientes = ids_clientes
+    
+    def peticion(self, etiqueta, metodo, ruta, cuerpo=None):
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else None
+        # Como fetch() del navegador: */* y el JSON de siempre
+        cabeceras = {'Accept': '*/*'}
+        if datos:
+            cabeceras['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.url + ruta, data=datos, method=metodo, headers=cabeceras)
+        inicio = time.perf_counter()
+        ok, contencion = True, False
+        try:
+            with urllib.request.urlopen(req, timeout=30) as respuesta:
+                texto = respuesta.read()
+            if ruta == '/api/batch':
+                # El batch responde 200 aunque fallen subpeticiones: se revisa cada una
+                for sub in json.loads(texto)['data']:
+                    if sub['status'] >= 500:
+                        ok = False
+                        error = str((sub['body'] or {}).get('error', '')).lower()
+                        contencion = contencion or any(marca in error for marca in MARCAS_CONTENCION)
+        except urllib.error.HTTPError as e:
+            texto = e.read().decode('utf-8', 'replace').lower()
+            ok = e.code < 500
+            contencion = any(marca in texto for marca in MARCAS_CONTENCION)
+        except (ValueError, KeyError, TypeError):
+            # Cuerpo del batch que no es el JSON esperado
+            ok = False
+        except OSError:
+            ok = False
+        self.metricas.registrar(etiqueta, time.perf_counter() - inicio, ok, contencion)
+    
+    def esperar(self, segundos):
+        self.fin.wait(segundos / self.escala)
+    
+    def cargar_dashboard(self):
+        self.peticion('dashboard', 'POST', '/api/batch', {'requests': [
+            {'id': 'estadisticas', 'path': '/api/dashboard/estadisticas'},
+            {'id': 'resumen', 'path': '/api/dashboard/resumen-lotes'}
+        ]})
+    
+    def sondear_notificaciones(self):
+        self.peticion('notificaciones', 'GET', '/api/notificaciones?no_leidas=true')
+        self.peticion('generar', 'POST', '/api/notificaciones/generar-automaticas')
+    
+    def ver_detalle_lote(self):
+        id_lote = random.choice(self.ids_lotes)
+        for etiqueta, ruta in (
+            ('lote', f'/api/lotes/{id_lote}'),
+            ('movimientos', f'/api/movimientos/lote/{id_lote}'),
+            ('compras', f'/api/compras/lote/{id_lote}'),
+            ('ventas', f'/api/ventas/lote/{id_lote}'),
+        ):
+            self.peticion(etiqueta, 'GET', ruta)
+    
+    def registrar_venta(self):
+        self.peticion('registrar_venta', 'POST', '/api/ventas', {
+            'id_lote': random.choice(self.ids_lotes), 'id_cliente': random.choice(self.ids_clientes),
+            'cantidad_pollos': 5, 'cantidad_kilos': 12.5, 'precio_kilo': 9800,
+            'fecha_venta': date.today().isoformat(), 'tipo_pago': random.choice(['contado', 'credito'])
+        })
+    
+    def registrar_mortalidad(self):
+        self.peticion('registrar_mortalidad', 'POST', '/api/mortalidad', {
+            'id_lote': random.choice(self.ids_lotes), 'cantidad_muertos': random.randint(0, 5)
+        })
+    
+    def run(self):
+        self.cargar_dashboard()
+        self.sondear_notificaciones()
+        proximo_sondeo = time.monotonic() + 30 / self.escala
+        
+        while not self.fin.is_set():
+            if time.monotonic() >= proximo_sondeo:
+                self.sondear_notificaciones()
+                proximo_sondeo += 30 / self.escala
+            
+            accion = random.random()
+            if self.escritor and accion < 0.5:
+                random.choice([self.registrar_venta, self.registrar_mortalidad])()
+            elif accion < 0.8:
+                self.ver_detalle_lote()
+            else:
+                self.cargar_dashboard()
+            
+            # Tiempo de lectura entre pantallas
+            self.esperar(random.uniform(2, 8))
+
+
+# ============================================
+# EJECUCIÓN POR ESCALONES
+# ============================================
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def ejecutar_escalon(url, usuarios, duracion, escala, fraccion_escritores, ids_lotes, ids_clientes):
+    metricas = Metricas()
+    fin = threading.Event()
+    hilos = [
+        UsuarioSimulado(url, metricas, fin, escala, i < usuarios * fraccion_escritores, ids_lotes, ids_clientes)
+        for i in range(usuarios)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(duracion)
+    fin.set()
+    for hilo in hilos:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+    
+    total = len(metricas.latencias)
+    return {
+        'usuarios': usuarios,
+        'peticiones': total,
+        'rps': total / transcurrido,
+        'p50_ms': percentil(metricas.latencias, 50) * 1000,
+        'p95_ms': percentil(metricas.latencias, 95) * 1000,
+        'p99_ms': percentil(metricas.latencias, 99) * 1000,
+        'errores_pct': (metricas.errores / total * 100) if total else 0.0,
+        'contencion': metricas.contencion,
+        'p95_por_ruta_ms': {
+            etiqueta: round(percentil(valores, 95) * 1000, 1)
+            for etiqueta, valores in sorted(metricas.por_etiqueta.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Servidor ya en marcha; sin él se levanta gunicorn sobre SQLite')
+    parser.add_argument('--usuarios', default='5,10,20,40', help='Escalones de usuarios concurrentes')
+    parser.add_argument('--duracion', type=float, default=30, help='Segundos por escalón')
+    parser.add_argument('--escala-tiempo', type=float, default=10, help='Factor que acelera sondeos y pausas')
+    parser.add_argument('--escritores', type=float, default=0.25, help='Fracción de usuarios que registran datos')
+    parser.add_argument('--lotes', type=int, default=10)
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--registros', type=int, default=50, help='Compras y ventas sembradas por lote')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+    
+    proceso = None
+    url = args.url
+    if not url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='carga_'), 'carga.db')}"
+        sembrar_base(database_url, args.lotes, args.clientes, args.registros)
+        proceso, url = levantar_gunicorn(database_url, args.workers, args.threads)
+    
+    ids_lotes = list(range(1, args.lotes + 1))
+    ids_clientes = list(range(1, args.clientes + 1))
+    
+    try:
+        resultados = [
+            ejecutar_escalon(url, int(usuarios), args.duracion, args.escala_tiempo,
+                             args.escritores, ids_lotes, ids_clientes)
+            for usuarios in args.usuarios.split(',')
+        ]
+    finally:
+        if proceso:
+            proceso.terminate()
+            proceso.wait()
+    
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return
+    
+    print(f"{'usuarios':>8}{'peticiones':>12}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errores %':>11}{'contención':>12}")
+    for r in resultados:
+        print(
+            f"{r['usuarios']:>8}{r['peticiones']:>12}{r['rps']:>9.1f}{r['p50_ms']:>9.1f}"
+            f"{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['errores_pct']:>11.2f}{r['contencion']:>12}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+"""
+Blueprints de la API agrupados por dominio
+"""
+
+from blueprints import (
+    lotes, compras, movimientos, clientes, dashboard, ventas,
+    creditos, cronograma, mortalidad, notificaciones, reportes, sync, batch,
+    salud
+)
+
+BLUEPRINTS = [
+    lotes.bp, compras.bp, movimientos.bp, clientes.bp, dashboard.bp, ventas.bp,
+    creditos.bp, cronograma.bp, mortalidad.bp, notificaciones.bp, reportes.bp, sync.bp,
+    batch.bp, salud.bp
+]
+
+
+def registrar_blueprints(app):
+    for bp in BLUEPRINTS:
+        app.register_blueprint(bp)
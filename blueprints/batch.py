@@ -0,0 +1,91 @@
+"""
+Endpoint de Peticiones por Lote (batch)
+Agrupa varias peticiones GET de la SPA en un solo viaje HTTP. La respuesta
+es un solo JSON, así que cada subpetición se pide y se devuelve como JSON.
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from werkzeug.test import EnvironBuilder
+
+bp = Blueprint('batch', __name__, url_prefix='/api')
+
+# Cabeceras del batch que se propagan a cada subpetición (Accept no: se fija en JSON)
+CABECERAS_PROPAGADAS = ('X-Forzar-Primaria', 'X-Granja', 'Host')
+
+_executor = None
+_candado = threading.Lock()
+
+
+def _obtener_executor(max_hilos):
+    """Pool de hilos compartido por el proceso (acota la concurrencia total)"""
+    global _executor
+    if _executor is None:
+        with _candado:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix='batch')
+    return _executor
+
+
+def _ejecutar_subpeticion(app, subpeticion, cabeceras):
+    """Despacha una subpetición GET por la app (hooks incluidos) en su propio contexto"""
+    ruta, _, query_string = subpeticion['path'].partition('?')
+    entorno = EnvironBuilder(
+        path=ruta, query_string=query_string, method='GET',
+        headers={**cabeceras, 'Accept': 'application/json'}
+    ).get_environ()
+    
+    with app.request_context(entorno):
+        response = app.full_dispatch_request()
+    
+    status = response.status_code
+    body = response.get_json(silent=True)
+    if body is None:
+        # Página HTML de error, ?formato=msgpack u otro cuerpo que no cabe en el JSON del batch
+        status = status if status >= 400 else 406
+        body = {'success': False, 'error': f'La subpetición no devolvió JSON ({response.mimetype})'}
+    
+    return {
+        'id': subpeticion.get('id'),
+        'path': subpeticion['path'],
+        'status': status,
+        'body': body
+    }
+
+
+@bp.route('/batch', methods=['POST'])
+def ejecutar_batch():
+    """Ejecutar varias peticiones GET a rutas existentes y devolver todos los resultados"""
+    try:
+        data = request.get_json() or {}
+        subpeticiones = data.get('requests') or []
+        maximo = current_app.config['BATCH_MAX_SUBPETICIONES']
+        
+        if not subpeticiones:
+            return jsonify({'success': False, 'error': 'Debe enviar al menos una subpetición'}), 400
+        if len(subpeticiones) > maximo:
+            return jsonify({'success': False, 'error': f'Máximo {maximo} subpeticiones por batch'}), 400
+        
+        for subpeticion in subpeticiones:
+            ruta = subpeticion.get('path', '')
+            if not ruta.startswith('/api/') or ruta.split('?')[0].rstrip('/') == '/api/batch':
+                return jsonify({'success': False, 'error': f'Ruta no permitida: {ruta}'}), 400
+        
+        app = current_app._get_current_object()
+        cabeceras = {
+            nombre: request.headers[nombre] for nombre in CABECERAS_PROPAGADAS if nombre in request.headers
+        }
+        
+        # Cada subpetición corre en su propio contexto (y sesión) dentro del pool compartido
+        executor = _obtener_executor(app.config['BATCH_MAX_HILOS'])
+        futuros = [executor.submit(_ejecutar_subpeticion, app, sub, cabeceras) for sub in subpeticiones]
+        resultados = [futuro.result() for futuro in futuros]
+        
+        return jsonify({
+            'success': True,
+            'data': resultados
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
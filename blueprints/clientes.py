@@ -0,0 +1,161 @@
+"""
+Endpoints de Clientes (RF-07)
+"""
+
+from flask import Blueprint, jsonify, request
+from sqlalchemy import select
+from models import db, Cliente, CacheRespuestaLote, Venta, normalizar_busqueda, solo_digitos
+from referencia import marcar_cambio_referencia, respuesta_referencia
+from archivo import union_con_archivo
+from utils import (
+    campos_solicitados, serializar_listado, registrar_eliminacion, limite_busqueda, buscar_normalizado
+)
+
+bp = Blueprint('clientes', __name__, url_prefix='/api')
+
+
+@bp.route('/clientes', methods=['GET'])
+def obtener_clientes():
+    """Obtener todos los clientes"""
+    try:
+        campos = campos_solicitados(Cliente)
+        if campos is None:
+            return respuesta_referencia('clientes'), 200
+        query = Cliente.query.filter_by(estado='activo')
+        return jsonify({
+            'success': True,
+            'data': serializar_listado(query, campos)
+        }), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/clientes/buscar', methods=['GET'])
+def buscar_clientes():
+    """Buscar clientes activos por nombre o teléfono (sin acentos, prefijo o subcadena)"""
+    try:
+        q = request.args.get('q', '')
+        termino = normalizar_busqueda(q)
+        if not termino:
+            return jsonify({'success': False, 'error': 'Parámetro q requerido'}), 400
+        
+        # El teléfono solo se compara si la búsqueda trae al menos 3 dígitos
+        digitos = solo_digitos(q)
+        clientes = buscar_normalizado(
+            Cliente.query.filter_by(estado='activo'),
+            'cliente', Cliente.id_cliente, Cliente.nombre_normalizado, termino, limite_busqueda(),
+            prefijos_extra=[(Cliente.telefono_normalizado, digitos if len(digitos) >= 3 else None)]
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': [cliente.to_dict() for cliente in clientes]
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/clientes/<int:id_cliente>', methods=['GET'])
+def obtener_cliente(id_cliente):
+    """Obtener un cliente específico"""
+    try:
+        cliente = Cliente.query.get_or_404(id_cliente)
+        return jsonify({
+            'success': True,
+            'data': cliente.to_dict()
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+
+
+@bp.route('/clientes', methods=['POST'])
+def crear_cliente():
+    """Crear un nuevo cliente"""
+    try:
+        data = request.get_json()
+        
+        nuevo_cliente = Cliente(
+            nombre=data['nombre'],
+            telefono=data.get('telefono'),
+            direccion=data.get('direccion'),
+            estado='activo'
+        )
+        
+        db.session.add(nuevo_cliente)
+        marcar_cambio_referencia('clientes')
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Cliente creado exitosamente',
+            'data': {'id_cliente': nuevo_cliente.id_cliente}
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/clientes/<int:id_cliente>', methods=['PUT'])
+def actualizar_cliente(id_cliente):
+    """Actualizar un cliente"""
+    try:
+        cliente = Cliente.query.get_or_404(id_cliente)
+        data = request.get_json()
+        
+        if 'nombre' in data:
+            if data['nombre'] != cliente.nombre:
+                # Los listados de ventas cacheados de lotes cerrados muestran el nombre
+                ventas = union_con_archivo(Venta, ['id_lote'], lambda tabla: tabla.c.id_cliente == id_cliente)
+                CacheRespuestaLote.query.filter(
+                    CacheRespuestaLote.id_lote.in_(select(ventas.c.id_lote))
+                ).delete(synchronize_session=False)
+            cliente.nombre = data['nombre']
+        if 'telefono' in data:
+            cliente.telefono = data['telefono']
+        if 'direccion' in data:
+            cliente.direccion = data['direccion']
+        if 'estado' in data:
+            cliente.estado = data['estado']
+        
+        marcar_cambio_referencia('clientes')
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Cliente actualizado exitosamente'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/clientes/<int:id_cliente>', methods=['DELETE'])
+def eliminar_cliente(id_cliente):
+    """Eliminar un cliente"""
+    try:
+        cliente = Cliente.query.get_or_404(id_cliente)
+        
+        # Verificar que no tenga ventas
+        if cliente.ventas:
+            return jsonify({
+                'success': False,
+                'error': 'No se puede eliminar un cliente con ventas registradas'
+            }), 400
+        
+        registrar_eliminacion('clientes', cliente.id_cliente)
+        db.session.delete(cliente)
+        marcar_cambio_referencia('clientes')
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Cliente eliminado exitosamente'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,171 @@
+"""
+Endpoints de Compras de Materia Prima (RF-06)
+"""
+
+from flask import Blueprint, jsonify, request
+from datetime import datetime
+from decimal import Decimal
+from models import db, Lote, CapitalLote, MovimientoCapital, CompraMateriaPrima
+from sqlalchemy import select
+from utils import (
+    campos_solicitados, serializar_listado, formato_tabular, respuesta_tabular,
+    cache_lote_cerrado, invalidar_cache_lote, invalidar_reportes, registrar_eliminacion, clase_consulta
+)
+from alertas import evaluar_capital
+from archivo import lote_admite_detalle, modelo_detalle
+
+bp = Blueprint('compras', __name__, url_prefix='/api')
+
+
+@bp.route('/compras', methods=['POST'])
+def registrar_compra():
+    """Registrar una compra de materia prima"""
+    try:
+        data = request.get_json()
+        
+        if not lote_admite_detalle(data['id_lote']):
+            return jsonify({'success': False, 'error': 'El lote está archivado: no admite nuevos registros'}), 400
+        
+        # Crear compra
+        nueva_compra = CompraMateriaPrima(
+            id_lote=data['id_lote'],
+            tipo_materia=data['tipo_materia'],
+            cantidad=data['cantidad'],
+            unidad=data['unidad'],
+            costo_unitario=data['costo_unitario'],
+            costo_total=Decimal(str(data['cantidad'])) * Decimal(str(data['costo_unitario'])),
+            fecha_compra=datetime.strptime(data['fecha_compra'], '%Y-%m-%d').date(),
+            observaciones=data.get('observaciones')
+        )
+        
+        db.session.add(nueva_compra)
+        
+        # Registrar movimiento de capital (RF-05)
+        movimiento = MovimientoCapital(
+            id_lote=data['id_lote'],
+            tipo_movimiento='compra',
+            valor=nueva_compra.costo_total,
+            descripcion=f"Compra de {data['tipo_materia']}",
+            fecha_movimiento=nueva_compra.fecha_compra
+        )
+        
+        db.session.add(movimiento)
+        
+        # Actualizar capital del lote
+        capital = CapitalLote.query.filter_by(id_lote=data['id_lote']).first()
+        if capital:
+            capital.capital_actual = capital.capital_actual - nueva_compra.costo_total
+            evaluar_capital(capital)
+        
+        invalidar_reportes(nueva_compra.fecha_compra)
+        invalidar_cache_lote(data['id_lote'])
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Compra registrada exitosamente',
+            'data': {'id_compra': nueva_compra.id_compra}
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/compras/lote/<int:id_lote>', methods=['GET'])
+@cache_lote_cerrado
+def obtener_compras_lote(id_lote):
+    """Obtener todas las compras de un lote"""
+    try:
+        modelo = modelo_detalle(CompraMateriaPrima, id_lote)
+        campos = campos_solicitados(modelo)
+        query = modelo.query.filter_by(id_lote=id_lote).order_by(modelo.fecha_compra.desc())
+        return jsonify({
+            'success': True,
+            'data': serializar_listado(query, campos)
+        }), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+
+@bp.route('/compras/todas', methods=['GET'])
+@clase_consulta('exportacion')
+def obtener_todas_compras():
+    """Obtener todas las compras con información de lotes"""
+    try:
+        formato = formato_tabular()
+        if formato:
+            tabla = CompraMateriaPrima.__table__
+            consulta = select(
+                tabla.c.id_compra, tabla.c.id_lote, tabla.c.tipo_materia, tabla.c.cantidad,
+                tabla.c.unidad, tabla.c.costo_unitario, tabla.c.costo_total,
+                tabla.c.fecha_compra, tabla.c.observaciones,
+                Lote.__table__.c.nombre_lote.label('lote_nombre')
+            ).join(
+                Lote.__table__, tabla.c.id_lote == Lote.__table__.c.id_lote
+            ).order_by(
+                tabla.c.fecha_compra.desc()
+            ).limit(100)
+            return respuesta_tabular(db.session.execute(consulta), formato)
+        
+        compras = db.session.query(
+            CompraMateriaPrima,
+            Lote.nombre_lote
+        ).join(
+            Lote, CompraMateriaPrima.id_lote == Lote.id_lote
+        ).order_by(
+            CompraMateriaPrima.fecha_compra.desc()
+        ).limit(100).all()
+        
+        resultado = []
+        for compra, nombre_lote in compras:
+            compra_dict = compra.to_dict()
+            compra_dict['lote_nombre'] = nombre_lote
+            resultado.append(compra_dict)
+        
+        return jsonify({
+            'success': True,
+            'data': resultado
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/compras/<int:id_compra>', methods=['DELETE'])
+def eliminar_compra(id_compra):
+    """Eliminar una compra y revertir el movimiento de capital"""
+    try:
+        compra = CompraMateriaPrima.query.get_or_404(id_compra)
+        
+        # Revertir el capital
+        capital = CapitalLote.query.filter_by(id_lote=compra.id_lote).first()
+        if capital:
+            capital.capital_actual = capital.capital_actual + compra.costo_total
+        
+        # Eliminar el movimiento asociado
+        movimiento = MovimientoCapital.query.filter_by(
+            id_lote=compra.id_lote,
+            tipo_movimiento='compra',
+            valor=compra.costo_total,
+            fecha_movimiento=compra.fecha_compra
+        ).first()
+        
+        if movimiento:
+            db.session.delete(movimiento)
+        
+        invalidar_reportes(compra.fecha_compra)
+        invalidar_cache_lote(compra.id_lote)
+        registrar_eliminacion('compras', compra.id_compra)
+        db.session.delete(compra)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Compra eliminada exitosamente'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,301 @@
+"""
+Endpoints de Créditos y Pagos (RF-09, RF-10)
+"""
+
+from flask import Blueprint, jsonify, request
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import case, insert, select, update
+from models import db, CapitalLote, Cliente, MovimientoCapital, Venta, VentaCredito, PagoCliente
+from utils import campos_solicitados, serializar_listado, invalidar_cache_lote, invalidar_reportes
+from archivo import modelo_pagos
+from cierres import sumar_ingresos_resumen
+
+bp = Blueprint('creditos', __name__, url_prefix='/api')
+
+
+@bp.route('/creditos/pendientes', methods=['GET'])
+def obtener_creditos_pendientes():
+    """Obtener todos los créditos pendientes o parciales"""
+    try:
+        creditos = VentaCredito.query.filter(
+            VentaCredito.estado_deuda.in_(['pendiente', 'parcial'])
+        ).all()
+        
+        resultado = []
+        for credito in creditos:
+            credito_dict = credito.to_dict()
+            credito_dict['venta'] = credito.venta.to_dict()
+            credito_dict['cliente_nombre'] = credito.venta.cliente.nombre
+            credito_dict['lote_nombre'] = credito.venta.lote.nombre_lote
+            resultado.append(credito_dict)
+        
+        return jsonify({
+            'success': True,
+            'data': resultado
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/creditos/cliente/<int:id_cliente>', methods=['GET'])
+def obtener_creditos_cliente(id_cliente):
+    """Obtener créditos de un cliente específico"""
+    try:
+        creditos = db.session.query(VentaCredito).join(Venta).filter(
+            Venta.id_cliente == id_cliente,
+            VentaCredito.estado_deuda.in_(['pendiente', 'parcial'])
+        ).all()
+        
+        resultado = []
+        for credito in creditos:
+            credito_dict = credito.to_dict()
+            credito_dict['venta'] = credito.venta.to_dict()
+            resultado.append(credito_dict)
+        
+        return jsonify({
+            'success': True,
+            'data': resultado
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/pagos', methods=['POST'])
+def registrar_pago():
+    """Registrar un pago de crédito (RF-10)"""
+    try:
+        data = request.get_json()
+        
+        # Obtener crédito
+        credito = VentaCredito.query.get_or_404(data['id_credito'])
+        
+        if credito.estado_deuda == 'pagado':
+            return jsonify({'success': False, 'error': 'Este crédito ya está pagado'}), 400
+        
+        valor_pago = Decimal(str(data['valor_pago']))
+        
+        if valor_pago > credito.valor_pendiente:
+            return jsonify({'success': False, 'error': 'El pago excede el saldo pendiente'}), 400
+        
+        # Crear registro de pago
+        nuevo_pago = PagoCliente(
+            id_credito=data['id_credito'],
+            valor_pago=valor_pago,
+            fecha_pago=datetime.strptime(data['fecha_pago'], '%Y-%m-%d').date(),
+            metodo_pago=data.get('metodo_pago'),
+            observaciones=data.get('observaciones')
+        )
+        
+        db.session.add(nuevo_pago)
+        
+        # Actualizar crédito
+        credito.valor_pagado = credito.valor_pagado + valor_pago
+        credito.valor_pendiente = credito.valor_pendiente - valor_pago
+        
+        if credito.valor_pendiente == 0:
+            credito.estado_deuda = 'pagado'
+        elif credito.valor_pagado > 0:
+            credito.estado_deuda = 'parcial'
+        
+        # Registrar ingreso en movimientos de capital
+        venta = Venta.query.get(credito.id_venta)
+        movimiento = MovimientoCapital(
+            id_lote=venta.id_lote,
+            tipo_movimiento='ingreso',
+            valor=valor_pago,
+            descripcion=f"Pago de crédito - Cliente: {venta.cliente.nombre}",
+            fecha_movimiento=nuevo_pago.fecha_pago
+        )
+        
+        db.session.add(movimiento)
+        
+        # Actualizar capital del lote
+        capital = CapitalLote.query.filter_by(id_lote=venta.id_lote).first()
+        if capital:
+            capital.capital_actual = capital.capital_actual + valor_pago
+        
+        sumar_ingresos_resumen({venta.id_lote: valor_pago})
+        invalidar_reportes(nuevo_pago.fecha_pago)
+        invalidar_cache_lote(venta.id_lote)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Pago registrado exitosamente',
+            'data': {
+                'saldo_pendiente': float(credito.valor_pendiente),
+                'estado': credito.estado_deuda
+            }
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def _repartir_pago(creditos, valor_pago, distribucion):
+    """Asignaciones [(credito, valor)]: la distribución explícita o del más antiguo al más nuevo.
+    
+    Lanza ValueError si la distribución no corresponde a los créditos abiertos
+    del cliente o si el pago excede el saldo pendiente.
+    """
+    if distribucion is None:
+        if valor_pago <= 0:
+            raise ValueError('El valor del pago debe ser mayor que cero')
+        if valor_pago > sum(credito.valor_pendiente for credito in creditos):
+            raise ValueError('El pago excede el saldo pendiente')
+        
+        asignaciones = []
+        restante = valor_pago
+        for credito in creditos:
+            if restante == 0:
+                break
+            valor = min(restante, credito.valor_pendiente)
+            asignaciones.append((credito, valor))
+            restante -= valor
+        return asignaciones
+    
+    por_id = {credito.id_credito: credito for credito in creditos}
+    asignaciones = []
+    for parte in distribucion:
+        credito = por_id.pop(parte['id_credito'], None)
+        if credito is None:
+            raise ValueError(f"Crédito no válido para el cliente: {parte['id_credito']}")
+        valor = Decimal(str(parte['valor']))
+        if valor <= 0:
+            raise ValueError('El valor de cada pago debe ser mayor que cero')
+        if valor > credito.valor_pendiente:
+            raise ValueError(f'El pago excede el saldo pendiente del crédito {credito.id_credito}')
+        asignaciones.append((credito, valor))
+    
+    if valor_pago is not None and valor_pago != sum(valor for _, valor in asignaciones):
+        raise ValueError('La distribución no suma el valor del pago')
+    return asignaciones
+
+
+@bp.route('/pagos/cliente/<int:id_cliente>', methods=['POST'])
+def registrar_pago_cliente(id_cliente):
+    """Repartir un pago del cliente entre sus créditos abiertos (del más antiguo o con distribución)"""
+    try:
+        data = request.get_json()
+        
+        nombre_cliente = db.session.query(Cliente.nombre).filter_by(id_cliente=id_cliente).scalar()
+        if nombre_cliente is None:
+            return jsonify({'success': False, 'error': 'Cliente no encontrado'}), 404
+        
+        fecha_pago = datetime.strptime(data['fecha_pago'], '%Y-%m-%d').date()
+        valor_pago = Decimal(str(data['valor_pago'])) if data.get('valor_pago') is not None else None
+        distribucion = data.get('distribucion') or None
+        if valor_pago is None and not distribucion:
+            return jsonify({'success': False, 'error': 'Se requiere valor_pago o distribucion'}), 400
+        
+        # Un solo SELECT ... FOR UPDATE bloquea los créditos que se van a tocar
+        abiertos = select(
+            VentaCredito.id_credito, VentaCredito.valor_pagado, VentaCredito.valor_pendiente, Venta.id_lote
+        ).join(Venta, Venta.id_venta == VentaCredito.id_venta).where(
+            Venta.id_cliente == id_cliente,
+            VentaCredito.estado_deuda.in_(['pendiente', 'parcial'])
+        ).order_by(Venta.fecha_venta, VentaCredito.id_credito).with_for_update(of=VentaCredito)
+        if distribucion:
+            abiertos = abiertos.where(VentaCredito.id_credito.in_([parte['id_credito'] for parte in distribucion]))
+        
+        try:
+            asignaciones = _repartir_pago(db.session.execute(abiertos).all(), valor_pago, distribucion)
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        # Pagos y movimientos de capital: un INSERT de varias filas cada uno
+        db.session.execute(insert(PagoCliente.__table__), [
+            {
+                'id_credito': credito.id_credito,
+                'valor_pago': valor,
+                'fecha_pago': fecha_pago,
+                'metodo_pago': data.get('metodo_pago'),
+                'observaciones': data.get('observaciones')
+            }
+            for credito, valor in asignaciones
+        ])
+        db.session.execute(insert(MovimientoCapital.__table__), [
+            {
+                'id_lote': credito.id_lote,
+                'tipo_movimiento': 'ingreso',
+                'valor': valor,
+                'descripcion': f"Pago de crédito - Cliente: {nombre_cliente}",
+                'fecha_movimiento': fecha_pago
+            }
+            for credito, valor in asignaciones
+        ])
+        
+        # Créditos: los saldos salen de las filas bloqueadas, un solo UPDATE con CASE
+        resultado = [
+            {
+                'id_credito': credito.id_credito,
+                'valor_pago': valor,
+                'valor_pagado': credito.valor_pagado + valor,
+                'saldo_pendiente': credito.valor_pendiente - valor,
+                'estado': 'pagado' if credito.valor_pendiente == valor else 'parcial'
+            }
+            for credito, valor in asignaciones
+        ]
+        creditos = VentaCredito.__table__
+        ids_creditos = [fila['id_credito'] for fila in resultado]
+        db.session.execute(update(creditos).where(creditos.c.id_credito.in_(ids_creditos)).values(
+            valor_pagado=case({fila['id_credito']: fila['valor_pagado'] for fila in resultado}, value=creditos.c.id_credito),
+            valor_pendiente=case({fila['id_credito']: fila['saldo_pendiente'] for fila in resultado}, value=creditos.c.id_credito),
+            estado_deuda=case({fila['id_credito']: fila['estado'] for fila in resultado}, value=creditos.c.id_credito)
+        ))
+        
+        # Capital: un UPDATE incremental con el total cobrado por lote
+        por_lote = {}
+        for credito, valor in asignaciones:
+            por_lote[credito.id_lote] = por_lote.get(credito.id_lote, 0) + valor
+        capitales = CapitalLote.__table__
+        db.session.execute(update(capitales).where(capitales.c.id_lote.in_(list(por_lote))).values(
+            capital_actual=capitales.c.capital_actual + case(por_lote, value=capitales.c.id_lote)
+        ))
+        
+        sumar_ingresos_resumen(por_lote)
+        invalidar_reportes(fecha_pago)
+        for id_lote in por_lote:
+            invalidar_cache_lote(id_lote)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Pago registrado exitosamente',
+            'data': {
+                'valor_aplicado': float(sum(valor for _, valor in asignaciones)),
+                'pagos': [
+                    {
+                        'id_credito': fila['id_credito'],
+                        'valor_pago': float(fila['valor_pago']),
+                        'saldo_pendiente': float(fila['saldo_pendiente']),
+                        'estado': fila['estado']
+                    }
+                    for fila in resultado
+                ]
+            }
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/pagos/credito/<int:id_credito>', methods=['GET'])
+def obtener_pagos_credito(id_credito):
+    """Obtener todos los pagos de un crédito"""
+    try:
+        modelo = modelo_pagos(id_credito)
+        campos = campos_solicitados(modelo)
+        query = modelo.query.filter_by(id_credito=id_credito).order_by(modelo.fecha_pago.desc())
+        return jsonify({
+            'success': True,
+            'data': serializar_listado(query, campos)
+        }), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
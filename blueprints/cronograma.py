@@ -0,0 +1,109 @@
+"""
+Endpoints del Cronograma de Engorda
+"""
+
+from flask import Blueprint, jsonify, request
+from datetime import datetime, date, timedelta
+from models import db, Lote, EventoCronograma
+from utils import cache_lote_cerrado, invalidar_cache_lote
+from archivo import modelo_detalle
+from ingesta import ingesta_agrupada, encolar
+
+bp = Blueprint('cronograma', __name__, url_prefix='/api')
+
+
+@bp.route('/cronograma/lote/<int:id_lote>', methods=['GET'])
+@cache_lote_cerrado
+def obtener_cronograma_lote(id_lote):
+    """Obtener cronograma completo de un lote"""
+    try:
+        lote = Lote.query.get_or_404(id_lote)
+        modelo = modelo_detalle(EventoCronograma, id_lote)
+        eventos = modelo.query.filter_by(id_lote=id_lote).order_by(modelo.fecha_programada).all()
+        
+        # Un lote cerrado se congela en su fecha de cierre
+        referencia = lote.fecha_cierre if lote.estado == 'cerrado' and lote.fecha_cierre else date.today()
+        
+        # Calcular días de edad del lote
+        dias_edad = (referencia - lote.fecha_inicio).days
+        
+        # Calcular días restantes hasta fecha estimada de salida
+        dias_restantes = None
+        if lote.fecha_estimada_salida:
+            dias_restantes = (lote.fecha_estimada_salida - referencia).days
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'lote': lote.to_dict(),
+                'dias_edad': dias_edad,
+                'dias_restantes': dias_restantes,
+                'eventos': [evento.to_dict() for evento in eventos]
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def _completar_evento(id_evento, data):
+    """Marca el evento en la sesión; el commit lo hace quien llama"""
+    evento = EventoCronograma.query.get_or_404(id_evento)
+    evento.estado = 'completado'
+    evento.fecha_ejecutada = datetime.strptime(data.get('fecha_ejecutada', date.today().isoformat()), '%Y-%m-%d').date()
+    invalidar_cache_lote(evento.id_lote)
+
+
+@bp.route('/cronograma/evento/<int:id_evento>/completar', methods=['POST'])
+def completar_evento(id_evento):
+    """Marcar un evento como completado"""
+    try:
+        data = request.get_json()
+        
+        if ingesta_agrupada():
+            encolar(_completar_evento, id_evento, data)
+        else:
+            _completar_evento(id_evento, data)
+            db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Evento completado exitosamente'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/cronograma/eventos-pendientes', methods=['GET'])
+def obtener_eventos_pendientes():
+    """Obtener todos los eventos pendientes de lotes activos"""
+    try:
+        eventos = db.session.query(
+            EventoCronograma,
+            Lote.nombre_lote
+        ).join(
+            Lote, EventoCronograma.id_lote == Lote.id_lote
+        ).filter(
+            Lote.estado == 'activo',
+            EventoCronograma.estado == 'pendiente',
+            EventoCronograma.fecha_programada <= date.today() + timedelta(days=7)
+        ).order_by(
+            EventoCronograma.fecha_programada
+        ).all()
+        
+        resultado = []
+        for evento, nombre_lote in eventos:
+            evento_dict = evento.to_dict()
+            evento_dict['nombre_lote'] = nombre_lote
+            evento_dict['dias_para_evento'] = (evento.fecha_programada - date.today()).days
+            resultado.append(evento_dict)
+        
+        return jsonify({
+            'success': True,
+            'data': resultado
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,117 @@
+"""
+Endpoints de Dashboard y Estadísticas (RF-11)
+"""
+
+from flask import Blueprint, jsonify
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import case, func, select
+from models import db, Lote, CapitalLote, MovimientoCapital
+from utils import clase_consulta, formato_tabular, respuesta_filas, serializar_valor
+from archivo import union_con_archivo
+
+bp = Blueprint('dashboard', __name__, url_prefix='/api')
+
+
+@bp.route('/dashboard/estadisticas', methods=['GET'])
+def obtener_estadisticas():
+    """Obtener estadísticas generales del dashboard"""
+    try:
+        # Lotes activos
+        lotes_activos = Lote.query.filter_by(estado='activo').count()
+        
+        # Pollos activos
+        pollos_activos = db.session.query(db.func.sum(Lote.cantidad_inicial)).filter(Lote.estado == 'activo').scalar() or 0
+        
+        # Capital total
+        capital_total = db.session.query(db.func.sum(CapitalLote.capital_actual)).join(Lote).filter(Lote.estado == 'activo').scalar() or 0
+        
+        # Gastos del mes actual
+        mes_actual = date.today().replace(day=1)
+        gastos_mes = db.session.query(db.func.sum(MovimientoCapital.valor)).filter(
+            MovimientoCapital.tipo_movimiento.in_(['compra', 'gasto', 'retiro']),
+            MovimientoCapital.fecha_movimiento >= mes_actual
+        ).scalar() or 0
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'lotes_activos': lotes_activos,
+                'pollos_activos': int(pollos_activos),
+                'capital_total': float(capital_total),
+                'gastos_mes': float(gastos_mes)
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Columnas del resumen por lote (las de la antigua vista vista_resumen_lotes)
+COLUMNAS_RESUMEN = [
+    'id_lote', 'nombre_lote', 'cantidad_inicial', 'fecha_inicio', 'fecha_cierre', 'dias_ciclo', 'estado',
+    'capital_inicial', 'capital_actual', 'total_gastos', 'total_ingresos', 'resultado_neto'
+]
+
+TIPOS_EGRESO = ('compra', 'gasto', 'retiro')
+
+
+def _resumen_lotes():
+    """Filas del resumen por lote en el orden de COLUMNAS_RESUMEN.
+    
+    Los totales salen de movimientos_capital y, para los lotes archivados, de
+    su archivo (una vista sobre la tabla activa los perdía al archivar).
+    """
+    movimientos = union_con_archivo(MovimientoCapital, ['id_lote', 'tipo_movimiento', 'valor'])
+    totales = select(
+        movimientos.c.id_lote,
+        func.sum(case(
+            (movimientos.c.tipo_movimiento.in_(TIPOS_EGRESO), movimientos.c.valor), else_=0
+        )).label('total_gastos'),
+        func.sum(case(
+            (movimientos.c.tipo_movimiento == 'ingreso', movimientos.c.valor), else_=0
+        )).label('total_ingresos')
+    ).group_by(movimientos.c.id_lote).subquery()
+    
+    consulta = select(
+        Lote.id_lote, Lote.nombre_lote, Lote.cantidad_inicial, Lote.fecha_inicio, Lote.fecha_cierre, Lote.estado,
+        func.coalesce(CapitalLote.capital_inicial, 0), func.coalesce(CapitalLote.capital_actual, 0),
+        func.coalesce(totales.c.total_gastos, 0), func.coalesce(totales.c.total_ingresos, 0)
+    ).outerjoin(CapitalLote, CapitalLote.id_lote == Lote.id_lote).outerjoin(
+        totales, totales.c.id_lote == Lote.id_lote
+    ).order_by(Lote.fecha_inicio.desc(), Lote.id_lote.desc())
+    
+    hoy = date.today()
+    filas = []
+    for (id_lote, nombre, cantidad, inicio, cierre, estado,
+         capital_inicial, capital_actual, gastos, ingresos) in db.session.execute(consulta):
+        gastos = Decimal(str(gastos))
+        ingresos = Decimal(str(ingresos))
+        filas.append((
+            id_lote, nombre, cantidad, inicio, cierre, ((cierre or hoy) - inicio).days, estado,
+            capital_inicial, capital_actual, gastos, ingresos, ingresos - gastos
+        ))
+    return filas
+
+
+@bp.route('/dashboard/resumen-lotes', methods=['GET'])
+@clase_consulta('reporte')
+def obtener_resumen_lotes():
+    """Obtener resumen detallado de lotes (RF-11)"""
+    try:
+        filas = _resumen_lotes()
+        
+        formato = formato_tabular()
+        if formato:
+            return respuesta_filas(COLUMNAS_RESUMEN, filas, formato)
+        
+        return jsonify({
+            'success': True,
+            'data': [
+                {columna: serializar_valor(valor) for columna, valor in zip(COLUMNAS_RESUMEN, fila)}
+                for fila in filas
+            ]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
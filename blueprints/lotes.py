@@ -0,0 +1,286 @@
+"""
+Endpoints de Lotes (RF-03)
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from datetime import datetime, date
+from models import db, Lote, CapitalLote, ResumenCierreLote, normalizar_busqueda
+from sqlalchemy.orm import joinedload
+from utils import (
+    campos_solicitados, serializar_listado, cache_lote_cerrado, invalidar_cache_lote,
+    registrar_eliminacion, limite_busqueda, buscar_normalizado
+)
+from referencia import marcar_cambio_referencia, respuesta_referencia
+from timeline import TIPOS, decodificar_cursor, pagina_timeline
+from cierres import calcular_resumen_cierre, eliminar_resumen_cierre
+
+bp = Blueprint('lotes', __name__, url_prefix='/api')
+
+
+@bp.route('/lotes', methods=['GET'])
+def obtener_lotes():
+    """Obtener todos los lotes"""
+    try:
+        campos = campos_solicitados(Lote)
+        if campos is None:
+            return respuesta_referencia('lotes'), 200
+        query = Lote.query.order_by(Lote.fecha_inicio.desc())
+        return jsonify({
+            'success': True,
+            'data': serializar_listado(query, campos)
+        }), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/lotes/buscar', methods=['GET'])
+def buscar_lotes():
+    """Buscar lotes por nombre (sin acentos, prefijo o subcadena); ?estado= opcional"""
+    try:
+        termino = normalizar_busqueda(request.args.get('q', ''))
+        if not termino:
+            return jsonify({'success': False, 'error': 'Parámetro q requerido'}), 400
+        
+        query = Lote.query
+        if request.args.get('estado'):
+            query = query.filter_by(estado=request.args['estado'])
+        
+        lotes = buscar_normalizado(
+            query, 'lote', Lote.id_lote, Lote.nombre_normalizado, termino, limite_busqueda()
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': [
+                {'id_lote': lote.id_lote, 'nombre_lote': lote.nombre_lote, 'estado': lote.estado}
+                for lote in lotes
+            ]
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/lotes/<int:id_lote>', methods=['GET'])
+@cache_lote_cerrado
+def obtener_lote(id_lote):
+    """Obtener un lote específico"""
+    try:
+        lote = Lote.query.get_or_404(id_lote)
+        return jsonify({
+            'success': True,
+            'data': lote.to_dict()
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+
+
+@bp.route('/lotes', methods=['POST'])
+def crear_lote():
+    """Crear un nuevo lote"""
+    try:
+        data = request.get_json()
+        
+        # Crear lote
+        nuevo_lote = Lote(
+            nombre_lote=data['nombre_lote'],
+            cantidad_inicial=data['cantidad_inicial'],
+            fecha_inicio=datetime.strptime(data['fecha_inicio'], '%Y-%m-%d').date(),
+            fecha_estimada_salida=datetime.strptime(data['fecha_estimada_salida'], '%Y-%m-%d').date() if data.get('fecha_estimada_salida') else None,
+            estado='activo'
+        )
+        
+        db.session.add(nuevo_lote)
+        db.session.flush()  # Para obtener el ID del lote
+        
+        # Crear capital del lote (RF-04)
+        capital = CapitalLote(
+            id_lote=nuevo_lote.id_lote,
+            capital_inicial=data['capital_inicial'],
+            capital_actual=data['capital_inicial'],
+            fecha_asignacion=datetime.strptime(data['fecha_inicio'], '%Y-%m-%d').date()
+        )
+        
+        db.session.add(capital)
+        marcar_cambio_referencia('lotes')
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Lote creado exitosamente',
+            'data': {'id_lote': nuevo_lote.id_lote}
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/lotes/<int:id_lote>', methods=['PUT'])
+def actualizar_lote(id_lote):
+    """Actualizar un lote existente"""
+    try:
+        lote = Lote.query.get_or_404(id_lote)
+        data = request.get_json()
+        
+        if 'nombre_lote' in data:
+            lote.nombre_lote = data['nombre_lote']
+        if 'cantidad_inicial' in data:
+            lote.cantidad_inicial = data['cantidad_inicial']
+        if 'fecha_estimada_salida' in data:
+            lote.fecha_estimada_salida = datetime.strptime(data['fecha_estimada_salida'], '%Y-%m-%d').date()
+        if lote.estado == 'cerrado':
+            # Reabrir o editar un lote cerrado invalida sus respuestas cacheadas
+            invalidar_cache_lote(id_lote)
+        
+        if 'estado' in data:
+            if lote.archivo and data['estado'] != 'cerrado':
+                return jsonify({
+                    'success': False,
+                    'error': 'No se puede reabrir un lote cuyo detalle ya está archivado'
+                }), 400
+            lote.estado = data['estado']
+            if lote.estado != 'cerrado':
+                eliminar_resumen_cierre(id_lote)
+        
+        marcar_cambio_referencia('lotes')
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Lote actualizado exitosamente'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/lotes/<int:id_lote>/cerrar', methods=['POST'])
+def cerrar_lote(id_lote):
+    """Cerrar un lote (RF-12)"""
+    try:
+        lote = Lote.query.get_or_404(id_lote)
+        
+        # Verificar que tenga ventas
+        if not lote.ventas:
+            return jsonify({
+                'success': False,
+                'error': 'No se puede cerrar un lote sin ventas registradas'
+            }), 400
+        
+        lote.estado = 'cerrado'
+        lote.fecha_cierre = date.today()
+        
+        # Congelar el resumen final del lote
+        resumen = calcular_resumen_cierre(lote)
+        
+        marcar_cambio_referencia('lotes')
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Lote cerrado exitosamente',
+            'data': resumen.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/lotes/cerrados/resumen', methods=['GET'])
+def obtener_resumenes_cierre():
+    """Obtener el resumen congelado de los lotes cerrados (una fila por lote)"""
+    try:
+        resumenes = ResumenCierreLote.query.options(
+            joinedload(ResumenCierreLote.lote)
+        ).order_by(ResumenCierreLote.fecha_cierre.desc()).all()
+        return jsonify({
+            'success': True,
+            'data': [resumen.to_dict() for resumen in resumenes]
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/lotes/<int:id_lote>/resumen-cierre', methods=['GET'])
+def obtener_resumen_cierre(id_lote):
+    """Obtener el resumen congelado de un lote cerrado"""
+    try:
+        resumen = ResumenCierreLote.query.get_or_404(id_lote)
+        return jsonify({
+            'success': True,
+            'data': resumen.to_dict()
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+
+
+@bp.route('/lotes/<int:id_lote>/timeline', methods=['GET'])
+def obtener_timeline_lote(id_lote):
+    """Línea de tiempo del lote (?tipos=venta,pago&despues=<cursor>&limite=&orden=desc)"""
+    try:
+        if db.session.get(Lote, id_lote) is None:
+            return jsonify({'success': False, 'error': 'Lote no encontrado'}), 404
+        
+        solicitados = request.args.get('tipos')
+        tipos = list(dict.fromkeys(solicitados.split(','))) if solicitados else list(TIPOS)
+        invalidos = [tipo for tipo in tipos if tipo not in TIPOS]
+        if invalidos:
+            return jsonify({'success': False, 'error': f"Tipos no válidos: {', '.join(invalidos)}"}), 400
+        
+        despues = request.args.get('despues')
+        cursor = decodificar_cursor(despues) if despues else None
+        
+        maximo = current_app.config['TIMELINE_LIMITE_MAXIMO']
+        limite = request.args.get('limite', current_app.config['TIMELINE_LIMITE'], type=int)
+        limite = max(1, min(limite or maximo, maximo))
+        
+        eventos, siguiente = pagina_timeline(
+            id_lote, tipos, cursor, limite,
+            descendente=request.args.get('orden') == 'desc'
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'eventos': eventos,
+                'siguiente': siguiente
+            }
+        }), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/lotes/<int:id_lote>', methods=['DELETE'])
+def eliminar_lote(id_lote):
+    """Eliminar un lote"""
+    try:
+        lote = Lote.query.get_or_404(id_lote)
+        
+        # Verificar que no tenga movimientos
+        if lote.movimientos or lote.compras or lote.ventas or lote.archivo:
+            return jsonify({
+                'success': False,
+                'error': 'No se puede eliminar un lote con movimientos, compras o ventas registradas'
+            }), 400
+        
+        invalidar_cache_lote(id_lote)
+        eliminar_resumen_cierre(id_lote)
+        registrar_eliminacion('lotes', lote.id_lote)
+        db.session.delete(lote)
+        marcar_cambio_referencia('lotes')
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Lote eliminado exitosamente'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,148 @@
+"""
+Endpoints de Mortalidad
+"""
+
+from flask import Blueprint, jsonify, request
+from datetime import datetime, date
+from decimal import Decimal
+from models import db, Lote, MortalidadLote
+from sqlalchemy import func
+from utils import formato_tabular, respuesta_tabular, cache_lote_cerrado, invalidar_cache_lote, clase_consulta
+from archivo import lote_admite_detalle, modelo_detalle
+from ingesta import ingesta_agrupada, encolar
+from tareas import encolar_tarea
+
+bp = Blueprint('mortalidad', __name__, url_prefix='/api')
+
+
+def _registrar_mortalidad(data):
+    """Agrega el registro a la sesión; el commit lo hace quien llama"""
+    # Obtener lote
+    lote = Lote.query.get_or_404(data['id_lote'])
+    if not lote_admite_detalle(lote.id_lote):
+        raise ValueError('El lote está archivado: no admite nuevos registros')
+    
+    # Calcular mortalidad acumulada
+    mortalidad_anterior = db.session.query(
+        func.sum(MortalidadLote.cantidad_muertos)
+    ).filter_by(id_lote=data['id_lote']).scalar() or 0
+    
+    cantidad_vivos_actual = lote.cantidad_inicial - mortalidad_anterior - data['cantidad_muertos']
+    
+    # Calcular porcentaje de mortalidad del día
+    porcentaje_dia = (data['cantidad_muertos'] / (mortalidad_anterior + cantidad_vivos_actual)) * 100
+    
+    # Crear registro de mortalidad
+    nueva_mortalidad = MortalidadLote(
+        id_lote=data['id_lote'],
+        fecha_registro=datetime.strptime(data.get('fecha_registro', date.today().isoformat()), '%Y-%m-%d').date(),
+        cantidad_muertos=data['cantidad_muertos'],
+        cantidad_vivos_actual=cantidad_vivos_actual,
+        porcentaje_mortalidad=round(porcentaje_dia, 2),
+        causa=data.get('causa'),
+        observaciones=data.get('observaciones')
+    )
+    
+    db.session.add(nueva_mortalidad)
+    invalidar_cache_lote(data['id_lote'])
+    
+    return {
+        'pollos_vivos_actual': cantidad_vivos_actual,
+        'porcentaje_mortalidad_dia': round(porcentaje_dia, 2)
+    }
+
+
+@bp.route('/mortalidad', methods=['POST'])
+def registrar_mortalidad():
+    """Registrar mortalidad diaria"""
+    try:
+        data = request.get_json()
+        
+        if ingesta_agrupada():
+            resultado = encolar(_registrar_mortalidad, data)
+        else:
+            resultado = _registrar_mortalidad(data)
+            db.session.commit()
+        
+        # La alerta de mortalidad alta se evalúa fuera de la petición
+        encolar_tarea(
+            'alerta_mortalidad',
+            id_lote=data['id_lote'],
+            porcentaje_dia=resultado['porcentaje_mortalidad_dia'],
+            cantidad_muertos=data['cantidad_muertos']
+        )
+        
+        return jsonify({
+            'success': True,
+            'message': 'Mortalidad registrada exitosamente',
+            'data': resultado
+        }), 201
+        
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/mortalidad/lote/<int:id_lote>', methods=['GET'])
+@cache_lote_cerrado
+def obtener_mortalidad_lote(id_lote):
+    """Obtener historial de mortalidad de un lote"""
+    try:
+        modelo = modelo_detalle(MortalidadLote, id_lote)
+        mortalidad = modelo.query.filter_by(id_lote=id_lote).order_by(modelo.fecha_registro.desc()).all()
+        
+        # Calcular estadísticas
+        lote = Lote.query.get_or_404(id_lote)
+        total_muertos = db.session.query(func.sum(modelo.cantidad_muertos)).filter_by(id_lote=id_lote).scalar() or 0
+        pollos_vivos = lote.cantidad_inicial - total_muertos
+        porcentaje_total = (total_muertos / lote.cantidad_inicial * 100) if lote.cantidad_inicial > 0 else 0
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'registros': [m.to_dict() for m in mortalidad],
+                'estadisticas': {
+                    'cantidad_inicial': lote.cantidad_inicial,
+                    'total_muertos': int(total_muertos),
+                    'pollos_vivos': pollos_vivos,
+                    'porcentaje_mortalidad_total': round(porcentaje_total, 2)
+                }
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/mortalidad/resumen', methods=['GET'])
+@clase_consulta('reporte')
+def obtener_resumen_mortalidad():
+    """Obtener resumen de mortalidad de todos los lotes activos"""
+    try:
+        query = db.session.execute(db.text("SELECT * FROM vista_mortalidad_lotes WHERE estado = 'activo'"))
+        
+        formato = formato_tabular()
+        if formato:
+            return respuesta_tabular(query, formato)
+        
+        columns = query.keys()
+        results = [dict(zip(columns, row)) for row in query.fetchall()]
+        
+        # Convertir Decimal a float
+        for result in results:
+            for key, value in result.items():
+                if isinstance(value, Decimal):
+                    result[key] = float(value)
+                elif isinstance(value, date):
+                    result[key] = value.isoformat()
+        
+        return jsonify({
+            'success': True,
+            'data': results
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,98 @@
+"""
+Endpoints de Movimientos de Capital (RF-05)
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from datetime import datetime
+from decimal import Decimal
+from models import db, CapitalLote, MovimientoCapital
+from utils import (
+    campos_solicitados, serializar_listado, cache_lote_cerrado, invalidar_cache_lote, invalidar_reportes,
+    clase_consulta
+)
+from alertas import evaluar_capital
+from archivo import lote_admite_detalle, modelo_detalle
+from conciliacion import conciliar_capital
+
+bp = Blueprint('movimientos', __name__, url_prefix='/api')
+
+
+@bp.route('/movimientos/lote/<int:id_lote>', methods=['GET'])
+@cache_lote_cerrado
+def obtener_movimientos_lote(id_lote):
+    """Obtener todos los movimientos de capital de un lote"""
+    try:
+        modelo = modelo_detalle(MovimientoCapital, id_lote)
+        campos = campos_solicitados(modelo)
+        query = modelo.query.filter_by(id_lote=id_lote).order_by(modelo.fecha_movimiento.desc())
+        return jsonify({
+            'success': True,
+            'data': serializar_listado(query, campos)
+        }), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/movimientos', methods=['POST'])
+def registrar_movimiento():
+    """Registrar un movimiento de capital manual"""
+    try:
+        data = request.get_json()
+        
+        if not lote_admite_detalle(data['id_lote']):
+            return jsonify({'success': False, 'error': 'El lote está archivado: no admite nuevos registros'}), 400
+        
+        nuevo_movimiento = MovimientoCapital(
+            id_lote=data['id_lote'],
+            tipo_movimiento=data['tipo_movimiento'],
+            valor=data['valor'],
+            descripcion=data.get('descripcion'),
+            fecha_movimiento=datetime.strptime(data['fecha_movimiento'], '%Y-%m-%d').date()
+        )
+        
+        db.session.add(nuevo_movimiento)
+        
+        # Actualizar capital
+        capital = CapitalLote.query.filter_by(id_lote=data['id_lote']).first()
+        if capital:
+            if data['tipo_movimiento'] in ['compra', 'gasto', 'retiro']:
+                capital.capital_actual = capital.capital_actual - Decimal(str(data['valor']))
+                evaluar_capital(capital)
+            elif data['tipo_movimiento'] == 'ingreso':
+                capital.capital_actual = capital.capital_actual + Decimal(str(data['valor']))
+        
+        invalidar_reportes(nuevo_movimiento.fecha_movimiento)
+        invalidar_cache_lote(data['id_lote'])
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Movimiento registrado exitosamente'
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/capital/conciliar', methods=['POST'])
+@clase_consulta('reporte')
+def conciliar_capital_lotes():
+    """Comparar el capital de los lotes con su libro de movimientos ({reparar, completa, id_lote})"""
+    try:
+        data = request.get_json(silent=True) or {}
+        resultado = conciliar_capital(
+            current_app.config['CONCILIACION_MARGEN_SEGUNDOS'],
+            reparar=bool(data.get('reparar')),
+            incremental=not data.get('completa'),
+            id_lote=data.get('id_lote')
+        )
+        return jsonify({
+            'success': True,
+            'data': resultado
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,333 @@
+"""
+Endpoints de Notificaciones
+"""
+
+from flask import Blueprint, jsonify, request
+from datetime import datetime, date
+from models import db, Lote, EventoCronograma, Notificacion, ConfiguracionAlertas
+from sqlalchemy import func
+from referencia import marcar_cambio_referencia, respuesta_referencia
+
+bp = Blueprint('notificaciones', __name__, url_prefix='/api')
+
+
+@bp.route('/notificaciones', methods=['GET'])
+def obtener_notificaciones():
+    """Obtener todas las notificaciones (filtro opcional por leída/no leída)"""
+    try:
+        solo_no_leidas = request.args.get('no_leidas', 'false').lower() == 'true'
+        
+        query = Notificacion.query
+        
+        if solo_no_leidas:
+            query = query.filter_by(leida=False)
+        
+        notificaciones = query.order_by(
+            Notificacion.prioridad.desc(),
+            Notificacion.fecha_creacion.desc()
+        ).limit(50).all()
+        
+        # Obtener conteo de no leídas
+        count_no_leidas = Notificacion.query.filter_by(leida=False).count()
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'notificaciones': [n.to_dict() for n in notificaciones],
+                'total_no_leidas': count_no_leidas
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/notificaciones/<int:id_notificacion>/marcar-leida', methods=['POST'])
+def marcar_notificacion_leida(id_notificacion):
+    """Marcar una notificación como leída"""
+    try:
+        notificacion = Notificacion.query.get_or_404(id_notificacion)
+        notificacion.leida = True
+        notificacion.fecha_leida = datetime.utcnow()
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Notificación marcada como leída'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/notificaciones/marcar-todas-leidas', methods=['POST'])
+def marcar_todas_leidas():
+    """Marcar todas las notificaciones como leídas"""
+    try:
+        Notificacion.query.filter_by(leida=False).update({
+            'leida': True,
+            'fecha_leida': datetime.utcnow()
+        })
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Todas las notificaciones marcadas como leídas'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+ACCIONES_MASIVAS = ('marcar_leida', 'eliminar')
+FILTROS_MASIVOS = ('id_lote', 'tipo_notificacion', 'prioridad', 'leida', 'anteriores_a')
+
+
+def _booleano(valor, nombre):
+    """true/false en JSON o como texto (igual que ?no_leidas=)"""
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, str) and valor.lower() in ('true', 'false'):
+        return valor.lower() == 'true'
+    raise ValueError(f"'{nombre}' debe ser true o false")
+
+
+def _consulta_masiva(data):
+    """Construye la consulta de notificaciones a partir de ids o de un filtro"""
+    ids = data.get('ids')
+    filtro = data.get('filtro')
+    
+    if ids is not None and (
+        not isinstance(ids, list) or any(isinstance(i, bool) or not isinstance(i, int) for i in ids)
+    ):
+        raise ValueError("'ids' debe ser una lista de enteros")
+    if filtro is not None and not isinstance(filtro, dict):
+        raise ValueError("'filtro' debe ser un objeto")
+    
+    desconocidos = sorted(set(filtro or {}) - set(FILTROS_MASIVOS))
+    if desconocidos:
+        raise ValueError(
+            f"Filtros no válidos: {', '.join(desconocidos)}; use: {', '.join(FILTROS_MASIVOS)}"
+        )
+    
+    if not ids and not filtro:
+        raise ValueError('Debe indicar ids o un filtro')
+    
+    filtro = filtro or {}
+    query = Notificacion.query
+    
+    if ids:
+        query = query.filter(Notificacion.id_notificacion.in_(ids))
+    if 'id_lote' in filtro:
+        query = query.filter(Notificacion.id_lote == filtro['id_lote'])
+    if 'tipo_notificacion' in filtro:
+        query = query.filter(Notificacion.tipo_notificacion == filtro['tipo_notificacion'])
+    if 'prioridad' in filtro:
+        query = query.filter(Notificacion.prioridad == filtro['prioridad'])
+    if 'leida' in filtro:
+        query = query.filter(Notificacion.leida == _booleano(filtro['leida'], 'leida'))
+    if 'anteriores_a' in filtro:
+        limite = datetime.strptime(filtro['anteriores_a'], '%Y-%m-%d')
+        query = query.filter(Notificacion.fecha_creacion < limite)
+    
+    return query
+
+
+@bp.route('/notificaciones/bulk', methods=['POST'])
+def operacion_masiva_notificaciones():
+    """Marcar como leídas o eliminar varias notificaciones en una sola sentencia"""
+    try:
+        data = request.get_json() or {}
+        
+        accion = data.get('accion')
+        if accion not in ACCIONES_MASIVAS:
+            return jsonify({
+                'success': False,
+                'error': f"Acción no válida, use: {', '.join(ACCIONES_MASIVAS)}"
+            }), 400
+        
+        query = _consulta_masiva(data)
+        
+        if accion == 'marcar_leida':
+            afectadas = query.filter_by(leida=False).update({
+                'leida': True,
+                'fecha_leida': datetime.utcnow()
+            }, synchronize_session=False)
+        else:
+            afectadas = query.delete(synchronize_session=False)
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'{afectadas} notificaciones actualizadas',
+            'data': {'afectadas': afectadas}
+        }), 200
+        
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/notificaciones/generar-automaticas', methods=['POST'])
+def generar_notificaciones_automaticas():
+    """Generar notificaciones automáticas basadas en fechas (edad, salida y cronograma)
+    
+    Las alertas de capital y mortalidad se evalúan al escribir (ver alertas.py).
+    """
+    try:
+        notificaciones_creadas = 0
+        
+        # Obtener lotes activos
+        lotes_activos = Lote.query.filter_by(estado='activo').all()
+        
+        hoy = date.today()
+        
+        for lote in lotes_activos:
+            # Calcular edad del lote
+            dias_edad = (hoy - lote.fecha_inicio).days
+            
+            # 1. ALERTA DE EDAD (cada 7 días después del día 21)
+            if dias_edad >= 21 and dias_edad % 7 == 0:
+                # Comparar con datetime, no date
+                existe = Notificacion.query.filter(
+                    Notificacion.id_lote == lote.id_lote,
+                    Notificacion.tipo_notificacion == 'alerta_edad',
+                    func.date(Notificacion.fecha_creacion) >= hoy
+                ).first()
+                
+                if not existe:
+                    notif = Notificacion(
+                        id_lote=lote.id_lote,
+                        tipo_notificacion='alerta_edad',
+                        prioridad='media',
+                        titulo=f'📅 {lote.nombre_lote} tiene {dias_edad} días',
+                        mensaje=f'El lote tiene {dias_edad} días de edad. Revisar estado general y planificar venta.'
+                    )
+                    db.session.add(notif)
+                    notificaciones_creadas += 1
+            
+            # 2. ALERTA DE FECHA DE SALIDA PRÓXIMA
+            if lote.fecha_estimada_salida:
+                dias_restantes = (lote.fecha_estimada_salida - hoy).days
+                
+                if dias_restantes == 7 or dias_restantes == 3 or dias_restantes == 1:
+                    existe = Notificacion.query.filter(
+                        Notificacion.id_lote == lote.id_lote,
+                        Notificacion.tipo_notificacion == 'alerta_fecha_salida',
+                        func.date(Notificacion.fecha_creacion) >= hoy
+                    ).first()
+                    
+                    if not existe:
+                        prioridad = 'alta' if dias_restantes <= 3 else 'media'
+                        notif = Notificacion(
+                            id_lote=lote.id_lote,
+                            tipo_notificacion='alerta_fecha_salida',
+                            prioridad=prioridad,
+                            titulo=f'⏰ {lote.nombre_lote} - Faltan {dias_restantes} días',
+                            mensaje=f'Faltan {dias_restantes} días para la fecha estimada de salida ({lote.fecha_estimada_salida.strftime("%d/%m/%Y")}). Preparar venta.'
+                        )
+                        db.session.add(notif)
+                        notificaciones_creadas += 1
+            
+            # 3. RECORDATORIOS DE EVENTOS DEL CRONOGRAMA
+            eventos_proximos = EventoCronograma.query.filter(
+                EventoCronograma.id_lote == lote.id_lote,
+                EventoCronograma.estado == 'pendiente',
+                EventoCronograma.fecha_programada == hoy
+            ).all()
+            
+            for evento in eventos_proximos:
+                existe = Notificacion.query.filter(
+                    Notificacion.id_lote == lote.id_lote,
+                    Notificacion.mensaje.like(f'%{evento.descripcion}%'),
+                    func.date(Notificacion.fecha_creacion) >= hoy
+                ).first()
+                
+                if not existe:
+                    tipo_notif = 'recordatorio_vitaminas' if 'vitaminas' in evento.descripcion.lower() else 'recordatorio_cambio_alimento'
+                    if 'melaza' in evento.descripcion.lower():
+                        tipo_notif = 'recordatorio_melaza'
+                    
+                    notif = Notificacion(
+                        id_lote=lote.id_lote,
+                        tipo_notificacion=tipo_notif,
+                        prioridad='alta',
+                        titulo=f'🔔 {lote.nombre_lote} - ¡Evento Hoy!',
+                        mensaje=f'{evento.descripcion} (Día {dias_edad} del ciclo)'
+                    )
+                    db.session.add(notif)
+                    notificaciones_creadas += 1
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'{notificaciones_creadas} notificaciones generadas',
+            'data': {'notificaciones_creadas': notificaciones_creadas}
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/notificaciones/<int:id_notificacion>', methods=['DELETE'])
+def eliminar_notificacion(id_notificacion):
+    """Eliminar una notificación"""
+    try:
+        notificacion = Notificacion.query.get_or_404(id_notificacion)
+        db.session.delete(notificacion)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Notificación eliminada'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/notificaciones/configuracion', methods=['GET'])
+def obtener_configuracion_alertas():
+    """Obtener la configuración de alertas"""
+    try:
+        return respuesta_referencia('configuracion_alertas'), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/notificaciones/configuracion/<tipo_alerta>', methods=['PUT'])
+def actualizar_configuracion_alerta(tipo_alerta):
+    """Actualizar una regla de alerta (umbral, días de anticipación o activa)"""
+    try:
+        config = ConfiguracionAlertas.query.filter_by(tipo_alerta=tipo_alerta).first_or_404()
+        data = request.get_json()
+        
+        if 'umbral' in data:
+            config.umbral = data['umbral']
+        if 'dias_anticipacion' in data:
+            config.dias_anticipacion = data['dias_anticipacion']
+        if 'activa' in data:
+            config.activa = bool(data['activa'])
+        
+        marcar_cambio_referencia('configuracion_alertas')
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Configuración actualizada exitosamente'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
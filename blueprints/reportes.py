@@ -0,0 +1,143 @@
+"""
+Endpoints de Reportes Financieros
+"""
+
+from flask import Blueprint, g, jsonify, request
+from datetime import datetime, date
+import json
+from sqlalchemy import case, func
+from models import (
+    db, Lote, MovimientoCapital, Venta, CompraMateriaPrima, CacheReporte, VersionReferencia, permitir_escritura
+)
+from utils import CONJUNTO_REPORTES, clase_consulta
+from archivo import union_con_archivo
+
+bp = Blueprint('reportes', __name__, url_prefix='/api')
+
+TIPOS_EGRESO = ('compra', 'gasto', 'retiro')
+
+AGRUPACIONES = {
+    'lote': lambda movimientos: [movimientos.c.id_lote, Lote.nombre_lote],
+    'tipo': lambda movimientos: [movimientos.c.tipo_movimiento],
+    'lote_tipo': lambda movimientos: [movimientos.c.id_lote, Lote.nombre_lote, movimientos.c.tipo_movimiento],
+}
+
+
+def _version_reportes(bloquear=False):
+    """Contador de invalidaciones de reportes; con bloquear, lectura con bloqueo compartido"""
+    consulta = db.session.query(VersionReferencia.version).filter_by(conjunto=CONJUNTO_REPORTES)
+    if bloquear:
+        consulta = consulta.with_for_update(read=True)
+    return consulta.scalar() or 0
+
+
+def _calcular_reporte_financiero(desde, hasta, agrupar):
+    """Ingresos y egresos del rango agrupados en SQL sobre las fechas indexadas
+    (tablas activas y archivo de lotes cerrados)"""
+    movimientos = union_con_archivo(
+        MovimientoCapital, ['id_lote', 'tipo_movimiento', 'valor'],
+        lambda tabla: tabla.c.fecha_movimiento.between(desde, hasta)
+    )
+    columnas = AGRUPACIONES[agrupar](movimientos)
+    
+    ingresos = func.coalesce(func.sum(case(
+        (movimientos.c.tipo_movimiento == 'ingreso', movimientos.c.valor), else_=0
+    )), 0)
+    egresos = func.coalesce(func.sum(case(
+        (movimientos.c.tipo_movimiento.in_(TIPOS_EGRESO), movimientos.c.valor), else_=0
+    )), 0)
+    
+    filas = db.session.query(
+        *columnas, ingresos.label('ingresos'), egresos.label('egresos')
+    ).select_from(movimientos).join(
+        Lote, movimientos.c.id_lote == Lote.id_lote
+    ).group_by(*columnas).order_by(*columnas).all()
+    
+    grupos = []
+    total_ingresos = 0.0
+    total_egresos = 0.0
+    for fila in filas:
+        grupo = {columna.key: getattr(fila, columna.key) for columna in columnas}
+        grupo['ingresos'] = float(fila.ingresos)
+        grupo['egresos'] = float(fila.egresos)
+        grupo['neto'] = grupo['ingresos'] - grupo['egresos']
+        total_ingresos += grupo['ingresos']
+        total_egresos += grupo['egresos']
+        grupos.append(grupo)
+    
+    ventas = union_con_archivo(
+        Venta, ['valor_total'], lambda tabla: tabla.c.fecha_venta.between(desde, hasta)
+    )
+    compras = union_con_archivo(
+        CompraMateriaPrima, ['costo_total'], lambda tabla: tabla.c.fecha_compra.between(desde, hasta)
+    )
+    total_ventas = db.session.query(func.coalesce(func.sum(ventas.c.valor_total), 0)).scalar()
+    total_compras = db.session.query(func.coalesce(func.sum(compras.c.costo_total), 0)).scalar()
+    
+    return {
+        'desde': desde.isoformat(),
+        'hasta': hasta.isoformat(),
+        'agrupar': agrupar,
+        'grupos': grupos,
+        'totales': {
+            'ingresos': total_ingresos,
+            'egresos': total_egresos,
+            'neto': total_ingresos - total_egresos,
+            'ventas': float(total_ventas),
+            'compras': float(total_compras)
+        }
+    }
+
+
+@bp.route('/reportes/financiero', methods=['GET'])
+@clase_consulta('reporte')
+def obtener_reporte_financiero():
+    """Ingresos vs egresos por lote y/o tipo de movimiento entre dos fechas"""
+    try:
+        try:
+            desde = datetime.strptime(request.args['desde'], '%Y-%m-%d').date()
+            hasta = datetime.strptime(request.args['hasta'], '%Y-%m-%d').date()
+        except (KeyError, ValueError):
+            return jsonify({'success': False, 'error': 'Parámetros desde y hasta requeridos (YYYY-MM-DD)'}), 400
+        
+        agrupar = request.args.get('agrupar', 'lote')
+        if agrupar not in AGRUPACIONES:
+            return jsonify({
+                'success': False,
+                'error': f"agrupar no válido, use: {', '.join(AGRUPACIONES)}"
+            }), 400
+        
+        if desde > hasta:
+            return jsonify({'success': False, 'error': 'desde no puede ser posterior a hasta'}), 400
+        
+        # Los rangos ya cerrados se sirven desde caché
+        rango_pasado = hasta < date.today()
+        clave = f'financiero:{desde.isoformat()}:{hasta.isoformat()}:{agrupar}'
+        
+        if rango_pasado:
+            # En la primaria: la réplica puede no haber visto aún una invalidación
+            g.usar_replica = False
+            cacheado = CacheReporte.query.filter_by(clave=clave).first()
+            if cacheado:
+                return jsonify({'success': True, 'data': json.loads(cacheado.contenido), 'cache': True}), 200
+            version = _version_reportes()
+        
+        reporte = _calcular_reporte_financiero(desde, hasta, agrupar)
+        
+        if rango_pasado:
+            try:
+                permitir_escritura()
+                # Se guarda solo si ninguna escritura invalidó reportes desde que se leyó
+                # la versión; el bloqueo compartido espera a las invalidaciones en curso
+                # y frena las nuevas hasta el commit
+                if _version_reportes(bloquear=True) == version:
+                    db.session.add(CacheReporte(clave=clave, desde=desde, hasta=hasta, contenido=json.dumps(reporte)))
+                db.session.commit()
+            except Exception:
+                # Otro worker pudo guardarlo primero
+                db.session.rollback()
+        
+        return jsonify({'success': True, 'data': reporte, 'cache': False}), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,40 @@
+"""
+Sondas de salud: /healthz (proceso vivo) y /readyz (pool caliente y esquema al día)
+"""
+
+from flask import Blueprint, jsonify
+from sqlalchemy import select
+from models import db, VersionEsquema, ESQUEMA_VERSION
+from pool import pool_caliente, calentar_pool
+
+bp = Blueprint('salud', __name__)
+
+
+@bp.route('/healthz', methods=['GET'])
+def healthz():
+    """El proceso responde (no toca la base de datos)"""
+    return jsonify({'status': 'ok'}), 200
+
+
+@bp.route('/readyz', methods=['GET'])
+def readyz():
+    """Listo para recibir tráfico: pool caliente y versión de esquema esperada"""
+    try:
+        if not pool_caliente():
+            calentar_pool()
+        
+        # Siempre contra la primaria, aunque la petición sea GET
+        with db.engine.connect() as conexion:
+            version = conexion.execute(
+                select(VersionEsquema.version).where(VersionEsquema.id == 1)
+            ).scalar()
+        
+        listo = version == ESQUEMA_VERSION
+        return jsonify({
+            'status': 'ok' if listo else 'esquema_desactualizado',
+            'pool_caliente': pool_caliente(),
+            'esquema': {'esperada': ESQUEMA_VERSION, 'actual': version}
+        }), 200 if listo else 503
+        
+    except Exception as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 503
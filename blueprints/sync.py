@@ -0,0 +1,80 @@
+"""
+Endpoint de Sincronización Incremental
+Devuelve solo las filas creadas, actualizadas o eliminadas desde un token.
+El token es el contador de cambios (version_sync) confirmado al empezar la
+consulta; los números se asignan en orden de commit (ver models.numerar_cambios_sync).
+"""
+
+from flask import Blueprint, g, jsonify, request
+from models import (
+    db, Lote, Cliente, Venta, VentaCredito, CompraMateriaPrima, RegistroEliminado, VersionReferencia,
+    CONJUNTO_SYNC
+)
+from utils import clase_consulta
+
+bp = Blueprint('sync', __name__, url_prefix='/api')
+
+# Entidad sincronizada -> modelo (con columna version_sync)
+ENTIDADES = {
+    'lotes': Lote,
+    'clientes': Cliente,
+    'ventas': Venta,
+    'compras': CompraMateriaPrima,
+    'creditos': VentaCredito,
+}
+
+
+@bp.route('/sync', methods=['GET'])
+@clase_consulta('exportacion')
+def sincronizar():
+    """Cambios desde ?since=<token> (sin token se devuelve todo) y un token nuevo"""
+    try:
+        since = request.args.get('since')
+        try:
+            desde = int(since) if since else None
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Token de sincronización no válido'}), 400
+        
+        solicitadas = request.args.get('entidades')
+        nombres = solicitadas.split(',') if solicitadas else list(ENTIDADES)
+        invalidas = [nombre for nombre in nombres if nombre not in ENTIDADES]
+        if invalidas:
+            return jsonify({'success': False, 'error': f"Entidades no válidas: {', '.join(invalidas)}"}), 400
+        
+        # En la primaria: una réplica atrasada devolvería un token que ya cubre
+        # cambios que todavía no tiene
+        g.usar_replica = False
+        
+        # El token se lee antes que las filas: todo cambio con número menor o igual
+        # ya está confirmado; uno posterior puede llegar repetido, nunca perderse
+        token = db.session.query(VersionReferencia.version).filter_by(conjunto=CONJUNTO_SYNC).scalar() or 0
+        
+        cambios = {}
+        for nombre in nombres:
+            modelo = ENTIDADES[nombre]
+            query = modelo.query
+            if desde is not None:
+                query = query.filter(modelo.version_sync > desde)
+            cambios[nombre] = [obj.to_dict() for obj in query.all()]
+        
+        eliminados = {nombre: [] for nombre in nombres}
+        if desde is not None:
+            marcas = db.session.query(RegistroEliminado.tabla, RegistroEliminado.id_registro).filter(
+                RegistroEliminado.version_sync > desde,
+                RegistroEliminado.tabla.in_(nombres)
+            ).all()
+            for tabla, id_registro in marcas:
+                eliminados[tabla].append(id_registro)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'token': str(token),
+                'completo': desde is None,
+                'cambios': cambios,
+                'eliminados': eliminados
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
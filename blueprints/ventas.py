@@ -0,0 +1,241 @@
+"""
+Endpoints de Ventas (RF-08)
+"""
+
+from flask import Blueprint, jsonify, request
+from datetime import datetime
+from decimal import Decimal
+from models import db, Lote, CapitalLote, MovimientoCapital, Cliente, Venta, VentaCredito
+from sqlalchemy import select
+from utils import (
+    formato_tabular, respuesta_tabular, cache_lote_cerrado, invalidar_cache_lote, invalidar_reportes,
+    registrar_eliminacion
+)
+from alertas import evaluar_capital
+from archivo import lote_admite_detalle, modelo_detalle
+
+bp = Blueprint('ventas', __name__, url_prefix='/api')
+
+
+@bp.route('/ventas', methods=['POST'])
+def registrar_venta():
+    """Registrar una venta"""
+    try:
+        data = request.get_json()
+        
+        # Validar que el lote esté activo
+        lote = Lote.query.get(data['id_lote'])
+        if not lote or lote.estado != 'activo':
+            return jsonify({'success': False, 'error': 'Lote no válido o cerrado'}), 400
+        if not lote_admite_detalle(lote.id_lote):
+            return jsonify({'success': False, 'error': 'El lote está archivado: no admite nuevos registros'}), 400
+        
+        # Obtener cliente para usar su nombre
+        cliente = Cliente.query.get(data['id_cliente'])
+        if not cliente:
+            return jsonify({'success': False, 'error': 'Cliente no válido'}), 400
+        
+        # Crear venta
+        nueva_venta = Venta(
+            id_lote=data['id_lote'],
+            id_cliente=data['id_cliente'],
+            cantidad_pollos=data['cantidad_pollos'],
+            cantidad_kilos=data['cantidad_kilos'],
+            precio_kilo=data['precio_kilo'],
+            valor_total=Decimal(str(data['cantidad_kilos'])) * Decimal(str(data['precio_kilo'])),
+            fecha_venta=datetime.strptime(data['fecha_venta'], '%Y-%m-%d').date()
+        )
+        
+        db.session.add(nueva_venta)
+        db.session.flush()
+        
+        # Determinar tipo de pago
+        tipo_pago = data.get('tipo_pago', 'contado')
+        
+        if tipo_pago == 'credito':
+            # Crear registro de crédito (RF-09)
+            valor_pagado_inicial = Decimal(str(data.get('valor_pagado_inicial', 0)))
+            valor_pendiente = nueva_venta.valor_total - valor_pagado_inicial
+            
+            credito = VentaCredito(
+                id_venta=nueva_venta.id_venta,
+                valor_total=nueva_venta.valor_total,
+                valor_pagado=valor_pagado_inicial,
+                valor_pendiente=valor_pendiente,
+                estado_deuda='pendiente' if valor_pendiente == nueva_venta.valor_total else 'parcial'
+            )
+            
+            db.session.add(credito)
+            
+            # Solo registrar ingreso por lo pagado inicialmente
+            if valor_pagado_inicial > 0:
+                movimiento = MovimientoCapital(
+                    id_lote=data['id_lote'],
+                    tipo_movimiento='ingreso',
+                    valor=valor_pagado_inicial,
+                    descripcion=f"Venta (pago inicial) - Cliente: {cliente.nombre}",
+                    fecha_movimiento=nueva_venta.fecha_venta
+                )
+                db.session.add(movimiento)
+                
+                # Actualizar capital
+                capital = CapitalLote.query.filter_by(id_lote=data['id_lote']).first()
+                if capital:
+                    capital.capital_actual = capital.capital_actual + valor_pagado_inicial
+        else:
+            # Pago de contado - registrar ingreso completo
+            movimiento = MovimientoCapital(
+                id_lote=data['id_lote'],
+                tipo_movimiento='ingreso',
+                valor=nueva_venta.valor_total,
+                descripcion=f"Venta de contado - Cliente: {cliente.nombre}",
+                fecha_movimiento=nueva_venta.fecha_venta
+            )
+            db.session.add(movimiento)
+            
+            # Actualizar capital
+            capital = CapitalLote.query.filter_by(id_lote=data['id_lote']).first()
+            if capital:
+                capital.capital_actual = capital.capital_actual + nueva_venta.valor_total
+        
+        invalidar_reportes(nueva_venta.fecha_venta)
+        invalidar_cache_lote(data['id_lote'])
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Venta registrada exitosamente',
+            'data': {'id_venta': nueva_venta.id_venta}
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/ventas/lote/<int:id_lote>', methods=['GET'])
+@cache_lote_cerrado
+def obtener_ventas_lote(id_lote):
+    """Obtener todas las ventas de un lote"""
+    try:
+        modelo = modelo_detalle(Venta, id_lote)
+        ventas = modelo.query.filter_by(id_lote=id_lote).order_by(modelo.fecha_venta.desc()).all()
+        
+        resultado = []
+        for venta in ventas:
+            venta_dict = venta.to_dict()
+            venta_dict['cliente_nombre'] = venta.cliente.nombre if venta.cliente else 'N/A'
+            
+            # Agregar info de crédito si existe
+            if venta.credito:
+                venta_dict['credito'] = venta.credito.to_dict()
+            
+            resultado.append(venta_dict)
+        
+        return jsonify({
+            'success': True,
+            'data': resultado
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/ventas', methods=['GET'])
+def obtener_todas_ventas():
+    """Obtener todas las ventas con filtros opcionales"""
+    try:
+        formato = formato_tabular()
+        if formato:
+            ventas = Venta.__table__
+            creditos = VentaCredito.__table__
+            consulta = select(
+                ventas.c.id_venta, ventas.c.id_lote, ventas.c.id_cliente, ventas.c.cantidad_pollos,
+                ventas.c.cantidad_kilos, ventas.c.precio_kilo, ventas.c.valor_total, ventas.c.fecha_venta,
+                Cliente.__table__.c.nombre.label('cliente_nombre'),
+                Lote.__table__.c.nombre_lote.label('lote_nombre'),
+                creditos.c.id_credito,
+                creditos.c.valor_pagado.label('credito_valor_pagado'),
+                creditos.c.valor_pendiente.label('credito_valor_pendiente'),
+                creditos.c.estado_deuda.label('credito_estado_deuda')
+            ).select_from(ventas).outerjoin(
+                Cliente.__table__, ventas.c.id_cliente == Cliente.__table__.c.id_cliente
+            ).outerjoin(
+                Lote.__table__, ventas.c.id_lote == Lote.__table__.c.id_lote
+            ).outerjoin(
+                creditos, creditos.c.id_venta == ventas.c.id_venta
+            ).order_by(
+                ventas.c.fecha_venta.desc()
+            ).limit(50)
+            return respuesta_tabular(db.session.execute(consulta), formato)
+        
+        ventas = Venta.query.order_by(Venta.fecha_venta.desc()).limit(50).all()
+        
+        resultado = []
+        for venta in ventas:
+            venta_dict = venta.to_dict()
+            venta_dict['cliente_nombre'] = venta.cliente.nombre if venta.cliente else 'N/A'
+            venta_dict['lote_nombre'] = venta.lote.nombre_lote if venta.lote else 'N/A'
+            
+            if venta.credito:
+                venta_dict['credito'] = venta.credito.to_dict()
+            
+            resultado.append(venta_dict)
+        
+        return jsonify({
+            'success': True,
+            'data': resultado
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/ventas/<int:id_venta>', methods=['DELETE'])
+def eliminar_venta(id_venta):
+    """Eliminar una venta y revertir el movimiento de capital"""
+    try:
+        venta = Venta.query.get_or_404(id_venta)
+        
+        # Revertir el capital
+        capital = CapitalLote.query.filter_by(id_lote=venta.id_lote).first()
+        if capital:
+            # Si tiene crédito, revertir solo lo pagado
+            if venta.credito:
+                capital.capital_actual = capital.capital_actual - venta.credito.valor_pagado
+            else:
+                # Si fue de contado, revertir todo
+                capital.capital_actual = capital.capital_actual - venta.valor_total
+            evaluar_capital(capital)
+        
+        # Eliminar movimientos asociados
+        movimientos = MovimientoCapital.query.filter_by(
+            id_lote=venta.id_lote,
+            tipo_movimiento='ingreso'
+        ).filter(
+            MovimientoCapital.descripcion.like(f'%Cliente: {venta.cliente.nombre}%')
+        ).all()
+        
+        for mov in movimientos:
+            invalidar_reportes(mov.fecha_movimiento)
+            db.session.delete(mov)
+        
+        # Si tiene crédito, eliminar pagos y crédito
+        if venta.credito:
+            for pago in venta.credito.pagos:
+                db.session.delete(pago)
+            registrar_eliminacion('creditos', venta.credito.id_credito)
+            db.session.delete(venta.credito)
+        
+        invalidar_reportes(venta.fecha_venta)
+        invalidar_cache_lote(venta.id_lote)
+        registrar_eliminacion('ventas', venta.id_venta)
+        db.session.delete(venta)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Venta eliminada exitosamente'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
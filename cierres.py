@@ -0,0 +1,88 @@
+"""
+Resumen congelado de lotes cerrados
+Al cerrar un lote se agregan una sola vez sus ventas, movimientos y
+mortalidad; los reportes históricos leen una fila por lote. Los pagos de
+créditos posteriores al cierre se suman después al resumen.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import case, func, update
+from models import db, CapitalLote, MovimientoCapital, Venta, MortalidadLote, ResumenCierreLote
+
+CENTAVOS = Decimal('0.01')
+
+
+def _redondear(valor):
+    return Decimal(valor).quantize(CENTAVOS, rounding=ROUND_HALF_UP)
+
+
+def calcular_resumen_cierre(lote):
+    """Crea o reemplaza el ResumenCierreLote del lote en la sesión actual"""
+    pollos_vendidos, kilos_vendidos, total_ventas = db.session.query(
+        func.coalesce(func.sum(Venta.cantidad_pollos), 0),
+        func.coalesce(func.sum(Venta.cantidad_kilos), 0),
+        func.coalesce(func.sum(Venta.valor_total), 0)
+    ).filter(Venta.id_lote == lote.id_lote).one()
+    
+    movimientos = dict(db.session.query(
+        MovimientoCapital.tipo_movimiento,
+        func.sum(MovimientoCapital.valor)
+    ).filter(
+        MovimientoCapital.id_lote == lote.id_lote
+    ).group_by(MovimientoCapital.tipo_movimiento).all())
+    
+    total_muertos = db.session.query(
+        func.coalesce(func.sum(MortalidadLote.cantidad_muertos), 0)
+    ).filter(MortalidadLote.id_lote == lote.id_lote).scalar()
+    
+    capital = CapitalLote.query.filter_by(id_lote=lote.id_lote).first()
+    
+    kilos_vendidos = Decimal(str(kilos_vendidos))
+    total_ventas = Decimal(str(total_ventas))
+    total_compras = Decimal(str(movimientos.get('compra') or 0))
+    total_gastos = Decimal(str(movimientos.get('gasto') or 0))
+    
+    resumen = db.session.get(ResumenCierreLote, lote.id_lote) or ResumenCierreLote(id_lote=lote.id_lote)
+    resumen.fecha_cierre = lote.fecha_cierre
+    resumen.cantidad_inicial = lote.cantidad_inicial
+    resumen.capital_inicial = capital.capital_inicial if capital else 0
+    resumen.capital_final = capital.capital_actual if capital else 0
+    resumen.total_ventas = total_ventas
+    resumen.total_compras = total_compras
+    resumen.total_gastos = total_gastos
+    resumen.total_ingresos = Decimal(str(movimientos.get('ingreso') or 0))
+    resumen.total_retiros = Decimal(str(movimientos.get('retiro') or 0))
+    resumen.pollos_vendidos = int(pollos_vendidos)
+    resumen.kilos_vendidos = kilos_vendidos
+    resumen.total_muertos = int(total_muertos)
+    resumen.porcentaje_mortalidad = _redondear(
+        Decimal(int(total_muertos)) / lote.cantidad_inicial * 100 if lote.cantidad_inicial else 0
+    )
+    resumen.precio_promedio_kilo = _redondear(total_ventas / kilos_vendidos) if kilos_vendidos else None
+    resumen.costo_por_pollo = (
+        _redondear((total_compras + total_gastos) / lote.cantidad_inicial) if lote.cantidad_inicial else None
+    )
+    
+    db.session.add(resumen)
+    return resumen
+
+
+def sumar_ingresos_resumen(ingresos_por_lote):
+    """Suma {id_lote: valor} de pagos cobrados después del cierre al resumen congelado.
+    
+    Un UPDATE incremental (no pisa pagos concurrentes); los lotes sin resumen
+    (abiertos) no se tocan.
+    """
+    if not ingresos_por_lote:
+        return
+    resumen = ResumenCierreLote.__table__
+    valor = case(ingresos_por_lote, value=resumen.c.id_lote)
+    db.session.execute(update(resumen).where(resumen.c.id_lote.in_(list(ingresos_por_lote))).values(
+        capital_final=resumen.c.capital_final + valor,
+        total_ingresos=resumen.c.total_ingresos + valor
+    ))
+
+
+def eliminar_resumen_cierre(id_lote):
+    """Descarta el resumen de un lote reabierto o eliminado"""
+    ResumenCierreLote.query.filter_by(id_lote=id_lote).delete(synchronize_session=False)
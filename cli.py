@@ -0,0 +1,202 @@
+"""
+Comandos CLI de la aplicación (flask <comando>)
+"""
+
+import click
+from flask import current_app, g
+from flask.cli import with_appcontext
+from models import db, ConfiguracionAlertas, VersionEsquema, VersionReferencia, ESQUEMA_VERSION, CONJUNTO_SYNC
+from granjas import motor_granja
+from migraciones import columnas_faltantes, migrar_esquema
+from referencia import CONJUNTOS, marcar_cambio_referencia
+from utils import CONJUNTO_REPORTES
+
+
+CONFIGURACION_ALERTAS_INICIAL = [
+    {
+        'tipo_alerta': 'alerta_fecha_salida',
+        'dias_anticipacion': 7,
+        'descripcion': 'Alertar X días antes de la fecha estimada de salida'
+    },
+    {
+        'tipo_alerta': 'alerta_capital_bajo',
+        'dias_anticipacion': 0,
+        'umbral': 20,
+        'descripcion': 'Alertar cuando capital < 20% del inicial'
+    },
+    {
+        'tipo_alerta': 'alerta_mortalidad_alta',
+        'dias_anticipacion': 0,
+        'umbral': 5,
+        'descripcion': 'Alertar cuando mortalidad diaria > 5%'
+    },
+]
+
+
+@click.command('init-db')
+@click.option('--granja', default=None, help='Inicializar la base de datos de esta granja')
+@with_appcontext
+def init_db_command(granja):
+    """Crear las tablas, migrar las existentes e insertar la configuración inicial de alertas"""
+    if granja:
+        if granja not in current_app.config['GRANJAS']:
+            raise click.ClickException(f'Granja no configurada: {granja}')
+        # La sesión enruta a la granja durante el resto del comando
+        g.granja = granja
+        motor = motor_granja(granja)
+        db.metadata.create_all(motor)
+    else:
+        db.create_all()
+        motor = db.engine
+    
+    # create_all no agrega columnas a tablas existentes
+    for version, tabla, nombre in migrar_esquema(motor):
+        click.echo(f'Migración {version}: {tabla}.{nombre}')
+    faltantes = columnas_faltantes(motor)
+    if faltantes:
+        raise click.ClickException(f"Faltan columnas, no se registra la versión del esquema: {', '.join(faltantes)}")
+    
+    # Insertar configuración inicial
+    if not ConfiguracionAlertas.query.first():
+        db.session.add_all([
+            ConfiguracionAlertas(activa=True, **config) for config in CONFIGURACION_ALERTAS_INICIAL
+        ])
+        marcar_cambio_referencia('configuracion_alertas')
+        db.session.commit()
+    
+    # Contadores de la caché de referencia (así la primera escritura solo hace UPDATE)
+    for conjunto in (*CONJUNTOS, CONJUNTO_REPORTES, CONJUNTO_SYNC):
+        if db.session.get(VersionReferencia, conjunto) is None:
+            db.session.add(VersionReferencia(conjunto=conjunto, version=0))
+    
+    # Registrar la versión del esquema que comprueba /readyz (columnas ya verificadas)
+    db.session.merge(VersionEsquema(id=1, version=ESQUEMA_VERSION))
+    db.session.commit()
+    
+    click.echo('Base de datos inicializada correctamente')
+
+
+@click.command('archivar-notificaciones')
+@click.option('--dias', type=int, default=None, help='Días que se conservan las notificaciones leídas')
+@click.option('--tamano-lote', type=int, default=None, help='Filas movidas por transacción')
+@with_appcontext
+def archivar_notificaciones_command(dias, tamano_lote):
+    """Mover notificaciones leídas antiguas y de lotes cerrados al archivo"""
+    from retencion import archivar_notificaciones
+    
+    resultado = archivar_notificaciones(
+        dias if dias is not None else current_app.config['RETENCION_NOTIFICACIONES_DIAS'],
+        tamano_lote or current_app.config['RETENCION_TAMANO_LOTE']
+    )
+    
+    click.echo(
+        f"{resultado['movidas']} notificaciones archivadas en {resultado['bloques']} bloques "
+        f"({resultado['duracion_ms']} ms)"
+    )
+
+
+@click.command('archivar-lotes')
+@click.option('--dias', type=int, default=None, help='Días que el lote debe llevar cerrado')
+@click.option('--tamano-lote', type=int, default=None, help='Filas movidas por transacción')
+@click.option('--lote', 'id_lote', type=int, default=None, help='Archivar solo este lote cerrado')
+@with_appcontext
+def archivar_lotes_command(dias, tamano_lote, id_lote):
+    """Mover el detalle de los lotes cerrados a las tablas de archivo"""
+    from archivo import archivar_lotes_cerrados
+    
+    resultado = archivar_lotes_cerrados(
+        dias if dias is not None else current_app.config['ARCHIVO_LOTES_DIAS'],
+        tamano_lote or current_app.config['RETENCION_TAMANO_LOTE'],
+        id_lote
+    )
+    
+    if id_lote and not resultado['lotes']:
+        raise click.ClickException(f'El lote {id_lote} no está cerrado, tiene créditos pendientes o ya está archivado')
+    
+    click.echo(
+        f"{len(resultado['lotes'])} lotes archivados: {resultado['copiadas']} filas copiadas, "
+        f"{resultado['borradas']} borradas de las tablas activas ({resultado['duracion_ms']} ms)"
+    )
+
+
+@click.command('normalizar-busqueda')
+@click.option('--tamano-lote', type=int, default=None, help='Filas actualizadas por transacción')
+@with_appcontext
+def normalizar_busqueda_command(tamano_lote):
+    """Rellenar las columnas *_normalizado y las palabras indexadas de clientes y lotes"""
+    from sqlalchemy import bindparam, select, update
+    from models import Cliente, Lote, normalizar_busqueda, solo_digitos, indexar_terminos
+    
+    # Tabla -> (entidad en terminos_busqueda, columnas normalizadas calculadas desde la fila)
+    normalizaciones = {
+        Cliente.__table__: ('cliente', lambda fila: {
+            'nombre_normalizado': normalizar_busqueda(fila.nombre),
+            'telefono_normalizado': solo_digitos(fila.telefono) or None,
+        }),
+        Lote.__table__: ('lote', lambda fila: {
+            'nombre_normalizado': normalizar_busqueda(fila.nombre_lote),
+        }),
+    }
+    
+    tamano_lote = tamano_lote or current_app.config['RETENCION_TAMANO_LOTE']
+    total = 0
+    for tabla, (entidad, normalizar) in normalizaciones.items():
+        pk = tabla.primary_key.columns[0]
+        ultimo = 0
+        while True:
+            filas = db.session.execute(
+                select(tabla).where(pk > ultimo).order_by(pk).limit(tamano_lote)
+            ).all()
+            if not filas:
+                break
+            
+            valores = [{'id_fila': getattr(fila, pk.key), **normalizar(fila)} for fila in filas]
+            columnas = {nombre: bindparam(nombre) for nombre in valores[0] if nombre != 'id_fila'}
+            # updated_at y version_sync se conservan para no reenviar todo por /api/sync
+            db.session.execute(
+                update(tabla).where(pk == bindparam('id_fila')).values(
+                    updated_at=tabla.c.updated_at, version_sync=tabla.c.version_sync, **columnas
+                ),
+                valores
+            )
+            conexion = db.session.connection()
+            for valor in valores:
+                indexar_terminos(conexion, entidad, valor['id_fila'], valor['nombre_normalizado'])
+            db.session.commit()
+            total += len(filas)
+            ultimo = valores[-1]['id_fila']
+    
+    click.echo(f'{total} filas normalizadas')
+
+
+@click.command('conciliar-capital')
+@click.option('--reparar', is_flag=True, help='Corregir capital_actual de los lotes con diferencia')
+@click.option('--completa', is_flag=True, help='Recalcular todo el libro ignorando los puntos de control')
+@click.option('--lote', 'id_lote', type=int, default=None, help='Conciliar solo este lote')
+@with_appcontext
+def conciliar_capital_command(reparar, completa, id_lote):
+    """Comparar el capital de cada lote con su libro de movimientos"""
+    from conciliacion import conciliar_capital
+    
+    resultado = conciliar_capital(
+        current_app.config['CONCILIACION_MARGEN_SEGUNDOS'],
+        reparar=reparar, incremental=not completa, id_lote=id_lote
+    )
+    
+    for diferencia in resultado['diferencias']:
+        click.echo(
+            f"Lote {diferencia['id_lote']}: capital {diferencia['capital_actual']:,.2f}, "
+            f"libro {diferencia['capital_esperado']:,.2f} (diferencia {diferencia['diferencia']:,.2f})"
+        )
+    click.echo(
+        f"{resultado['lotes_revisados']} lotes revisados, {len(resultado['diferencias'])} con diferencia"
+        f"{' (reparados)' if resultado['reparado'] else ''} ({resultado['duracion_ms']} ms)"
+    )
+
+
+def registrar_comandos(app):
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(archivar_notificaciones_command)
+    app.cli.add_command(archivar_lotes_command)
+    app.cli.add_command(normalizar_busqueda_command)
+    app.cli.add_command(conciliar_capital_command)
@@ -0,0 +1,172 @@
+"""
+Conciliación de capital
+Recalcula el capital esperado de cada lote (capital inicial + ingresos - egresos
+del libro movimientos_capital, incluido el archivo) con una sola consulta
+agrupada y lo compara con capital_actual. El neto ya verificado de cada lote
+queda como punto de control: una corrida incremental solo suma los movimientos
+posteriores a él.
+"""
+
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from models import (
+    db, CapitalLote, ConciliacionCapital, MovimientoCapital, MovimientoCapitalArchivado, ResumenCierreLote
+)
+from archivo import union_con_archivo
+
+
+def _tope_verificable(margen_segundos):
+    """Mayor id de movimiento que puede cubrir el punto de control.
+    
+    Se excluyen los movimientos de los últimos segundos: una transacción aún
+    abierta puede confirmar después un id menor que el máximo visible.
+    """
+    limite = datetime.utcnow() - timedelta(seconds=margen_segundos)
+    topes = [
+        db.session.execute(
+            select(tabla.c.id_movimiento).where(tabla.c.created_at < limite)
+            .order_by(tabla.c.id_movimiento.desc()).limit(1)
+        ).scalar() or 0
+        for tabla in (MovimientoCapital.__table__, MovimientoCapitalArchivado.__table__)
+    ]
+    return max(topes)
+
+
+def _netos_libro(piso, sin_punto, tope, incremental, id_lote):
+    """{id_lote: (neto posterior al punto de control, parte de ese neto hasta el tope)}
+    
+    Lee los movimientos con id mayor que piso (rango de la clave primaria) más
+    todos los de los lotes sin punto de control (índice de id_lote).
+    """
+    def condicion(tabla):
+        # Cada lote se lee de una sola tabla (ver union_con_archivo): sin dobles conteos
+        nuevos = tabla.c.id_movimiento > piso
+        if sin_punto:
+            nuevos = or_(nuevos, tabla.c.id_lote.in_(sin_punto))
+        if id_lote:
+            return and_(nuevos, tabla.c.id_lote == id_lote)
+        return nuevos
+    
+    movimientos = union_con_archivo(
+        MovimientoCapital, ['id_movimiento', 'id_lote', 'tipo_movimiento', 'valor'], condicion
+    )
+    firmado = case((movimientos.c.tipo_movimiento == 'ingreso', movimientos.c.valor), else_=-movimientos.c.valor)
+    consulta = select(
+        movimientos.c.id_lote,
+        func.coalesce(func.sum(firmado), 0),
+        func.coalesce(func.sum(case((movimientos.c.id_movimiento <= tope, firmado), else_=0)), 0)
+    ).group_by(movimientos.c.id_lote)
+    
+    if incremental:
+        punto = ConciliacionCapital.__table__
+        consulta = consulta.select_from(
+            movimientos.outerjoin(punto, punto.c.id_lote == movimientos.c.id_lote)
+        ).where(movimientos.c.id_movimiento > func.coalesce(punto.c.hasta_id_movimiento, 0))
+    
+    return {
+        fila[0]: (Decimal(str(fila[1])), Decimal(str(fila[2])))
+        for fila in db.session.execute(consulta)
+    }
+
+
+def conciliar_capital(margen_segundos, reparar=False, incremental=True, id_lote=None):
+    """Compara capital_actual con el libro; opcionalmente corrige la diferencia.
+    
+    Todo corre en una transacción: las lecturas ven una misma foto del libro y
+    del capital, y la reparación suma el ajuste (no pisa cambios concurrentes).
+    """
+    inicio = time.perf_counter()
+    tope = _tope_verificable(margen_segundos)
+    
+    capital = CapitalLote.__table__
+    punto = ConciliacionCapital.__table__
+    consulta = select(
+        capital.c.id_capital, capital.c.id_lote, capital.c.capital_inicial, capital.c.capital_actual,
+        punto.c.hasta_id_movimiento, punto.c.neto_movimientos
+    ).outerjoin(punto, punto.c.id_lote == capital.c.id_lote).order_by(capital.c.id_capital)
+    if id_lote:
+        consulta = consulta.where(capital.c.id_lote == id_lote)
+    
+    # Un capital por lote (el primero, como CapitalLote.query.filter_by(...).first())
+    lotes = {}
+    for fila in db.session.execute(consulta):
+        lotes.setdefault(fila.id_lote, fila)
+    
+    def previo(fila):
+        if incremental and fila.hasta_id_movimiento is not None:
+            return fila.hasta_id_movimiento, Decimal(str(fila.neto_movimientos))
+        return 0, Decimal(0)
+    
+    # Lotes nuevos o con un movimiento verificado borrado no tienen punto de control
+    con_punto = {
+        id_actual: fila.hasta_id_movimiento for id_actual, fila in lotes.items()
+        if incremental and fila.hasta_id_movimiento is not None
+    }
+    piso = min(con_punto.values(), default=0)
+    sin_punto = [id_actual for id_actual in lotes if id_actual not in con_punto] if piso else []
+    netos = _netos_libro(piso, sin_punto, tope, incremental, id_lote)
+    
+    ahora = datetime.utcnow()
+    diferencias = []
+    ajustes = {}
+    puntos = []
+    for id_actual, fila in lotes.items():
+        hasta_previo, neto_previo = previo(fila)
+        neto_nuevo, neto_verificable = netos.get(id_actual, (Decimal(0), Decimal(0)))
+        
+        esperado = Decimal(str(fila.capital_inicial)) + neto_previo + neto_nuevo
+        diferencia = Decimal(str(fila.capital_actual)) - esperado
+        if diferencia:
+            diferencias.append({
+                'id_lote': id_actual,
+                'capital_actual': float(fila.capital_actual),
+                'capital_esperado': float(esperado),
+                'diferencia': float(diferencia)
+            })
+            ajustes[fila.id_capital] = -diferencia
+        
+        puntos.append({
+            'id_lote': id_actual,
+            'hasta_id_movimiento': max(hasta_previo, tope),
+            'neto_movimientos': neto_previo + neto_verificable,
+            'verificado_en': ahora
+        })
+    
+    try:
+        # Puntos de control nuevos (el neto del libro no depende de la reparación)
+        borrar = delete(punto)
+        if id_lote:
+            borrar = borrar.where(punto.c.id_lote == id_lote)
+        db.session.execute(borrar)
+        if puntos:
+            db.session.execute(insert(punto), puntos)
+        
+        if reparar and ajustes:
+            db.session.execute(update(capital).where(capital.c.id_capital.in_(list(ajustes))).values(
+                capital_actual=capital.c.capital_actual + case(ajustes, value=capital.c.id_capital)
+            ))
+            # El resumen congelado de un lote cerrado guarda su capital final
+            resumen = ResumenCierreLote.__table__
+            por_lote = {
+                fila.id_lote: ajustes[fila.id_capital]
+                for fila in lotes.values() if fila.id_capital in ajustes
+            }
+            db.session.execute(update(resumen).where(resumen.c.id_lote.in_(list(por_lote))).values(
+                capital_final=resumen.c.capital_final + case(por_lote, value=resumen.c.id_lote)
+            ))
+        
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    return {
+        'incremental': incremental,
+        'reparado': bool(reparar and ajustes),
+        'lotes_revisados': len(lotes),
+        'hasta_id_movimiento': tope,
+        'diferencias': diferencias,
+        'duracion_ms': round((time.perf_counter() - inicio) * 1000, 1)
+    }
@@ -1,4 +1,5 @@
 import os
+import json
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -14,10 +15,97 @@ class Config:
     if not SQLALCHEMY_DATABASE_URI:
         SQLALCHEMY_DATABASE_URI = 'mysql+pymysql://root:@localhost:3306/pollo_cobb_flask'
     
+    # Réplica de lectura opcional (GET, exportes y analítica)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith('mysql://'):
+        DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace('mysql://', 'mysql+pymysql://', 1)
+    
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    
+    # Segundos que un cliente lee de la primaria después de escribir (read-your-writes)
+    REPLICA_LECTURA_PROPIA_SEGUNDOS = int(os.environ.get('REPLICA_LECTURA_PROPIA_SEGUNDOS', 5))
+    
+    # Compresión gzip de respuestas JSON grandes
+    COMPRESION_MINIMA_BYTES = int(os.environ.get('COMPRESION_MINIMA_BYTES', 1024))
+    COMPRESION_NIVEL = int(os.environ.get('COMPRESION_NIVEL', 6))
+    
+    # Max-age (segundos) de las respuestas cacheadas de lotes cerrados; corto porque
+    # un pago posterior al cierre invalida la caché del servidor pero no la del navegador
+    CACHE_LOTE_CERRADO_MAX_AGE = int(os.environ.get('CACHE_LOTE_CERRADO_MAX_AGE', 60))
+    
+    # Retención de notificaciones: días que se conservan las leídas y filas por transacción
+    RETENCION_NOTIFICACIONES_DIAS = int(os.environ.get('RETENCION_NOTIFICACIONES_DIAS', 30))
+    RETENCION_TAMANO_LOTE = int(os.environ.get('RETENCION_TAMANO_LOTE', 500))
+    
+    # Días que un lote debe llevar cerrado antes de archivar su detalle (usa RETENCION_TAMANO_LOTE)
+    ARCHIVO_LOTES_DIAS = int(os.environ.get('ARCHIVO_LOTES_DIAS', 90))
+    
+    # Peticiones por lote: máximo de subpeticiones y de hilos concurrentes por proceso
+    BATCH_MAX_SUBPETICIONES = int(os.environ.get('BATCH_MAX_SUBPETICIONES', 10))
+    BATCH_MAX_HILOS = int(os.environ.get('BATCH_MAX_HILOS', 4))
+    
+    # Perfilador bajo demanda (desactivado si no hay secreto)
+    PERFILADOR_SECRETO = os.environ.get('PERFILADOR_SECRETO')
+    PERFILADOR_DIRECTORIO = os.environ.get('PERFILADOR_DIRECTORIO')
+    PERFILADOR_MAXIMO = int(os.environ.get('PERFILADOR_MAXIMO', 50))
+    
+    # Timeout (ms) de las consultas SELECT por clase de ruta; 0 = sin límite (MySQL max_execution_time)
+    TIMEOUT_CONSULTA_MS = {
+        'interactiva': int(os.environ.get('TIMEOUT_CONSULTA_INTERACTIVA_MS', 5000)),
+        'reporte': int(os.environ.get('TIMEOUT_CONSULTA_REPORTE_MS', 30000)),
+        'exportacion': int(os.environ.get('TIMEOUT_CONSULTA_EXPORTACION_MS', 120000)),
+    }
+    
+    # Conexiones que cada worker abre y valida al arrancar
+    POOL_CONEXIONES_CALENTAR = int(os.environ.get('POOL_CONEXIONES_CALENTAR', 3))
+    
+    # Validación periódica de conexiones inactivas (segundos); si está activa
+    # reemplaza a pool_pre_ping y su round trip en cada checkout
+    POOL_VALIDACION_SEGUNDOS = int(os.environ.get('POOL_VALIDACION_SEGUNDOS', 0))
+    
+    # Multi-granja: {"granja": "url de base de datos"} (vacío = una sola base de datos)
+    GRANJAS = json.loads(os.environ.get('GRANJAS', '{}'))
+    # Dominio base para resolver la granja por subdominio (norte.<dominio>)
+    GRANJA_DOMINIO_BASE = os.environ.get('GRANJA_DOMINIO_BASE')
+    # Conexiones del pool de cada granja y segundos sin uso antes de descartar su engine
+    GRANJA_POOL_TAMANO = int(os.environ.get('GRANJA_POOL_TAMANO', 3))
+    GRANJA_INACTIVIDAD_SEGUNDOS = int(os.environ.get('GRANJA_INACTIVIDAD_SEGUNDOS', 600))
+    
+    # Group commit de mortalidad y eventos completados: tamaño máximo del lote,
+    # ventana de espera (ms) y espera máxima de cada petición (s)
+    INGESTA_AGRUPADA = os.environ.get('INGESTA_AGRUPADA', 'false').lower() == 'true'
+    INGESTA_MAX_LOTE = int(os.environ.get('INGESTA_MAX_LOTE', 50))
+    INGESTA_ESPERA_MS = int(os.environ.get('INGESTA_ESPERA_MS', 5))
+    INGESTA_TIMEOUT_SEGUNDOS = int(os.environ.get('INGESTA_TIMEOUT_SEGUNDOS', 10))
+    
+    # Ejecutor de efectos secundarios: hilos, tamaño de la cola, reintentos
+    # (espera base que se duplica por intento), revisión de la tabla y drenaje al apagar
+    TAREAS_MAX_HILOS = int(os.environ.get('TAREAS_MAX_HILOS', 2))
+    TAREAS_MAX_COLA = int(os.environ.get('TAREAS_MAX_COLA', 1000))
+    TAREAS_MAX_INTENTOS = int(os.environ.get('TAREAS_MAX_INTENTOS', 5))
+    TAREAS_ESPERA_BASE_SEGUNDOS = int(os.environ.get('TAREAS_ESPERA_BASE_SEGUNDOS', 30))
+    TAREAS_REVISION_SEGUNDOS = int(os.environ.get('TAREAS_REVISION_SEGUNDOS', 30))
+    TAREAS_DRENAJE_SEGUNDOS = int(os.environ.get('TAREAS_DRENAJE_SEGUNDOS', 10))
+    
+    # Búsqueda typeahead: resultados por defecto y máximo por petición
+    BUSQUEDA_LIMITE = int(os.environ.get('BUSQUEDA_LIMITE', 10))
+    BUSQUEDA_LIMITE_MAXIMO = int(os.environ.get('BUSQUEDA_LIMITE_MAXIMO', 50))
+    # Caracteres mínimos para buscar por subcadena cuando ni prefijo ni palabra coinciden (no usa índice;
+    # por debajo de este largo una búsqueda sin resultados termina en las fases indexadas)
+    BUSQUEDA_SUBCADENA_MINIMO = int(os.environ.get('BUSQUEDA_SUBCADENA_MINIMO', 4))
+    
+    # Línea de tiempo del lote: eventos por página por defecto y máximo
+    TIMELINE_LIMITE = int(os.environ.get('TIMELINE_LIMITE', 50))
+    TIMELINE_LIMITE_MAXIMO = int(os.environ.get('TIMELINE_LIMITE_MAXIMO', 200))
+    
+    # Conciliación de capital: el punto de control no avanza sobre movimientos más
+    # recientes que este margen (transacciones aún sin confirmar con ids menores)
+    CONCILIACION_MARGEN_SEGUNDOS = int(os.environ.get('CONCILIACION_MARGEN_SEGUNDOS', 300))
+    
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_recycle': 280,
-        'pool_pre_ping': True,
+        'pool_pre_ping': not POOL_VALIDACION_SEGUNDOS,
     }
 
 config = {
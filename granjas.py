@@ -0,0 +1,153 @@
+"""
+Multi-granja
+Cada petición se resuelve a una granja (cabecera X-Granja o subdominio) y la
+sesión usa el engine de esa granja, con su propio pool. Los engines se crean
+al primer uso y se descartan tras un tiempo inactivos. Sin GRANJAS configuradas
+la aplicación funciona con la base de datos única de siempre.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from flask import Blueprint, current_app, g, has_app_context, jsonify, request
+from sqlalchemy import create_engine
+
+bp = Blueprint('granjas', __name__, url_prefix='/api')
+
+# nombre -> {'engine': Engine, 'ultimo_uso': monotonic}
+_motores = {}
+_candado = threading.Lock()
+_ultima_revision = [0.0]
+
+# nombre -> contadores de este proceso (los hilos del worker los comparten)
+_metricas = defaultdict(lambda: {'peticiones': 0, 'errores': 0, 'duracion_ms': 0.0})
+_candado_metricas = threading.Lock()
+
+
+def granja_actual():
+    """Granja de la petición actual (None = base de datos por defecto)"""
+    return g.get('granja') if has_app_context() else None
+
+
+def resolver_granja():
+    """Nombre de granja pedido por cabecera o por subdominio de GRANJA_DOMINIO_BASE"""
+    nombre = request.headers.get('X-Granja')
+    if nombre:
+        return nombre.strip().lower()
+    
+    dominio = current_app.config['GRANJA_DOMINIO_BASE']
+    host = request.host.split(':')[0].lower()
+    if dominio and host.endswith('.' + dominio):
+        return host[:-len(dominio) - 1]
+    return None
+
+
+# ============================================
+# ENGINES POR GRANJA
+# ============================================
+
+def _crear_motor(nombre):
+    url = current_app.config['GRANJAS'][nombre]
+    if url.startswith('mysql://'):
+        url = url.replace('mysql://', 'mysql+pymysql://', 1)
+    
+    opciones = dict(current_app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    # El validador de pool.py solo recorre db.engines: estas conexiones se validan al usarse
+    opciones['pool_pre_ping'] = True
+    if not url.startswith('sqlite'):
+        opciones['pool_size'] = current_app.config['GRANJA_POOL_TAMANO']
+    return create_engine(url, **opciones)
+
+
+def desalojar_inactivos(segundos):
+    """Descarta los engines sin uso en los últimos segundos; devuelve los nombres"""
+    limite = time.monotonic() - segundos
+    with _candado:
+        inactivos = [nombre for nombre, entrada in _motores.items() if entrada['ultimo_uso'] < limite]
+        motores = [_motores.pop(nombre)['engine'] for nombre in inactivos]
+    
+    # Las conexiones en uso se cierran al devolverse al pool descartado
+    for motor in motores:
+        motor.dispose()
+    return inactivos
+
+
+def motor_granja(nombre=None):
+    """Engine de la granja (la de la petición si no se indica); None sin granja"""
+    nombre = nombre or granja_actual()
+    if nombre is None:
+        return None
+    
+    ahora = time.monotonic()
+    with _candado:
+        entrada = _motores.get(nombre)
+        if entrada is None:
+            entrada = _motores[nombre] = {'engine': _crear_motor(nombre), 'ultimo_uso': ahora}
+        entrada['ultimo_uso'] = ahora
+    
+    # Revisión de inactivos como mucho una vez por minuto, sin hilo aparte
+    segundos = current_app.config['GRANJA_INACTIVIDAD_SEGUNDOS']
+    if ahora - _ultima_revision[0] > 60:
+        _ultima_revision[0] = ahora
+        desalojar_inactivos(segundos)
+    
+    return entrada['engine']
+
+
+# ============================================
+# HOOKS Y MÉTRICAS
+# ============================================
+
+def seleccionar_granja():
+    """Fija g.granja; una granja desconocida responde 404"""
+    nombre = resolver_granja()
+    if nombre is None:
+        return None
+    if nombre not in current_app.config['GRANJAS']:
+        return jsonify({'success': False, 'error': f'Granja no encontrada: {nombre}'}), 404
+    
+    g.granja = nombre
+    g.inicio_granja = time.perf_counter()
+    return None
+
+
+def registrar_metricas(response):
+    """Acumula peticiones, errores y duración por granja"""
+    nombre = granja_actual()
+    if nombre is not None and 'inicio_granja' in g:
+        duracion_ms = (time.perf_counter() - g.inicio_granja) * 1000
+        with _candado_metricas:
+            metricas = _metricas[nombre]
+            metricas['peticiones'] += 1
+            metricas['errores'] += response.status_code >= 500
+            metricas['duracion_ms'] += duracion_ms
+    return response
+
+
+@bp.route('/granja/metricas', methods=['GET'])
+def obtener_metricas_granja():
+    """Métricas de este proceso para la granja de la petición"""
+    nombre = granja_actual()
+    if nombre is None:
+        return jsonify({'success': False, 'error': 'Indique la granja (X-Granja o subdominio)'}), 400
+    
+    with _candado_metricas:
+        metricas = dict(_metricas[nombre])
+    metricas['duracion_media_ms'] = round(metricas['duracion_ms'] / metricas['peticiones'], 2) if metricas['peticiones'] else None
+    metricas['duracion_ms'] = round(metricas['duracion_ms'], 2)
+    metricas['pool'] = motor_granja().pool.status()
+    
+    return jsonify({
+        'success': True,
+        'data': {'granja': nombre, **metricas}
+    }), 200
+
+
+def registrar_granjas(app):
+    """Registra la resolución de granja solo si hay GRANJAS configuradas"""
+    if not app.config['GRANJAS']:
+        return
+    
+    app.before_request(seleccionar_granja)
+    app.after_request(registrar_metricas)
+    app.register_blueprint(bp)
@@ -0,0 +1,15 @@
+"""
+Configuración de gunicorn (se carga automáticamente desde el directorio actual)
+"""
+
+
+def post_worker_init(worker):
+    """Cada worker calienta su propio pool después del fork (--preload comparte la app)"""
+    from pool import preparar_worker
+    preparar_worker(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    """Drena las tareas en cola; lo que no termine queda en tareas_pendientes"""
+    from tareas import drenar
+    drenar(worker.wsgi)
@@ -0,0 +1,123 @@
+"""
+Ingesta agrupada (group commit) de escrituras pequeñas y frecuentes
+Con INGESTA_AGRUPADA activa, registrar_mortalidad y completar_evento encolan
+su trabajo; un hilo lo confirma en micro-lotes (hasta INGESTA_MAX_LOTE
+operaciones o INGESTA_ESPERA_MS milisegundos) con un solo COMMIT por lote.
+Cada operación corre en su propio SAVEPOINT, así que quien llama recibe su
+propio resultado o error aunque otras del mismo lote fallen.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from itertools import groupby
+from flask import current_app, g
+from granjas import granja_actual
+from models import db
+
+_cola = queue.Queue()
+_hilo = []
+_candado = threading.Lock()
+
+
+def ingesta_agrupada():
+    """Indica si las escrituras de ingesta deben pasar por la cola"""
+    return current_app.config['INGESTA_AGRUPADA']
+
+
+def encolar(operacion, *args):
+    """Encola operacion(*args) y espera su resultado (o relanza su excepción).
+    
+    La operación solo debe trabajar con db.session; el commit lo hace el hilo.
+    Si vence el timeout antes de que el hilo la tome, se cancela y no se aplica;
+    si ya la tomó, se espera su resultado (otro timeout más) para no responder
+    error sobre una escritura que sí se confirmó.
+    """
+    app = current_app._get_current_object()
+    _iniciar_hilo(app)
+    
+    futuro = Future()
+    _cola.put((granja_actual(), operacion, args, futuro))
+    timeout = app.config['INGESTA_TIMEOUT_SEGUNDOS']
+    try:
+        return futuro.result(timeout=timeout)
+    except TimeoutError:
+        if futuro.cancel():
+            raise TimeoutError('La escritura no se confirmó a tiempo y no se aplicó')
+    try:
+        return futuro.result(timeout=timeout)
+    except TimeoutError:
+        raise TimeoutError('La escritura sigue en curso: no se sabe si se aplicó')
+
+
+def _iniciar_hilo(app):
+    if _hilo:
+        return
+    with _candado:
+        if not _hilo:
+            hilo = threading.Thread(target=_ciclo, args=(app,), name='ingesta-agrupada', daemon=True)
+            hilo.start()
+            _hilo.append(hilo)
+
+
+def _tomar_lote(maximo, espera_ms):
+    """Bloquea hasta la primera operación y junta las que lleguen en la ventana"""
+    lote = [_cola.get()]
+    limite = time.monotonic() + espera_ms / 1000
+    while len(lote) < maximo:
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            break
+        try:
+            lote.append(_cola.get(timeout=restante))
+        except queue.Empty:
+            break
+    return lote
+
+
+def _ciclo(app):
+    while True:
+        lote = _tomar_lote(app.config['INGESTA_MAX_LOTE'], app.config['INGESTA_ESPERA_MS'])
+        try:
+            # Un commit por granja presente en el lote
+            lote.sort(key=lambda item: item[0] or '')
+            for granja, items in groupby(lote, key=lambda item: item[0]):
+                with app.app_context():
+                    g.granja = granja
+                    confirmar_lote(list(items))
+        except Exception as e:
+            # Un fallo inesperado (p. ej. en el rollback) no detiene el único hilo:
+            # quien espera una operación sin resolver recibe el error
+            app.logger.exception('Error confirmando un lote de ingesta')
+            for *_, futuro in lote:
+                try:
+                    futuro.set_exception(e)
+                except InvalidStateError:
+                    pass
+
+
+def confirmar_lote(items):
+    """Ejecuta cada operación en un SAVEPOINT y confirma todas con un solo COMMIT"""
+    pendientes = []
+    for _, operacion, args, futuro in items:
+        # Quien la encoló ya desistió por timeout: no se aplica
+        if not futuro.set_running_or_notify_cancel():
+            continue
+        try:
+            with db.session.begin_nested():
+                resultado = operacion(*args)
+            pendientes.append((futuro, resultado))
+        except Exception as e:
+            futuro.set_exception(e)
+    
+    try:
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        for futuro, _ in pendientes:
+            futuro.set_exception(e)
+        return
+    
+    for futuro, resultado in pendientes:
+        futuro.set_result(resultado)
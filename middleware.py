@@ -0,0 +1,93 @@
+"""
+Hooks de petición/respuesta de la aplicación
+Réplica de lectura, política de sesión y compresión gzip
+"""
+
+from flask import current_app, g, request
+import gzip
+
+
+# ============================================
+# RÉPLICA DE LECTURA
+# ============================================
+
+# Read-your-writes entre orígenes (SPA en Netlify, API en Railway): una cookie
+# SameSite=Lax no viaja en fetch cross-site sin credenciales, así que tras cada
+# escritura la respuesta indica en CABECERA_LECTURA_PRIMARIA cuántos segundos
+# debe el cliente leer de la primaria, y el cliente envía X-Forzar-Primaria
+# mientras dure esa ventana (ver fetchApi en static/js/app.js).
+CABECERA_LECTURA_PRIMARIA = 'X-Lectura-Primaria-Segundos'
+
+# Endpoints POST que solo leen (no activan la lectura propia en la primaria)
+ENDPOINTS_POST_DE_LECTURA = {'batch.ejecutar_batch'}
+
+
+def _forzar_primaria():
+    """La petición pide leer de la primaria (flag o header de lectura propia reciente)"""
+    if request.args.get('primaria', 'false').lower() == 'true':
+        return True
+    return request.headers.get('X-Forzar-Primaria', '').lower() in ('1', 'true')
+
+
+def seleccionar_base_lectura():
+    """Las peticiones GET leen de la réplica salvo que se fuerce la primaria"""
+    g.usar_replica = request.method in ('GET', 'HEAD') and not _forzar_primaria()
+
+
+def marcar_lectura_propia(response):
+    """Tras una escritura, indica al cliente cuántos segundos leer de la primaria"""
+    if (
+        request.method not in ('GET', 'HEAD', 'OPTIONS')
+        and request.endpoint not in ENDPOINTS_POST_DE_LECTURA
+        and response.status_code < 400
+    ):
+        response.headers[CABECERA_LECTURA_PRIMARIA] = str(current_app.config['REPLICA_LECTURA_PROPIA_SEGUNDOS'])
+    return response
+
+
+# ============================================
+# POLÍTICA DE SESIÓN
+# ============================================
+
+def seleccionar_politica_sesion():
+    """Lecturas en transacción de solo lectura y timeout según la clase de la ruta"""
+    vista = current_app.view_functions.get(request.endpoint)
+    clase = getattr(vista, 'clase_consulta', 'interactiva')
+    g.solo_lectura = request.method in ('GET', 'HEAD')
+    g.timeout_consulta_ms = current_app.config['TIMEOUT_CONSULTA_MS'][clase]
+
+
+# ============================================
+# COMPRESIÓN
+# ============================================
+
+TIPOS_COMPRIMIBLES = ('application/json', 'application/vnd.pollo.columnar+json', 'application/x-msgpack')
+
+
+def comprimir_respuesta(response):
+    """Comprime con gzip las respuestas JSON que superan el umbral configurado"""
+    if (
+        response.status_code < 200 or response.status_code >= 300
+        or response.direct_passthrough
+        or response.mimetype not in TIPOS_COMPRIMIBLES
+        or 'Content-Encoding' in response.headers
+        or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()
+    ):
+        return response
+    
+    datos = response.get_data()
+    if len(datos) < current_app.config['COMPRESION_MINIMA_BYTES']:
+        return response
+    
+    response.set_data(gzip.compress(datos, compresslevel=current_app.config['COMPRESION_NIVEL']))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def registrar_middleware(app):
+    """Registra los hooks en la aplicación (after_request se ejecuta en orden inverso)"""
+    app.before_request(seleccionar_base_lectura)
+    app.before_request(seleccionar_politica_sesion)
+    app.after_request(marcar_lectura_propia)
+    app.after_request(comprimir_respuesta)
@@ -0,0 +1,123 @@
+"""
+Migraciones de esquema de bases ya existentes
+create_all solo crea las tablas que faltan: las columnas e índices agregados
+después a tablas existentes se aplican aquí (ALTER TABLE / CREATE INDEX), en
+orden de versión. Cada paso revisa antes si ya está aplicado, así sirve igual
+para una base recién creada, una antigua o una marcada con una versión que
+no tenía sus columnas.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from models import db
+
+# Versión de esquema -> pasos ('columna' | 'indice', tabla, nombre)
+MIGRACIONES = {
+    1: [
+        # Umbral de las reglas de alerta
+        ('columna', 'configuracion_alertas', 'umbral'),
+        # Fechas indexadas de los reportes por rango
+        ('indice', 'movimientos_capital', 'ix_movimientos_capital_fecha_movimiento'),
+        ('indice', 'compras_materia_prima', 'ix_compras_materia_prima_fecha_compra'),
+        ('indice', 'ventas', 'ix_ventas_fecha_venta'),
+        # Marcas de cambio de la sincronización
+        ('indice', 'lotes', 'ix_lotes_updated_at'),
+        ('indice', 'clientes', 'ix_clientes_updated_at'),
+        ('indice', 'ventas', 'ix_ventas_created_at'),
+        ('indice', 'compras_materia_prima', 'ix_compras_materia_prima_created_at'),
+        ('indice', 'ventas_credito', 'ix_ventas_credito_updated_at'),
+    ],
+    4: [
+        # Búsqueda normalizada (completar con flask normalizar-busqueda)
+        ('columna', 'clientes', 'nombre_normalizado'),
+        ('columna', 'clientes', 'telefono_normalizado'),
+        ('columna', 'lotes', 'nombre_normalizado'),
+        ('indice', 'clientes', 'ix_clientes_nombre_normalizado'),
+        ('indice', 'clientes', 'ix_clientes_telefono_normalizado'),
+        ('indice', 'lotes', 'ix_lotes_nombre_normalizado'),
+    ],
+    6: [
+        # Índices (id_lote, fecha) de la línea de tiempo, también en el archivo
+        *[
+            ('indice', f'{tabla}{sufijo}', f'ix_{tabla}{sufijo}_{columnas}')
+            for tabla, columnas in (
+                ('movimientos_capital', 'lote_fecha'),
+                ('compras_materia_prima', 'lote_fecha'),
+                ('ventas', 'lote_fecha'),
+                ('eventos_cronograma', 'lote_fecha'),
+                ('mortalidad_lotes', 'lote_fecha'),
+                ('pagos_clientes', 'credito_fecha'),
+            )
+            for sufijo in ('', '_archivo')
+        ],
+    ],
+    8: [
+        # Número de cambio de /api/sync
+        *[
+            ('columna', tabla, 'version_sync')
+            for tabla in (
+                'lotes', 'clientes', 'compras_materia_prima', 'ventas', 'ventas_credito',
+                'registros_eliminados', 'compras_materia_prima_archivo', 'ventas_archivo',
+                'ventas_credito_archivo',
+            )
+        ],
+        *[
+            ('indice', tabla, f'ix_{tabla}_version_sync')
+            for tabla in (
+                'lotes', 'clientes', 'compras_materia_prima', 'ventas', 'ventas_credito',
+                'registros_eliminados',
+            )
+        ],
+    ],
+    9: [
+        # Retención de notificaciones leídas por antigüedad
+        ('indice', 'notificaciones', 'ix_notificaciones_leida_fecha_creacion'),
+    ],
+}
+
+
+def _aplicar(conexion, tipo, nombre_tabla, nombre):
+    """Aplica un paso si falta; devuelve True si hizo cambios"""
+    inspector = inspect(conexion)
+    tabla = db.metadata.tables[nombre_tabla]
+    
+    if tipo == 'columna':
+        if nombre in {columna['name'] for columna in inspector.get_columns(nombre_tabla)}:
+            return False
+        definicion = CreateColumn(tabla.c[nombre]).compile(dialect=conexion.dialect)
+        nombre_sql = conexion.dialect.identifier_preparer.format_table(tabla)
+        conexion.execute(text(f'ALTER TABLE {nombre_sql} ADD COLUMN {definicion}'))
+        return True
+    
+    if nombre in {indice['name'] for indice in inspector.get_indexes(nombre_tabla)}:
+        return False
+    next(indice for indice in tabla.indexes if indice.name == nombre).create(conexion)
+    return True
+
+
+def migrar_esquema(motor):
+    """Aplica los pasos que falten de todas las versiones; devuelve [(versión, tabla, nombre)].
+    
+    No se confía en la versión registrada: una base marcada antes de existir
+    estas migraciones puede no tener las columnas de su versión.
+    """
+    aplicados = []
+    with motor.begin() as conexion:
+        for version in sorted(MIGRACIONES):
+            for tipo, tabla, nombre in MIGRACIONES[version]:
+                if _aplicar(conexion, tipo, tabla, nombre):
+                    aplicados.append((version, tabla, nombre))
+    return aplicados
+
+
+def columnas_faltantes(motor):
+    """Columnas de los modelos que no existen en tablas ya creadas: ['tabla.columna']"""
+    inspector = inspect(motor)
+    existentes = set(inspector.get_table_names())
+    faltantes = []
+    for tabla in db.metadata.sorted_tables:
+        if tabla.name not in existentes:
+            continue
+        columnas = {columna['name'] for columna in inspector.get_columns(tabla.name)}
+        faltantes.extend(f'{tabla.name}.{columna.name}' for columna in tabla.columns if columna.name not in columnas)
+    return faltantes
@@ -3,11 +3,154 @@ Modelos de Base de Datos - SQLAlchemy ORM
 Sistema de Gestión de Pollos Cobb 500
 """
 
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from datetime import datetime
-from sqlalchemy import func
+import secrets
+import sqlite3
+import unicodedata
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.mysql import LONGTEXT
+from granjas import motor_granja
 
-db = SQLAlchemy()
+
+class SesionEnrutada(Session):
+    """Sesión que envía las lecturas a la réplica cuando la petición lo permite.
+    
+    Las escrituras (flush) y cualquier petición sin ``g.usar_replica`` van
+    siempre a la base de datos primaria. Una petición de otra granja usa
+    siempre el engine de esa granja.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            motor = motor_granja()
+            if motor is not None:
+                return motor
+            if not self._flushing and usar_replica():
+                return self._db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def usar_replica():
+    """Indica si la petición actual puede leer de la réplica"""
+    return (
+        has_app_context()
+        and g.get('usar_replica', False)
+        and 'replica' in db.engines
+    )
+
+
+@event.listens_for(SesionEnrutada, 'after_begin')
+def aplicar_politica_sesion(session, transaction, connection):
+    """Antes de la primera sentencia de cada transacción (MySQL): las peticiones de
+    lectura corren en READ COMMITTED + READ ONLY y toda petición lleva el timeout
+    de su clase de ruta. Fuera de una petición el timeout vuelve a 0 (sin límite).
+    """
+    if connection.dialect.name != 'mysql':
+        return
+    
+    en_peticion = has_app_context()
+    if en_peticion and g.get('solo_lectura', False):
+        connection.exec_driver_sql('SET TRANSACTION ISOLATION LEVEL READ COMMITTED, READ ONLY')
+    
+    # max_execution_time es de sesión: solo se envía cuando cambia en esa conexión
+    timeout = int(g.get('timeout_consulta_ms', 0)) if en_peticion else 0
+    info = connection.connection.info
+    if info.get('max_execution_time') != timeout:
+        connection.exec_driver_sql(f'SET SESSION max_execution_time = {timeout}')
+        info['max_execution_time'] = timeout
+
+
+@event.listens_for(Engine, 'connect')
+def desactivar_transaccion_pysqlite(conexion_dbapi, registro):
+    """pysqlite abre y confirma transacciones por su cuenta, lo que anula los
+    SAVEPOINT (begin_nested de la ingesta agrupada); se desactiva y el BEGIN lo
+    emite SQLAlchemy (receta documentada para el driver sqlite3)"""
+    if isinstance(conexion_dbapi, sqlite3.Connection):
+        conexion_dbapi.isolation_level = None
+
+
+@event.listens_for(Engine, 'begin')
+def iniciar_transaccion_pysqlite(conexion):
+    """Las transacciones que pueden escribir toman el bloqueo de escritura al empezar:
+    una que lee y después escribe no choca (database is locked) con otra que ya escribe"""
+    if conexion.dialect.name == 'sqlite':
+        solo_lectura = has_app_context() and g.get('solo_lectura', False)
+        conexion.exec_driver_sql('BEGIN' if solo_lectura else 'BEGIN IMMEDIATE')
+
+
+def permitir_escritura():
+    """Cierra la transacción de solo lectura para que un GET pueda guardar en caché"""
+    if has_app_context():
+        g.solo_lectura = False
+    db.session.rollback()
+
+
+db = SQLAlchemy(session_options={'class_': SesionEnrutada})
+
+# Versión de esquema que esperan estos modelos (subirla al cambiar tablas o columnas)
+ESQUEMA_VERSION = 9
+
+# Contador en versiones_referencia que numera los cambios para /api/sync
+CONJUNTO_SYNC = 'sync'
+
+
+def _version_sync(context):
+    """Número provisional de la transacción para las filas de /api/sync.
+    
+    Es negativo (el endpoint pide números mayores que un token) y propio de la
+    transacción; numerar_cambios_sync lo reemplaza por el definitivo al confirmar.
+    """
+    conexion = context.connection
+    transaccion = conexion.get_transaction()
+    cambios = conexion.info.get('cambios_sync')
+    if cambios is None or cambios['transaccion'] is not transaccion:
+        cambios = conexion.info['cambios_sync'] = {
+            'transaccion': transaccion,
+            'provisional': -1 - secrets.randbits(62),
+            'tablas': set()
+        }
+    cambios['tablas'].add(context.current_column.table)
+    return cambios['provisional']
+
+
+@event.listens_for(Engine, 'commit')
+def numerar_cambios_sync(conexion):
+    """Justo antes del COMMIT da a las filas de la transacción su número de cambio.
+    
+    El UPDATE del contador bloquea su fila hasta el commit, así los números se
+    asignan en orden de commit: quien lee el contador confirmado ya puede ver
+    todas las filas con ese número o menor. Al ser lo último de la transacción,
+    el bloqueo dura solo este paso y nunca se espera otro bloqueo teniéndolo.
+    """
+    cambios = conexion.info.pop('cambios_sync', None)
+    if cambios is None or cambios['transaccion'] is not conexion.get_transaction():
+        return
+    
+    contador = VersionReferencia.__table__
+    fila = contador.c.conjunto == CONJUNTO_SYNC
+    if not conexion.execute(update(contador).where(fila).values(version=contador.c.version + 1)).rowcount:
+        conexion.execute(insert(contador).values(conjunto=CONJUNTO_SYNC, version=1))
+    version = conexion.execute(select(contador.c.version).where(fila)).scalar()
+    
+    for tabla in cambios['tablas']:
+        # updated_at (y cualquier otro onupdate) queda como estaba
+        conservar = {
+            columna.name: columna for columna in tabla.columns
+            if columna.onupdate is not None and columna.name != 'version_sync'
+        }
+        conexion.execute(
+            update(tabla).where(tabla.c.version_sync == cambios['provisional'])
+            .values(version_sync=version, **conservar)
+        )
+
+
+@event.listens_for(Engine, 'rollback')
+def descartar_cambios_sync(conexion):
+    conexion.info.pop('cambios_sync', None)
 
 
 class Lote(db.Model):
@@ -21,8 +164,10 @@ class Lote(db.Model):
     fecha_estimada_salida = db.Column(db.Date, nullable=True)
     fecha_cierre = db.Column(db.Date, nullable=True)
     estado = db.Column(db.Enum('activo', 'cerrado'), default='activo')
+    nombre_normalizado = db.Column(db.String(100), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, index=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version_sync = db.Column(db.BigInteger, index=True, default=_version_sync, onupdate=_version_sync)
     
     # Relaciones
     capital = db.relationship('CapitalLote', backref='lote', lazy=True, uselist=False)
@@ -68,13 +213,16 @@ class CapitalLote(db.Model):
 class MovimientoCapital(db.Model):
     """RF-05: Control de Movimientos de Capital"""
     __tablename__ = 'movimientos_capital'
+    __table_args__ = (
+        db.Index('ix_movimientos_capital_lote_fecha', 'id_lote', 'fecha_movimiento'),
+    )
     
     id_movimiento = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), nullable=False)
     tipo_movimiento = db.Column(db.Enum('compra', 'gasto', 'ingreso', 'retiro'), nullable=False)
     valor = db.Column(db.Numeric(12, 2), nullable=False)
     descripcion = db.Column(db.Text, nullable=True)
-    fecha_movimiento = db.Column(db.Date, nullable=False)
+    fecha_movimiento = db.Column(db.Date, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -89,9 +237,32 @@ class MovimientoCapital(db.Model):
         }
 
 
+class ConciliacionCapital(db.Model):
+    """Punto de control de la conciliación de capital: neto del libro ya verificado por lote"""
+    __tablename__ = 'conciliaciones_capital'
+    
+    id_lote = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    hasta_id_movimiento = db.Column(db.Integer, nullable=False)
+    neto_movimientos = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    verificado_en = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+@event.listens_for(MovimientoCapital, 'after_delete')
+def _invalidar_conciliacion(mapper, connection, movimiento):
+    """Borrar un movimiento ya verificado obliga a reconciliar el lote desde el inicio"""
+    tabla = ConciliacionCapital.__table__
+    connection.execute(tabla.delete().where(
+        tabla.c.id_lote == movimiento.id_lote,
+        tabla.c.hasta_id_movimiento >= movimiento.id_movimiento
+    ))
+
+
 class CompraMateriaPrima(db.Model):
     """RF-06: Gestión de Compras de Materia Prima"""
     __tablename__ = 'compras_materia_prima'
+    __table_args__ = (
+        db.Index('ix_compras_materia_prima_lote_fecha', 'id_lote', 'fecha_compra'),
+    )
     
     id_compra = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), nullable=False)
@@ -100,9 +271,10 @@ class CompraMateriaPrima(db.Model):
     unidad = db.Column(db.String(20), nullable=False)
     costo_unitario = db.Column(db.Numeric(10, 2), nullable=False)
     costo_total = db.Column(db.Numeric(12, 2), nullable=False)
-    fecha_compra = db.Column(db.Date, nullable=False)
+    fecha_compra = db.Column(db.Date, nullable=False, index=True)
     observaciones = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, index=True, default=datetime.utcnow)
+    version_sync = db.Column(db.BigInteger, index=True, default=_version_sync, onupdate=_version_sync)
     
     def to_dict(self):
         return {
@@ -127,8 +299,11 @@ class Cliente(db.Model):
     telefono = db.Column(db.String(20), nullable=True)
     direccion = db.Column(db.String(200), nullable=True)
     estado = db.Column(db.Enum('activo', 'inactivo'), default='activo')
+    nombre_normalizado = db.Column(db.String(100), nullable=True, index=True)
+    telefono_normalizado = db.Column(db.String(20), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, index=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version_sync = db.Column(db.BigInteger, index=True, default=_version_sync, onupdate=_version_sync)
     
     # Relaciones
     ventas = db.relationship('Venta', backref='cliente', lazy=True)
@@ -143,9 +318,84 @@ class Cliente(db.Model):
         }
 
 
+def normalizar_busqueda(texto):
+    """Minúsculas, sin acentos y con espacios simples (columnas *_normalizado)"""
+    if not texto:
+        return ''
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join(caracter for caracter in texto if not unicodedata.combining(caracter))
+    return ' '.join(texto.lower().split())
+
+
+def solo_digitos(texto):
+    return ''.join(caracter for caracter in (texto or '') if caracter.isdigit())
+
+
+class TerminoBusqueda(db.Model):
+    """Palabras normalizadas de los nombres (índice invertido para buscar por inicio de palabra)"""
+    __tablename__ = 'terminos_busqueda'
+    __table_args__ = (
+        db.Index('ix_terminos_busqueda_entidad_termino', 'entidad', 'termino'),
+        db.Index('ix_terminos_busqueda_entidad_registro', 'entidad', 'id_registro'),
+    )
+    
+    id_termino = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entidad = db.Column(db.String(20), nullable=False)
+    id_registro = db.Column(db.Integer, nullable=False)
+    termino = db.Column(db.String(100), nullable=False)
+
+
+def indexar_terminos(connection, entidad, id_registro, nombre_normalizado):
+    """Reemplaza las palabras indexadas de un registro"""
+    tabla = TerminoBusqueda.__table__
+    connection.execute(tabla.delete().where(tabla.c.entidad == entidad, tabla.c.id_registro == id_registro))
+    palabras = sorted(set((nombre_normalizado or '').split()))
+    if palabras:
+        connection.execute(tabla.insert(), [
+            {'entidad': entidad, 'id_registro': id_registro, 'termino': palabra} for palabra in palabras
+        ])
+
+
+@event.listens_for(Cliente, 'before_insert')
+@event.listens_for(Cliente, 'before_update')
+def _normalizar_cliente(mapper, connection, cliente):
+    cliente.nombre_normalizado = normalizar_busqueda(cliente.nombre)
+    cliente.telefono_normalizado = solo_digitos(cliente.telefono) or None
+
+
+@event.listens_for(Lote, 'before_insert')
+@event.listens_for(Lote, 'before_update')
+def _normalizar_lote(mapper, connection, lote):
+    lote.nombre_normalizado = normalizar_busqueda(lote.nombre_lote)
+
+
+@event.listens_for(Cliente, 'after_insert')
+@event.listens_for(Cliente, 'after_update')
+def _indexar_cliente(mapper, connection, cliente):
+    if inspect(cliente).attrs.nombre.history.has_changes():
+        indexar_terminos(connection, 'cliente', cliente.id_cliente, cliente.nombre_normalizado)
+
+
+@event.listens_for(Lote, 'after_insert')
+@event.listens_for(Lote, 'after_update')
+def _indexar_lote(mapper, connection, lote):
+    if inspect(lote).attrs.nombre_lote.history.has_changes():
+        indexar_terminos(connection, 'lote', lote.id_lote, lote.nombre_normalizado)
+
+
+@event.listens_for(Cliente, 'after_delete')
+@event.listens_for(Lote, 'after_delete')
+def _desindexar(mapper, connection, objeto):
+    entidad = 'cliente' if isinstance(objeto, Cliente) else 'lote'
+    indexar_terminos(connection, entidad, mapper.primary_key_from_instance(objeto)[0], None)
+
+
 class Venta(db.Model):
     """RF-08: Registro de Ventas por Lote"""
     __tablename__ = 'ventas'
+    __table_args__ = (
+        db.Index('ix_ventas_lote_fecha', 'id_lote', 'fecha_venta'),
+    )
     
     id_venta = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), nullable=False)
@@ -154,8 +404,9 @@ class Venta(db.Model):
     cantidad_kilos = db.Column(db.Numeric(10, 2), nullable=False)
     precio_kilo = db.Column(db.Numeric(10, 2), nullable=False)
     valor_total = db.Column(db.Numeric(12, 2), nullable=False)
-    fecha_venta = db.Column(db.Date, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    fecha_venta = db.Column(db.Date, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, index=True, default=datetime.utcnow)
+    version_sync = db.Column(db.BigInteger, index=True, default=_version_sync, onupdate=_version_sync)
     
     # Relaciones
     credito = db.relationship('VentaCredito', backref='venta', lazy=True, uselist=False)
@@ -184,7 +435,8 @@ class VentaCredito(db.Model):
     valor_pendiente = db.Column(db.Numeric(12, 2), nullable=False)
     estado_deuda = db.Column(db.Enum('pendiente', 'parcial', 'pagado'), default='pendiente')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, index=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version_sync = db.Column(db.BigInteger, index=True, default=_version_sync, onupdate=_version_sync)
     
     # Relaciones
     pagos = db.relationship('PagoCliente', backref='credito', lazy=True)
@@ -203,6 +455,9 @@ class VentaCredito(db.Model):
 class PagoCliente(db.Model):
     """RF-10: Registro de Pagos de Clientes"""
     __tablename__ = 'pagos_clientes'
+    __table_args__ = (
+        db.Index('ix_pagos_clientes_credito_fecha', 'id_credito', 'fecha_pago'),
+    )
     
     id_pago = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_credito = db.Column(db.Integer, db.ForeignKey('ventas_credito.id_credito'), nullable=False)
@@ -225,6 +480,9 @@ class PagoCliente(db.Model):
 class EventoCronograma(db.Model):
     """Eventos del cronograma de engorda"""
     __tablename__ = 'eventos_cronograma'
+    __table_args__ = (
+        db.Index('ix_eventos_cronograma_lote_fecha', 'id_lote', 'fecha_programada'),
+    )
     
     id_evento = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), nullable=False)
@@ -256,6 +514,9 @@ class EventoCronograma(db.Model):
 class MortalidadLote(db.Model):
     """Registro de mortalidad diaria"""
     __tablename__ = 'mortalidad_lotes'
+    __table_args__ = (
+        db.Index('ix_mortalidad_lotes_lote_fecha', 'id_lote', 'fecha_registro'),
+    )
     
     id_mortalidad = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), nullable=False)
@@ -283,6 +544,9 @@ class MortalidadLote(db.Model):
 class Notificacion(db.Model):
     """Sistema de notificaciones"""
     __tablename__ = 'notificaciones'
+    __table_args__ = (
+        db.Index('ix_notificaciones_leida_fecha_creacion', 'leida', 'fecha_creacion'),
+    )
     
     id_notificacion = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), nullable=True)
@@ -312,6 +576,35 @@ class Notificacion(db.Model):
             'fecha_leida': self.fecha_leida.isoformat() if self.fecha_leida else None
         }
 
+class NotificacionArchivada(db.Model):
+    """Archivo de notificaciones leídas antiguas o de lotes cerrados"""
+    __tablename__ = 'notificaciones_archivo'
+    
+    id_notificacion = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    id_lote = db.Column(db.Integer, nullable=True, index=True)
+    tipo_notificacion = db.Column(db.String(50), nullable=False)
+    prioridad = db.Column(db.String(10), nullable=True)
+    titulo = db.Column(db.String(200), nullable=False)
+    mensaje = db.Column(db.Text, nullable=False)
+    fecha_creacion = db.Column(db.DateTime, nullable=True)
+    leida = db.Column(db.Boolean, default=False)
+    fecha_leida = db.Column(db.DateTime, nullable=True)
+    fecha_archivado = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id_notificacion': self.id_notificacion,
+            'id_lote': self.id_lote,
+            'tipo_notificacion': self.tipo_notificacion,
+            'prioridad': self.prioridad,
+            'titulo': self.titulo,
+            'mensaje': self.mensaje,
+            'fecha_creacion': self.fecha_creacion.isoformat() if self.fecha_creacion else None,
+            'leida': self.leida,
+            'fecha_leida': self.fecha_leida.isoformat() if self.fecha_leida else None,
+            'fecha_archivado': self.fecha_archivado.isoformat() if self.fecha_archivado else None
+        }
+
 class ConfiguracionAlertas(db.Model):
     """Configuración de alertas"""
     __tablename__ = 'configuracion_alertas'
@@ -319,6 +612,7 @@ class ConfiguracionAlertas(db.Model):
     id_config = db.Column(db.Integer, primary_key=True, autoincrement=True)
     tipo_alerta = db.Column(db.String(50), nullable=False, unique=True)
     dias_anticipacion = db.Column(db.Integer, nullable=False)
+    umbral = db.Column(db.Numeric(6, 2), nullable=True)
     activa = db.Column(db.Boolean, default=True)
     descripcion = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -329,6 +623,207 @@ class ConfiguracionAlertas(db.Model):
             'id_config': self.id_config,
             'tipo_alerta': self.tipo_alerta,
             'dias_anticipacion': self.dias_anticipacion,
+            'umbral': float(self.umbral) if self.umbral is not None else None,
             'activa': self.activa,
             'descripcion': self.descripcion
-        }
\ No newline at end of file
+        }
+
+
+class ResumenCierreLote(db.Model):
+    """Resumen congelado de un lote al cerrarlo (RF-12)"""
+    __tablename__ = 'resumen_cierre_lotes'
+    
+    id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), primary_key=True, autoincrement=False)
+    fecha_cierre = db.Column(db.Date, nullable=False)
+    cantidad_inicial = db.Column(db.Integer, nullable=False)
+    capital_inicial = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    capital_final = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    total_ventas = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    total_compras = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    total_gastos = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    total_ingresos = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    total_retiros = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    pollos_vendidos = db.Column(db.Integer, nullable=False, default=0)
+    kilos_vendidos = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    total_muertos = db.Column(db.Integer, nullable=False, default=0)
+    porcentaje_mortalidad = db.Column(db.Numeric(5, 2), nullable=False, default=0)
+    precio_promedio_kilo = db.Column(db.Numeric(10, 2), nullable=True)
+    costo_por_pollo = db.Column(db.Numeric(10, 2), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    lote = db.relationship('Lote', backref=db.backref('resumen_cierre', uselist=False))
+    
+    def to_dict(self):
+        return {
+            'id_lote': self.id_lote,
+            'nombre_lote': self.lote.nombre_lote if self.lote else None,
+            'fecha_cierre': self.fecha_cierre.isoformat() if self.fecha_cierre else None,
+            'cantidad_inicial': self.cantidad_inicial,
+            'capital_inicial': float(self.capital_inicial),
+            'capital_final': float(self.capital_final),
+            'total_ventas': float(self.total_ventas),
+            'total_compras': float(self.total_compras),
+            'total_gastos': float(self.total_gastos),
+            'total_ingresos': float(self.total_ingresos),
+            'total_retiros': float(self.total_retiros),
+            'pollos_vendidos': self.pollos_vendidos,
+            'kilos_vendidos': float(self.kilos_vendidos),
+            'total_muertos': self.total_muertos,
+            'porcentaje_mortalidad': float(self.porcentaje_mortalidad),
+            'precio_promedio_kilo': float(self.precio_promedio_kilo) if self.precio_promedio_kilo is not None else None,
+            'costo_por_pollo': float(self.costo_por_pollo) if self.costo_por_pollo is not None else None
+        }
+
+
+class CacheRespuestaLote(db.Model):
+    """Respuestas cacheadas de lotes cerrados (compartidas entre workers)"""
+    __tablename__ = 'cache_respuestas_lote'
+    __table_args__ = (
+        db.UniqueConstraint('id_lote', 'ruta', name='uq_cache_lote_ruta'),
+    )
+    
+    id_cache = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), nullable=False, index=True)
+    ruta = db.Column(db.String(255), nullable=False)
+    contenido = db.Column(db.Text().with_variant(LONGTEXT, 'mysql'), nullable=False)
+    mimetype = db.Column(db.String(100), nullable=False, default='application/json')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class CacheReporte(db.Model):
+    """Resultados cacheados de reportes sobre rangos de fechas ya cerrados"""
+    __tablename__ = 'cache_reportes'
+    
+    id_cache = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    clave = db.Column(db.String(255), nullable=False, unique=True)
+    desde = db.Column(db.Date, nullable=False, index=True)
+    hasta = db.Column(db.Date, nullable=False, index=True)
+    contenido = db.Column(db.Text().with_variant(LONGTEXT, 'mysql'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class RegistroEliminado(db.Model):
+    """Marcas de borrado (tombstones) para la sincronización incremental"""
+    __tablename__ = 'registros_eliminados'
+    
+    id_registro_eliminado = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    tabla = db.Column(db.String(50), nullable=False)
+    id_registro = db.Column(db.Integer, nullable=False)
+    eliminado_en = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    version_sync = db.Column(db.BigInteger, index=True, default=_version_sync, onupdate=_version_sync)
+
+
+class VersionEsquema(db.Model):
+    """Versión del esquema aplicada en la base de datos (una sola fila, id=1)"""
+    __tablename__ = 'version_esquema'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    aplicada_en = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class VersionReferencia(db.Model):
+    """Contador de cambios de cada conjunto de datos de referencia (caché por worker),
+    de las invalidaciones de reportes cacheados y de los cambios para /api/sync"""
+    __tablename__ = 'versiones_referencia'
+    
+    conjunto = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+
+class TareaPendiente(db.Model):
+    """Efectos secundarios que fallaron o no se ejecutaron; proximo_intento NULL = agotada"""
+    __tablename__ = 'tareas_pendientes'
+    
+    id_tarea = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    nombre = db.Column(db.String(100), nullable=False)
+    argumentos = db.Column(db.Text, nullable=False)
+    intentos = db.Column(db.Integer, nullable=False, default=0)
+    proximo_intento = db.Column(db.DateTime, nullable=True, index=True)
+    ultimo_error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# ============================================
+# ARCHIVO DE LOTES CERRADOS
+# ============================================
+
+class LoteArchivado(db.Model):
+    """Lotes cerrados cuyo detalle se movió a las tablas *_archivo"""
+    __tablename__ = 'lotes_archivados'
+    
+    id_lote = db.Column(db.Integer, db.ForeignKey('lotes.id_lote'), primary_key=True, autoincrement=False)
+    filas_archivadas = db.Column(db.Integer, nullable=False, default=0)
+    fecha_archivado = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    lote = db.relationship('Lote', backref=db.backref('archivo', uselist=False))
+
+
+def _tabla_archivo(modelo):
+    """Copia de la tabla de detalle (<tabla>_archivo) sin claves foráneas ni autoincremento.
+    
+    Conserva los índices compuestos de la tabla activa (p. ej. (id_lote, fecha)).
+    """
+    nombre = f'{modelo.__tablename__}_archivo'
+    columnas = [
+        db.Column(
+            columna.name, columna.type,
+            primary_key=columna.primary_key,
+            autoincrement=False,
+            nullable=columna.nullable,
+            index=bool(columna.foreign_keys)
+        )
+        for columna in modelo.__table__.columns
+    ]
+    indices = [
+        db.Index(
+            indice.name.replace(modelo.__tablename__, nombre, 1),
+            *[columna.name for columna in indice.columns]
+        )
+        for indice in modelo.__table__.indexes
+        if len(indice.columns) > 1
+    ]
+    return db.Table(nombre, *columnas, *indices)
+
+
+class MovimientoCapitalArchivado(db.Model):
+    __table__ = _tabla_archivo(MovimientoCapital)
+    to_dict = MovimientoCapital.to_dict
+
+
+class CompraMateriaPrimaArchivada(db.Model):
+    __table__ = _tabla_archivo(CompraMateriaPrima)
+    to_dict = CompraMateriaPrima.to_dict
+
+
+class VentaArchivada(db.Model):
+    __table__ = _tabla_archivo(Venta)
+    to_dict = Venta.to_dict
+    
+    cliente = db.relationship(
+        'Cliente', primaryjoin='foreign(VentaArchivada.id_cliente) == Cliente.id_cliente', viewonly=True
+    )
+    credito = db.relationship(
+        'VentaCreditoArchivada', uselist=False, viewonly=True,
+        primaryjoin='foreign(VentaCreditoArchivada.id_venta) == VentaArchivada.id_venta'
+    )
+
+
+class VentaCreditoArchivada(db.Model):
+    __table__ = _tabla_archivo(VentaCredito)
+    to_dict = VentaCredito.to_dict
+
+
+class PagoClienteArchivado(db.Model):
+    __table__ = _tabla_archivo(PagoCliente)
+    to_dict = PagoCliente.to_dict
+
+
+class EventoCronogramaArchivado(db.Model):
+    __table__ = _tabla_archivo(EventoCronograma)
+    to_dict = EventoCronograma.to_dict
+
+
+class MortalidadLoteArchivada(db.Model):
+    __table__ = _tabla_archivo(MortalidadLote)
+    to_dict = MortalidadLote.to_dict
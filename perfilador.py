@@ -0,0 +1,107 @@
+"""
+Perfilador de peticiones bajo demanda
+Con PERFILADOR_SECRETO configurado, una petición con la cabecera
+X-Perfilar: <secreto> se ejecuta bajo cProfile y el perfil queda guardado con
+ruta y fecha para descargarlo luego (snakeviz, flameprof o pstats). El secreto
+solo se acepta en la cabecera: en la URL quedaría en los logs de acceso. Sin
+secreto no se registra ningún hook.
+"""
+
+import cProfile
+import hmac
+import os
+import re
+from datetime import datetime
+from flask import Blueprint, abort, current_app, g, jsonify, request, send_from_directory
+
+bp = Blueprint('perfiles', __name__, url_prefix='/api')
+
+
+def _secreto_valido(valor):
+    secreto = current_app.config['PERFILADOR_SECRETO']
+    return bool(valor) and hmac.compare_digest(valor.encode(), secreto.encode())
+
+
+def _directorio():
+    directorio = current_app.config['PERFILADOR_DIRECTORIO'] or os.path.join(current_app.instance_path, 'perfiles')
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+
+def iniciar_perfil():
+    """Activa cProfile si la petición trae el secreto; el perfil se nombra <fecha>_<endpoint>.prof"""
+    if _secreto_valido(request.headers.get('X-Perfilar')):
+        endpoint = re.sub(r'[^A-Za-z0-9_.-]', '_', request.endpoint or 'desconocido')
+        g.perfil_nombre = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}_{endpoint}.prof"
+        g.perfil = cProfile.Profile()
+        g.perfil.enable()
+
+
+def nombrar_perfil(response):
+    """Indica en la respuesta el nombre con que se guardará el perfil"""
+    if 'perfil' in g:
+        response.headers['X-Perfil'] = g.perfil_nombre
+    return response
+
+
+def guardar_perfil(error=None):
+    """Detiene el perfil y lo guarda (en teardown: también si la vista lanzó una excepción)"""
+    perfil = g.pop('perfil', None)
+    if perfil is None:
+        return
+    
+    perfil.disable()
+    directorio = _directorio()
+    perfil.dump_stats(os.path.join(directorio, g.pop('perfil_nombre')))
+    
+    # Conservar solo los perfiles más recientes; otro worker puede estar borrando los mismos
+    perfiles = sorted(f for f in os.listdir(directorio) if f.endswith('.prof'))
+    for antiguo in perfiles[:-current_app.config['PERFILADOR_MAXIMO']]:
+        try:
+            os.remove(os.path.join(directorio, antiguo))
+        except FileNotFoundError:
+            pass
+
+
+def _exigir_secreto():
+    if not _secreto_valido(request.headers.get('X-Perfilar')):
+        abort(403)
+
+
+@bp.route('/perfiles', methods=['GET'])
+def listar_perfiles():
+    """Listar los perfiles guardados (más recientes primero)"""
+    _exigir_secreto()
+    directorio = _directorio()
+    perfiles = []
+    for nombre in sorted((f for f in os.listdir(directorio) if f.endswith('.prof')), reverse=True):
+        fecha, _, endpoint = nombre[:-len('.prof')].partition('_')
+        perfiles.append({
+            'nombre': nombre,
+            'endpoint': endpoint,
+            'fecha': datetime.strptime(fecha, '%Y%m%dT%H%M%S%f').isoformat(),
+            'bytes': os.path.getsize(os.path.join(directorio, nombre))
+        })
+    
+    return jsonify({
+        'success': True,
+        'data': perfiles
+    }), 200
+
+
+@bp.route('/perfiles/<nombre>', methods=['GET'])
+def descargar_perfil(nombre):
+    """Descargar un perfil en formato pstats"""
+    _exigir_secreto()
+    return send_from_directory(_directorio(), nombre, as_attachment=True)
+
+
+def registrar_perfilador(app):
+    """Registra hooks y rutas solo si hay secreto configurado (sin costo si no)"""
+    if not app.config.get('PERFILADOR_SECRETO'):
+        return
+    
+    app.before_request(iniciar_perfil)
+    app.after_request(nombrar_perfil)
+    app.teardown_request(guardar_perfil)
+    app.register_blueprint(bp)
@@ -0,0 +1,93 @@
+"""
+Pool de conexiones
+Calentamiento al arrancar cada worker y validación periódica de las conexiones
+inactivas (alternativa a pool_pre_ping, que añade un round trip por checkout)
+"""
+
+import threading
+import time
+from flask import current_app, g
+from sqlalchemy.exc import DBAPIError
+from models import db
+
+_estado = {'caliente': False}
+
+
+def pool_caliente():
+    """Indica si el pool de este proceso ya se calentó"""
+    return _estado['caliente']
+
+
+def calentar_pool():
+    """Abre y valida POOL_CONEXIONES_CALENTAR conexiones por engine y las deja en el pool"""
+    cantidad = current_app.config['POOL_CONEXIONES_CALENTAR']
+    # Solo lectura: en SQLite el BEGIN es diferido y las conexiones abiertas a la vez no se bloquean
+    g.solo_lectura = True
+    
+    for engine in db.engines.values():
+        # Todas abiertas a la vez para que el pool conserve esa cantidad
+        tamano = getattr(engine.pool, 'size', lambda: cantidad)()
+        conexiones = []
+        try:
+            for _ in range(min(cantidad, tamano)):
+                conexion = engine.connect()
+                conexiones.append(conexion)
+                conexion.exec_driver_sql('SELECT 1')
+        finally:
+            for conexion in conexiones:
+                conexion.close()
+    
+    _estado['caliente'] = True
+
+
+def validar_conexiones_inactivas(engine):
+    """Prueba cada conexión inactiva del pool (FIFO: una a una recorre todas).
+    
+    Las que fallan por desconexión quedan invalidadas y se reabren en el
+    siguiente checkout. Devuelve cuántas se invalidaron.
+    """
+    invalidadas = 0
+    for _ in range(getattr(engine.pool, 'checkedin', lambda: 0)()):
+        with engine.connect() as conexion:
+            try:
+                conexion.exec_driver_sql('SELECT 1')
+            except DBAPIError as e:
+                if not e.connection_invalidated:
+                    raise
+                invalidadas += 1
+    return invalidadas
+
+
+def iniciar_validacion_periodica(app):
+    """Hilo que valida el pool cada POOL_VALIDACION_SEGUNDOS (0 = desactivado)"""
+    segundos = app.config['POOL_VALIDACION_SEGUNDOS']
+    if not segundos:
+        return None
+    
+    def ciclo():
+        while True:
+            time.sleep(segundos)
+            with app.app_context():
+                g.solo_lectura = True
+                for engine in db.engines.values():
+                    try:
+                        validar_conexiones_inactivas(engine)
+                    except Exception:
+                        app.logger.exception('Error validando el pool de conexiones')
+    
+    hilo = threading.Thread(target=ciclo, name='validacion-pool', daemon=True)
+    hilo.start()
+    return hilo
+
+
+def preparar_worker(app):
+    """Tras el fork: descarta conexiones heredadas, calienta el pool y arranca la validación"""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+        try:
+            calentar_pool()
+        except Exception:
+            # /readyz reintentará; el worker arranca igual
+            app.logger.exception('No se pudo calentar el pool de conexiones')
+    iniciar_validacion_periodica(app)
@@ -0,0 +1,87 @@
+"""
+Caché por proceso de los datos de referencia
+Clientes activos, lotes y configuración de alertas cambian poco y se leen en casi
+todas las pantallas. Cada conjunto tiene un contador en versiones_referencia que
+suben las escrituras dentro de su transacción; cada worker revalida su copia con
+una sola lectura de ese contador (una vez por petición).
+"""
+
+from flask import current_app, g, jsonify
+from models import db, Cliente, Lote, ConfiguracionAlertas, VersionReferencia
+from granjas import granja_actual
+
+
+def _clientes_activos():
+    return [cliente.to_dict() for cliente in Cliente.query.filter_by(estado='activo').all()]
+
+
+def _lotes():
+    return [lote.to_dict() for lote in Lote.query.order_by(Lote.fecha_inicio.desc()).all()]
+
+
+def _configuracion_alertas():
+    return [
+        config.to_dict()
+        for config in ConfiguracionAlertas.query.order_by(ConfiguracionAlertas.tipo_alerta).all()
+    ]
+
+
+# conjunto -> función que lo carga desde la base de datos
+CONJUNTOS = {
+    'clientes': _clientes_activos,
+    'lotes': _lotes,
+    'configuracion_alertas': _configuracion_alertas,
+}
+
+# (granja, conjunto) -> {'version', 'datos', 'cuerpo'}
+_cache = {}
+
+
+def marcar_cambio_referencia(conjunto):
+    """Sube la versión del conjunto (se confirma con la transacción actual)"""
+    actualizadas = VersionReferencia.query.filter_by(conjunto=conjunto).update(
+        {VersionReferencia.version: VersionReferencia.version + 1}, synchronize_session=False
+    )
+    if not actualizadas:
+        db.session.add(VersionReferencia(conjunto=conjunto, version=1))
+    
+    g.setdefault('versiones_referencia', {}).pop(conjunto, None)
+    g.setdefault('referencias_modificadas', set()).add(conjunto)
+
+
+def _version(conjunto):
+    """Versión actual del conjunto; se lee una sola vez por petición o tarea"""
+    versiones = g.setdefault('versiones_referencia', {})
+    if conjunto not in versiones:
+        versiones[conjunto] = db.session.query(VersionReferencia.version).filter_by(
+            conjunto=conjunto
+        ).scalar() or 0
+    return versiones[conjunto]
+
+
+def _entrada(conjunto):
+    version = _version(conjunto)
+    clave = (granja_actual(), conjunto)
+    
+    entrada = _cache.get(clave)
+    if entrada is not None and entrada['version'] == version:
+        return entrada
+    
+    entrada = {'version': version, 'datos': CONJUNTOS[conjunto](), 'cuerpo': None}
+    # Con cambios sin confirmar en esta transacción la copia no se comparte
+    if conjunto not in g.get('referencias_modificadas', ()):
+        _cache[clave] = entrada
+    return entrada
+
+
+def datos_referencia(conjunto):
+    """Lista de diccionarios del conjunto (compartida: no modificarla)"""
+    return _entrada(conjunto)['datos']
+
+
+def respuesta_referencia(conjunto):
+    """Respuesta {'success', 'data'} del conjunto; el JSON serializado también se cachea"""
+    entrada = _entrada(conjunto)
+    if entrada['cuerpo'] is None:
+        entrada['cuerpo'] = jsonify({'success': True, 'data': entrada['datos']}).get_data()
+    return current_app.response_class(entrada['cuerpo'], mimetype='application/json')
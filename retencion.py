@@ -0,0 +1,83 @@
+"""
+Retención y archivo de notificaciones
+Mueve a notificaciones_archivo las notificaciones leídas antiguas y todas
+las de lotes cerrados, en bloques acotados (una transacción por bloque).
+"""
+
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, insert, or_, select
+from models import db, Lote, Notificacion, NotificacionArchivada
+
+COLUMNAS_ARCHIVO = [
+    'id_notificacion', 'id_lote', 'tipo_notificacion', 'prioridad', 'titulo',
+    'mensaje', 'fecha_creacion', 'leida', 'fecha_leida'
+]
+
+
+def _condicion_retencion(dias_leidas):
+    """Notificaciones leídas más antiguas que dias_leidas o de lotes cerrados.
+    
+    Los lotes cerrados se leen una vez por pasada: como lista literal la
+    condición no repite la subconsulta en cada bloque.
+    """
+    limite = datetime.utcnow() - timedelta(days=dias_leidas)
+    leidas_antiguas = and_(Notificacion.leida.is_(True), Notificacion.fecha_creacion < limite)
+    lotes_cerrados = db.session.execute(
+        select(Lote.id_lote).where(Lote.estado == 'cerrado')
+    ).scalars().all()
+    
+    if not lotes_cerrados:
+        return leidas_antiguas
+    return or_(leidas_antiguas, Notificacion.id_lote.in_(lotes_cerrados))
+
+
+def archivar_notificaciones(dias_leidas, tamano_lote):
+    """Archiva en bloques de tamano_lote filas; devuelve filas movidas, bloques y duración.
+    
+    Cada bloque continúa desde el último id movido, así no se vuelve a
+    recorrer el principio de la tabla en cada vuelta.
+    """
+    inicio = time.perf_counter()
+    condicion = _condicion_retencion(dias_leidas)
+    origen = Notificacion.__table__
+    archivo = NotificacionArchivada.__table__
+    
+    movidas = 0
+    bloques = 0
+    ultimo_id = 0
+    
+    while True:
+        ids = db.session.execute(
+            select(origen.c.id_notificacion)
+            .where(condicion, origen.c.id_notificacion > ultimo_id)
+            .order_by(origen.c.id_notificacion)
+            .limit(tamano_lote)
+        ).scalars().all()
+        
+        if not ids:
+            break
+        
+        try:
+            db.session.execute(insert(archivo).from_select(
+                COLUMNAS_ARCHIVO,
+                select(*[origen.c[columna] for columna in COLUMNAS_ARCHIVO]).where(origen.c.id_notificacion.in_(ids))
+            ))
+            db.session.execute(delete(origen).where(origen.c.id_notificacion.in_(ids)))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        ultimo_id = ids[-1]
+        movidas += len(ids)
+        bloques += 1
+        
+        if len(ids) < tamano_lote:
+            break
+    
+    return {
+        'movidas': movidas,
+        'bloques': bloques,
+        'duracion_ms': round((time.perf_counter() - inicio) * 1000, 1)
+    }
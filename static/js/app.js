@@ -16,6 +16,27 @@ let intervaloNotificaciones = null;
 
 console.log('🚀 API URL:', API_URL);
 
+// ============================================
+// LECTURA PROPIA (READ-YOUR-WRITES)
+// ============================================
+// Tras una escritura la API responde X-Lectura-Primaria-Segundos; mientras dure
+// esa ventana las peticiones envían X-Forzar-Primaria para no leer de la réplica
+// atrasada (la cookie no sirve: la SPA y la API están en dominios distintos).
+let leerPrimariaHasta = 0;
+
+async function fetchApi(url, opciones = {}) {
+    const headers = new Headers(opciones.headers || {});
+    if (Date.now() < leerPrimariaHasta) {
+        headers.set('X-Forzar-Primaria', '1');
+    }
+    const respuesta = await fetch(url, { ...opciones, headers });
+    const segundos = parseFloat(respuesta.headers.get('X-Lectura-Primaria-Segundos'));
+    if (segundos > 0) {
+        leerPrimariaHasta = Math.max(leerPrimariaHasta, Date.now() + segundos * 1000);
+    }
+    return respuesta;
+}
+
 // ============================================
 // RESTO DEL CÓDIGO (sin cambios)
 // ============================================
@@ -223,11 +244,25 @@ function configurarNavegacion() {
 
 async function cargarDashboard() {
     try {
-        // Cargar estadísticas
-        const respuestaStats = await fetch(`${API_URL}/dashboard/estadisticas`);
-        const dataStats = await respuestaStats.json();
+        // Cargar estadísticas y resumen de lotes en una sola petición
+        const respuestaBatch = await fetchApi(`${API_URL}/batch`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                requests: [
+                    { id: 'estadisticas', path: '/api/dashboard/estadisticas' },
+                    { id: 'resumen', path: '/api/dashboard/resumen-lotes' }
+                ]
+            })
+        });
+        const dataBatch = await respuestaBatch.json();
+        if (!dataBatch.success) {
+            throw new Error(dataBatch.error);
+        }
+        const resultados = Object.fromEntries(dataBatch.data.map(r => [r.id, r.body]));
         
-        if (dataStats.success) {
+        const dataStats = resultados.estadisticas;
+        if (dataStats && dataStats.success) {
             const stats = dataStats.data;
             document.getElementById('stat-capital').textContent = formatearMoneda(stats.capital_total);
             document.getElementById('stat-lotes').textContent = stats.lotes_activos;
@@ -235,11 +270,8 @@ async function cargarDashboard() {
             document.getElementById('stat-gastos').textContent = formatearMoneda(stats.gastos_mes);
         }
         
-        // Cargar resumen de lotes
-        const respuestaResumen = await fetch(`${API_URL}/dashboard/resumen-lotes`);
-        const dataResumen = await respuestaResumen.json();
-        
-        if (dataResumen.success) {
+        const dataResumen = resultados.resumen;
+        if (dataResumen && dataResumen.success) {
             mostrarResumenLotes(dataResumen.data);
         }
         
@@ -295,7 +327,7 @@ function mostrarResumenLotes(lotes) {
 
 async function cargarLotes() {
     try {
-        const respuesta = await fetch(`${API_URL}/lotes`);
+        const respuesta = await fetchApi(`${API_URL}/lotes`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -355,7 +387,7 @@ async function crearLote() {
     };
     
     try {
-        const respuesta = await fetch(`${API_URL}/lotes`, {
+        const respuesta = await fetchApi(`${API_URL}/lotes`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -386,7 +418,7 @@ async function cerrarLote(idLote) {
     }
     
     try {
-        const respuesta = await fetch(`${API_URL}/lotes/${idLote}/cerrar`, {
+        const respuesta = await fetchApi(`${API_URL}/lotes/${idLote}/cerrar`, {
             method: 'POST'
         });
         
@@ -410,7 +442,7 @@ async function eliminarLote(idLote, nombreLote) {
     }
     
     try {
-        const respuesta = await fetch(`${API_URL}/lotes/${idLote}`, {
+        const respuesta = await fetchApi(`${API_URL}/lotes/${idLote}`, {
             method: 'DELETE'
         });
         
@@ -452,7 +484,7 @@ async function actualizarLote() {
     };
     
     try {
-        const respuesta = await fetch(`${API_URL}/lotes/${idLote}`, {
+        const respuesta = await fetchApi(`${API_URL}/lotes/${idLote}`, {
             method: 'PUT',
             headers: {
                 'Content-Type': 'application/json'
@@ -505,7 +537,7 @@ function actualizarSelectLotes() {
 async function verDetallesLote(idLote) {
     try {
         // Obtener detalles del lote
-        const respuesta = await fetch(`${API_URL}/lotes/${idLote}`);
+        const respuesta = await fetchApi(`${API_URL}/lotes/${idLote}`);
         const data = await respuesta.json();
         
         if (!data.success) {
@@ -516,15 +548,15 @@ async function verDetallesLote(idLote) {
         const lote = data.data;
         
         // Obtener movimientos del lote
-        const respMovimientos = await fetch(`${API_URL}/movimientos/lote/${idLote}`);
+        const respMovimientos = await fetchApi(`${API_URL}/movimientos/lote/${idLote}`);
         const dataMovimientos = await respMovimientos.json();
         
         // Obtener compras del lote
-        const respCompras = await fetch(`${API_URL}/compras/lote/${idLote}`);
+        const respCompras = await fetchApi(`${API_URL}/compras/lote/${idLote}`);
         const dataCompras = await respCompras.json();
         
         // Obtener ventas del lote
-        const respVentas = await fetch(`${API_URL}/ventas/lote/${idLote}`);
+        const respVentas = await fetchApi(`${API_URL}/ventas/lote/${idLote}`);
         const dataVentas = await respVentas.json();
         
         // Construir HTML del modal
@@ -686,7 +718,7 @@ async function verDetallesLote(idLote) {
 async function cargarCompras() {
     try {
         // Obtener todas las compras
-        const respuesta = await fetch(`${API_URL}/compras/todas`);
+        const respuesta = await fetchApi(`${API_URL}/compras/todas`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -746,7 +778,7 @@ async function registrarCompra() {
     };
     
     try {
-        const respuesta = await fetch(`${API_URL}/compras`, {
+        const respuesta = await fetchApi(`${API_URL}/compras`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -776,7 +808,7 @@ async function eliminarCompra(idCompra) {
     }
     
     try {
-        const respuesta = await fetch(`${API_URL}/compras/${idCompra}`, {
+        const respuesta = await fetchApi(`${API_URL}/compras/${idCompra}`, {
             method: 'DELETE'
         });
         
@@ -801,7 +833,7 @@ async function eliminarCompra(idCompra) {
 
 async function cargarClientes() {
     try {
-        const respuesta = await fetch(`${API_URL}/clientes`);
+        const respuesta = await fetchApi(`${API_URL}/clientes`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -858,7 +890,7 @@ async function crearCliente() {
     };
     
     try {
-        const respuesta = await fetch(`${API_URL}/clientes`, {
+        const respuesta = await fetchApi(`${API_URL}/clientes`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -888,7 +920,7 @@ async function eliminarCliente(idCliente, nombreCliente) {
     }
     
     try {
-        const respuesta = await fetch(`${API_URL}/clientes/${idCliente}`, {
+        const respuesta = await fetchApi(`${API_URL}/clientes/${idCliente}`, {
             method: 'DELETE'
         });
         
@@ -926,7 +958,7 @@ async function actualizarCliente() {
     };
     
     try {
-        const respuesta = await fetch(`${API_URL}/clientes/${idCliente}`, {
+        const respuesta = await fetchApi(`${API_URL}/clientes/${idCliente}`, {
             method: 'PUT',
             headers: {
                 'Content-Type': 'application/json'
@@ -951,7 +983,7 @@ async function actualizarCliente() {
 
 async function verDetalleCliente(idCliente) {
     try {
-        const respuesta = await fetch(`${API_URL}/clientes/${idCliente}`);
+        const respuesta = await fetchApi(`${API_URL}/clientes/${idCliente}`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -1034,7 +1066,7 @@ function actualizarSelectClientes() {
 
 async function cargarVentas() {
     try {
-        const respuesta = await fetch(`${API_URL}/ventas`);
+        const respuesta = await fetchApi(`${API_URL}/ventas`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -1140,7 +1172,7 @@ async function registrarVenta() {
     }
     
     try {
-        const respuesta = await fetch(`${API_URL}/ventas`, {
+        const respuesta = await fetchApi(`${API_URL}/ventas`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -1171,7 +1203,7 @@ async function eliminarVenta(idVenta) {
     }
     
     try {
-        const respuesta = await fetch(`${API_URL}/ventas/${idVenta}`, {
+        const respuesta = await fetchApi(`${API_URL}/ventas/${idVenta}`, {
             method: 'DELETE'
         });
         
@@ -1196,7 +1228,7 @@ async function eliminarVenta(idVenta) {
 
 async function cargarCreditosPendientes() {
     try {
-        const respuesta = await fetch(`${API_URL}/creditos/pendientes`);
+        const respuesta = await fetchApi(`${API_URL}/creditos/pendientes`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -1260,7 +1292,7 @@ async function registrarPago() {
     };
     
     try {
-        const respuesta = await fetch(`${API_URL}/pagos`, {
+        const respuesta = await fetchApi(`${API_URL}/pagos`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -1301,7 +1333,7 @@ function inicializarNotificaciones() {
 
 async function cargarNotificacionesCampana() {
     try {
-        const respuesta = await fetch(`${API_URL}/notificaciones?no_leidas=true`);
+        const respuesta = await fetchApi(`${API_URL}/notificaciones?no_leidas=true`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -1366,7 +1398,7 @@ function mostrarNotificacionesDropdown(notificaciones) {
 async function marcarLeidaYVer(idNotificacion) {
     try {
         // Marcar como leída
-        await fetch(`${API_URL}/notificaciones/${idNotificacion}/marcar-leida`, {
+        await fetchApi(`${API_URL}/notificaciones/${idNotificacion}/marcar-leida`, {
             method: 'POST'
         });
         
@@ -1385,7 +1417,7 @@ async function marcarLeidaYVer(idNotificacion) {
 
 async function marcarTodasLeidas() {
     try {
-        const respuesta = await fetch(`${API_URL}/notificaciones/marcar-todas-leidas`, {
+        const respuesta = await fetchApi(`${API_URL}/notificaciones/marcar-todas-leidas`, {
             method: 'POST'
         });
         
@@ -1434,7 +1466,7 @@ async function cargarNotificaciones() {
             url += `no_leidas=${leidas === 'false'}`;
         }
         
-        const respuesta = await fetch(url);
+        const respuesta = await fetchApi(url);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -1516,7 +1548,7 @@ function mostrarNotificacionesCompletas(notificaciones) {
 
 async function marcarNotificacionLeida(idNotificacion) {
     try {
-        const respuesta = await fetch(`${API_URL}/notificaciones/${idNotificacion}/marcar-leida`, {
+        const respuesta = await fetchApi(`${API_URL}/notificaciones/${idNotificacion}/marcar-leida`, {
             method: 'POST'
         });
         
@@ -1535,7 +1567,7 @@ async function eliminarNotificacion(idNotificacion) {
     if (!confirm('¿Eliminar esta notificación?')) return;
     
     try {
-        const respuesta = await fetch(`${API_URL}/notificaciones/${idNotificacion}`, {
+        const respuesta = await fetchApi(`${API_URL}/notificaciones/${idNotificacion}`, {
             method: 'DELETE'
         });
         
@@ -1554,7 +1586,7 @@ async function eliminarNotificacion(idNotificacion) {
 
 async function generarNotificacionesAutomaticas() {
     try {
-        const respuesta = await fetch(`${API_URL}/notificaciones/generar-automaticas`, {
+        const respuesta = await fetchApi(`${API_URL}/notificaciones/generar-automaticas`, {
             method: 'POST'
         });
         
@@ -1584,7 +1616,7 @@ async function cargarCronogramaLote() {
     }
     
     try {
-        const respuesta = await fetch(`${API_URL}/cronograma/lote/${idLote}`);
+        const respuesta = await fetchApi(`${API_URL}/cronograma/lote/${idLote}`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -1724,7 +1756,7 @@ function mostrarCronogramaLote(data) {
 
 async function completarEvento(idEvento) {
     try {
-        const respuesta = await fetch(`${API_URL}/cronograma/evento/${idEvento}/completar`, {
+        const respuesta = await fetchApi(`${API_URL}/cronograma/evento/${idEvento}/completar`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -1748,7 +1780,7 @@ async function completarEvento(idEvento) {
 
 async function verEventosPendientesGeneral() {
     try {
-        const respuesta = await fetch(`${API_URL}/cronograma/eventos-pendientes`);
+        const respuesta = await fetchApi(`${API_URL}/cronograma/eventos-pendientes`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -1804,7 +1836,7 @@ function mostrarEventosPendientesGeneral(eventos) {
 
 async function cargarResumenMortalidad() {
     try {
-        const respuesta = await fetch(`${API_URL}/mortalidad/resumen`);
+        const respuesta = await fetchApi(`${API_URL}/mortalidad/resumen`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -1871,7 +1903,7 @@ async function registrarMortalidad() {
     };
     
     try {
-        const respuesta = await fetch(`${API_URL}/mortalidad`, {
+        const respuesta = await fetchApi(`${API_URL}/mortalidad`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -1897,7 +1929,7 @@ async function registrarMortalidad() {
 
 async function verDetalleMortalidad(idLote) {
     try {
-        const respuesta = await fetch(`${API_URL}/mortalidad/lote/${idLote}`);
+        const respuesta = await fetchApi(`${API_URL}/mortalidad/lote/${idLote}`);
         const data = await respuesta.json();
         
         if (data.success) {
@@ -0,0 +1,209 @@
+"""
+Ejecutor de efectos secundarios no críticos
+Los handlers confirman su escritura esencial y después encolan el trabajo
+secundario (alertas, resúmenes, refrescos de caché) con encolar_tarea().
+Un pool acotado de hilos lo ejecuta fuera de la petición. Lo que falla, no
+cabe en la cola o sigue pendiente al apagar el worker se guarda en
+tareas_pendientes y se reintenta con espera exponencial.
+"""
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app, g
+from sqlalchemy import delete, select
+from granjas import granja_actual
+from models import db, TareaPendiente
+
+# nombre -> función(**argumentos); la función trabaja con db.session y hace su commit
+TAREAS = {}
+
+_cola = None
+_hilos = []
+_candado = threading.Lock()
+_detenido = threading.Event()
+
+# Momento (monotonic) de la próxima revisión de tareas_pendientes, compartido por los hilos
+_proxima_revision = [0.0]
+_candado_revision = threading.Lock()
+
+
+def tarea(nombre):
+    """Registra una función como tarea ejecutable por nombre"""
+    def decorador(funcion):
+        TAREAS[nombre] = funcion
+        return funcion
+    return decorador
+
+
+def encolar_tarea(nombre, **argumentos):
+    """Encola una tarea para después del commit; nunca falla la petición que la pide"""
+    app = current_app._get_current_object()
+    item = (granja_actual(), nombre, argumentos, 0)
+    
+    if not _detenido.is_set():
+        _iniciar_hilos(app)
+        try:
+            _cola.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+    
+    # Cola llena o worker apagándose: queda persistida para reintento
+    _persistir(app, item, 'Cola llena o worker detenido', reintentar_en=0)
+
+
+def _iniciar_hilos(app):
+    global _cola
+    if _hilos:
+        return
+    with _candado:
+        if not _hilos:
+            _cola = queue.Queue(maxsize=app.config['TAREAS_MAX_COLA'])
+            for numero in range(app.config['TAREAS_MAX_HILOS']):
+                hilo = threading.Thread(target=_ciclo, args=(app,), name=f'tareas-{numero}', daemon=True)
+                hilo.start()
+                _hilos.append(hilo)
+
+
+def _toca_revision(espera):
+    """True para un solo hilo cada `espera` segundos"""
+    ahora = time.monotonic()
+    with _candado_revision:
+        if ahora < _proxima_revision[0]:
+            return False
+        _proxima_revision[0] = ahora + espera
+        return True
+
+
+def _ciclo(app):
+    espera = app.config['TAREAS_REVISION_SEGUNDOS']
+    while not (_detenido.is_set() and _cola.empty()):
+        # Reintentos vencidos cada TAREAS_REVISION_SEGUNDOS, aunque la cola nunca se vacíe
+        if not _detenido.is_set() and _toca_revision(espera):
+            _reclamar_pendientes(app)
+        try:
+            item = _cola.get(timeout=max(_proxima_revision[0] - time.monotonic(), 0.01))
+        except queue.Empty:
+            continue
+        try:
+            _ejecutar(app, item)
+        finally:
+            _cola.task_done()
+
+
+def _ejecutar(app, item):
+    granja, nombre, argumentos, intentos = item
+    with app.app_context():
+        g.granja = granja
+        try:
+            TAREAS[nombre](**argumentos)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning('Tarea %s falló (intento %s): %s', nombre, intentos + 1, e)
+            _persistir(app, (granja, nombre, argumentos, intentos + 1), str(e))
+
+
+def _persistir(app, item, error, reintentar_en=None):
+    """Guarda la tarea en tareas_pendientes con su próximo intento (None = agotada)"""
+    granja, nombre, argumentos, intentos = item
+    if reintentar_en is None and intentos < app.config['TAREAS_MAX_INTENTOS']:
+        reintentar_en = app.config['TAREAS_ESPERA_BASE_SEGUNDOS'] * 2 ** (intentos - 1)
+    
+    with app.app_context():
+        g.granja = granja
+        try:
+            db.session.add(TareaPendiente(
+                nombre=nombre,
+                argumentos=json.dumps(argumentos),
+                intentos=intentos,
+                proximo_intento=datetime.utcnow() + timedelta(seconds=reintentar_en) if reintentar_en is not None else None,
+                ultimo_error=error[:500]
+            ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            app.logger.exception('No se pudo persistir la tarea %s', nombre)
+
+
+def _reclamar_pendientes(app):
+    """Toma las tareas vencidas de cada base; borrar la fila es el reclamo entre workers.
+    
+    Corre dentro de un hilo del pool: nunca espera por espacio en la cola (los
+    demás hilos podrían estar haciendo lo mismo). Solo reclama los lugares
+    libres y lo que no cabe sigue pendiente en la tabla.
+    """
+    for granja in [None, *app.config['GRANJAS']]:
+        libres = _cola.maxsize - _cola.qsize()
+        if libres <= 0:
+            return
+        with app.app_context():
+            g.granja = granja
+            try:
+                # Columnas y no entidades: el commit de cada reclamo expiraría los objetos
+                filas = db.session.execute(
+                    select(
+                        TareaPendiente.id_tarea, TareaPendiente.nombre, TareaPendiente.argumentos,
+                        TareaPendiente.intentos, TareaPendiente.ultimo_error
+                    ).where(
+                        TareaPendiente.proximo_intento <= datetime.utcnow()
+                    ).order_by(TareaPendiente.proximo_intento).limit(libres)
+                ).all()
+                
+                for fila in filas:
+                    if _cola.full():
+                        break
+                    reclamada = db.session.execute(
+                        delete(TareaPendiente).where(TareaPendiente.id_tarea == fila.id_tarea)
+                    ).rowcount
+                    db.session.commit()
+                    if not (reclamada and fila.nombre in TAREAS):
+                        continue
+                    item = (granja, fila.nombre, json.loads(fila.argumentos), fila.intentos)
+                    try:
+                        _cola.put_nowait(item)
+                    except queue.Full:
+                        # Una petición ocupó el lugar: vuelve a la tabla sin gastar un intento
+                        _persistir(app, item, fila.ultimo_error or '', reintentar_en=0)
+            except Exception:
+                db.session.rollback()
+                app.logger.exception('No se pudieron reclamar tareas pendientes')
+
+
+def drenar(app, segundos=None):
+    """Deja de aceptar tareas, espera a que la cola se vacíe y persiste lo que quede"""
+    _detenido.set()
+    if not _hilos:
+        return 0
+    
+    limite = time.monotonic() + (segundos if segundos is not None else app.config['TAREAS_DRENAJE_SEGUNDOS'])
+    while _cola.unfinished_tasks and time.monotonic() < limite:
+        time.sleep(0.05)
+    
+    persistidas = 0
+    while True:
+        try:
+            item = _cola.get_nowait()
+        except queue.Empty:
+            break
+        _persistir(app, item, 'Pendiente al apagar el worker', reintentar_en=0)
+        _cola.task_done()
+        persistidas += 1
+    return persistidas
+
+
+# ============================================
+# TAREAS
+# ============================================
+
+@tarea('alerta_mortalidad')
+def alerta_mortalidad(id_lote, porcentaje_dia, cantidad_muertos):
+    """Crea la notificación de mortalidad alta si el día superó el umbral"""
+    from alertas import evaluar_mortalidad
+    from models import Lote
+    
+    lote = db.session.get(Lote, id_lote)
+    if lote and evaluar_mortalidad(lote, porcentaje_dia, cantidad_muertos):
+        db.session.commit()
@@ -0,0 +1,77 @@
+"""
+Fixtures comunes: una aplicación sobre una base SQLite nueva por prueba
+y ayudantes para crear datos a través de la API
+"""
+
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from models import db  # noqa: E402
+import referencia  # noqa: E402
+
+HOY = date.today().isoformat()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'prueba.db'}")
+    # La caché de referencia es por proceso: no debe pasar de una base a otra
+    monkeypatch.setattr(referencia, '_cache', {})
+    
+    app = create_app()
+    resultado = app.test_cli_runner().invoke(args=['init-db'])
+    assert resultado.exit_code == 0, resultado.output
+    
+    yield app
+    
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def crear(client, ruta, datos):
+    """POST que debe crear el registro; devuelve data de la respuesta"""
+    response = client.post(ruta, json=datos)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['data']
+
+
+def crear_cliente(client, nombre='Juan Pérez'):
+    return crear(client, '/api/clientes', {'nombre': nombre, 'telefono': '3001234567'})['id_cliente']
+
+
+def crear_lote(client, nombre='Lote 1', capital=1000000):
+    return crear(client, '/api/lotes', {
+        'nombre_lote': nombre, 'cantidad_inicial': 100, 'fecha_inicio': HOY, 'capital_inicial': capital
+    })['id_lote']
+
+
+def crear_venta(client, id_lote, id_cliente, kilos=10, precio=1000, tipo_pago='contado', fecha=HOY):
+    return crear(client, '/api/ventas', {
+        'id_lote': id_lote, 'id_cliente': id_cliente, 'cantidad_pollos': 5, 'cantidad_kilos': kilos,
+        'precio_kilo': precio, 'fecha_venta': fecha, 'tipo_pago': tipo_pago
+    })['id_venta']
+
+
+def crear_compra(client, id_lote, cantidad=10, costo=500, fecha=HOY):
+    return crear(client, '/api/compras', {
+        'id_lote': id_lote, 'tipo_materia': 'alimento', 'cantidad': cantidad, 'unidad': 'kg',
+        'costo_unitario': costo, 'fecha_compra': fecha
+    })['id_compra']
+
+
+def cerrar_lote(client, id_lote):
+    response = client.post(f'/api/lotes/{id_lote}/cerrar')
+    assert response.status_code == 200, response.get_json()
@@ -0,0 +1,105 @@
+"""
+Archivo en frío: las lecturas por UNION no cambian en ninguna fase del archivado
+y los lotes archivados no admiten detalle nuevo
+"""
+
+import pytest
+
+import archivo
+from conftest import HOY, cerrar_lote, crear_cliente, crear_compra, crear_lote, crear_venta
+from models import db, CompraMateriaPrima, CompraMateriaPrimaArchivada, MovimientoCapital, Venta
+
+
+@pytest.fixture
+def lote_cerrado(client):
+    """Lote cerrado con una compra y dos ventas de contado; otro lote sigue activo"""
+    id_cliente = crear_cliente(client)
+    id_lote = crear_lote(client)
+    crear_compra(client, id_lote, cantidad=10, costo=500)
+    crear_venta(client, id_lote, id_cliente, kilos=10, precio=1000)
+    crear_venta(client, id_lote, id_cliente, kilos=5, precio=1000)
+    cerrar_lote(client, id_lote)
+    
+    activo = crear_lote(client, 'Lote 2')
+    crear_compra(client, activo, cantidad=1, costo=700)
+    return id_lote
+
+
+def _lecturas(client, id_lote):
+    """Totales del reporte financiero y fila del lote en el resumen del dashboard"""
+    reporte = client.get(f'/api/reportes/financiero?desde={HOY}&hasta={HOY}').get_json()['data']
+    resumen = client.get('/api/dashboard/resumen-lotes').get_json()['data']
+    fila = next(fila for fila in resumen if fila['id_lote'] == id_lote)
+    return reporte['totales'], reporte['grupos'], (fila['total_gastos'], fila['total_ingresos'])
+
+
+def test_lecturas_iguales_en_cada_fase(app, client, lote_cerrado):
+    esperado = _lecturas(client, lote_cerrado)
+    assert esperado[0]['ventas'] == 15000
+    assert esperado[0]['compras'] == 5700
+    assert esperado[2] == (5000, 15000)
+    
+    # Fase 1: las filas quedan en ambas tablas, se siguen leyendo de la activa
+    with app.app_context():
+        copiadas = sum(archivo._copiar(modelo, lote_cerrado, 2) for modelo in archivo.MODELOS_ARCHIVO)
+    assert copiadas > 0
+    assert _lecturas(client, lote_cerrado) == esperado
+    
+    # Fase 2: el lote se marca y se lee del archivo
+    with app.app_context():
+        archivo._marcar_archivado(lote_cerrado, copiadas)
+        assert archivo.lote_archivado(lote_cerrado)
+        assert CompraMateriaPrima.query.filter_by(id_lote=lote_cerrado).count() == 1
+    assert _lecturas(client, lote_cerrado) == esperado
+    
+    # Fase 3: la tabla activa queda sin el detalle del lote
+    with app.app_context():
+        _, borradas = archivo.archivar_lote(lote_cerrado, 2)
+        assert borradas == copiadas
+        assert MovimientoCapital.query.filter_by(id_lote=lote_cerrado).count() == 0
+        assert Venta.query.filter_by(id_lote=lote_cerrado).count() == 0
+        assert CompraMateriaPrimaArchivada.query.filter_by(id_lote=lote_cerrado).count() == 1
+    assert _lecturas(client, lote_cerrado) == esperado
+
+
+def test_fase_dos_copia_lo_escrito_despues_de_la_fase_uno(app, client, lote_cerrado):
+    with app.app_context():
+        copiadas = sum(archivo._copiar(modelo, lote_cerrado, 100) for modelo in archivo.MODELOS_ARCHIVO)
+    crear_compra(client, lote_cerrado, cantidad=1, costo=300)
+    esperado = _lecturas(client, lote_cerrado)
+    
+    with app.app_context():
+        assert archivo._marcar_archivado(lote_cerrado, copiadas) == copiadas + 2
+    assert _lecturas(client, lote_cerrado) == esperado
+    assert esperado[0]['compras'] == 6000
+
+
+def test_detalle_del_lote_archivado_se_lee_del_archivo(app, client, lote_cerrado):
+    with app.app_context():
+        archivo.archivar_lote(lote_cerrado, 100)
+    
+    compras = client.get(f'/api/compras/lote/{lote_cerrado}').get_json()['data']
+    ventas = client.get(f'/api/ventas/lote/{lote_cerrado}').get_json()['data']
+    
+    assert [compra['costo_total'] for compra in compras] == [5000]
+    assert sorted(venta['valor_total'] for venta in ventas) == [5000, 10000]
+
+
+@pytest.mark.parametrize('ruta, datos', [
+    ('/api/compras', {
+        'tipo_materia': 'alimento', 'cantidad': 1, 'unidad': 'kg', 'costo_unitario': 100, 'fecha_compra': HOY
+    }),
+    ('/api/movimientos', {'tipo_movimiento': 'gasto', 'valor': 100, 'fecha_movimiento': HOY}),
+    ('/api/mortalidad', {'cantidad_muertos': 1}),
+])
+def test_lote_archivado_rechaza_detalle_nuevo(app, client, lote_cerrado, ruta, datos):
+    with app.app_context():
+        archivo.archivar_lote(lote_cerrado, 100)
+        antes = db.session.query(MovimientoCapital).count()
+    
+    response = client.post(ruta, json={'id_lote': lote_cerrado, **datos})
+    
+    assert response.status_code == 400
+    assert 'archivado' in response.get_json()['error']
+    with app.app_context():
+        assert db.session.query(MovimientoCapital).count() == antes
@@ -0,0 +1,83 @@
+"""
+Caché de respuestas de lotes cerrados: clave, lectura y borrado al escribir
+"""
+
+from conftest import HOY, cerrar_lote, crear_cliente, crear_lote, crear_venta
+from models import db, CacheRespuestaLote, VentaCredito
+
+
+def _lote_cerrado_con_credito(client):
+    id_cliente = crear_cliente(client)
+    id_lote = crear_lote(client)
+    id_venta = crear_venta(client, id_lote, id_cliente, tipo_pago='credito')
+    cerrar_lote(client, id_lote)
+    return id_lote, id_cliente, id_venta
+
+
+def _rutas_cacheadas(app, id_lote):
+    with app.app_context():
+        return sorted(
+            ruta for (ruta,) in db.session.query(CacheRespuestaLote.ruta).filter_by(id_lote=id_lote)
+        )
+
+
+def test_lote_cerrado_se_cachea_en_la_primera_lectura(app, client):
+    id_lote, _, _ = _lote_cerrado_con_credito(client)
+    
+    primera = client.get(f'/api/ventas/lote/{id_lote}')
+    segunda = client.get(f'/api/ventas/lote/{id_lote}')
+    
+    assert primera.status_code == 200
+    assert segunda.get_json() == primera.get_json()
+    assert 'max-age' in segunda.headers['Cache-Control']
+    assert _rutas_cacheadas(app, id_lote) == [f'/api/ventas/lote/{id_lote}']
+
+
+def test_lote_activo_no_se_cachea(app, client):
+    id_lote = crear_lote(client)
+    
+    assert client.get(f'/api/ventas/lote/{id_lote}').status_code == 200
+    assert _rutas_cacheadas(app, id_lote) == []
+
+
+def test_clave_solo_incluye_parametros_que_cambian_la_respuesta(app, client):
+    id_lote, _, _ = _lote_cerrado_con_credito(client)
+    
+    client.get(f'/api/movimientos/lote/{id_lote}?primaria=1')
+    client.get(f'/api/movimientos/lote/{id_lote}?fields=valor')
+    
+    assert _rutas_cacheadas(app, id_lote) == [
+        f'/api/movimientos/lote/{id_lote}',
+        f'/api/movimientos/lote/{id_lote}?fields=valor',
+    ]
+
+
+def test_pago_posterior_al_cierre_invalida_la_cache(app, client):
+    id_lote, _, id_venta = _lote_cerrado_con_credito(client)
+    client.get(f'/api/ventas/lote/{id_lote}')
+    with app.app_context():
+        id_credito = VentaCredito.query.filter_by(id_venta=id_venta).one().id_credito
+    
+    response = client.post('/api/pagos', json={'id_credito': id_credito, 'valor_pago': 4000, 'fecha_pago': HOY})
+    
+    assert response.status_code == 201
+    assert _rutas_cacheadas(app, id_lote) == []
+    credito = client.get(f'/api/ventas/lote/{id_lote}').get_json()['data'][0]['credito']
+    assert credito['valor_pagado'] == 4000
+
+
+def test_renombrar_cliente_invalida_las_ventas_cacheadas(app, client):
+    id_lote, id_cliente, _ = _lote_cerrado_con_credito(client)
+    otro_lote = crear_lote(client, 'Lote 2')
+    crear_venta(client, otro_lote, crear_cliente(client, 'Ana Gómez'))
+    cerrar_lote(client, otro_lote)
+    client.get(f'/api/ventas/lote/{id_lote}')
+    client.get(f'/api/ventas/lote/{otro_lote}')
+    
+    response = client.put(f'/api/clientes/{id_cliente}', json={'nombre': 'Juan Pérez Ruiz'})
+    
+    assert response.status_code == 200
+    assert _rutas_cacheadas(app, id_lote) == []
+    assert _rutas_cacheadas(app, otro_lote) == [f'/api/ventas/lote/{otro_lote}']
+    venta = client.get(f'/api/ventas/lote/{id_lote}').get_json()['data'][0]
+    assert venta['cliente_nombre'] == 'Juan Pérez Ruiz'
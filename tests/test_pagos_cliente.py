@@ -0,0 +1,100 @@
+"""
+Reparto del pago de un cliente entre sus créditos abiertos
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from blueprints.creditos import _repartir_pago
+from conftest import HOY, crear_cliente, crear_lote, crear_venta
+from models import CapitalLote, VentaCredito
+
+
+def _creditos(*pendientes):
+    """Créditos abiertos como las filas bloqueadas, del más antiguo al más nuevo"""
+    return [
+        SimpleNamespace(id_credito=id_credito, valor_pendiente=Decimal(pendiente))
+        for id_credito, pendiente in enumerate(pendientes, start=1)
+    ]
+
+
+def _repartido(asignaciones):
+    return [(credito.id_credito, valor) for credito, valor in asignaciones]
+
+
+def test_sin_distribucion_paga_del_mas_antiguo_al_mas_nuevo():
+    asignaciones = _repartir_pago(_creditos('100', '50', '80'), Decimal('120'), None)
+    
+    assert _repartido(asignaciones) == [(1, Decimal('100')), (2, Decimal('20'))]
+
+
+def test_pago_exacto_del_saldo_cubre_todos_los_creditos():
+    asignaciones = _repartir_pago(_creditos('100', '50'), Decimal('150'), None)
+    
+    assert _repartido(asignaciones) == [(1, Decimal('100')), (2, Decimal('50'))]
+
+
+@pytest.mark.parametrize('valor, mensaje', [
+    (Decimal('0'), 'mayor que cero'),
+    (Decimal('-5'), 'mayor que cero'),
+    (Decimal('150.01'), 'excede el saldo'),
+])
+def test_sin_distribucion_rechaza_valores_invalidos(valor, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        _repartir_pago(_creditos('100', '50'), valor, None)
+
+
+def test_distribucion_explicita():
+    distribucion = [{'id_credito': 2, 'valor': '30'}, {'id_credito': 1, 'valor': 10}]
+    
+    asignaciones = _repartir_pago(_creditos('100', '50'), Decimal('40'), distribucion)
+    
+    assert _repartido(asignaciones) == [(2, Decimal('30')), (1, Decimal('10'))]
+
+
+def test_distribucion_sin_valor_de_pago():
+    asignaciones = _repartir_pago(_creditos('100'), None, [{'id_credito': 1, 'valor': 25.5}])
+    
+    assert _repartido(asignaciones) == [(1, Decimal('25.5'))]
+
+
+@pytest.mark.parametrize('distribucion, valor_pago, mensaje', [
+    ([{'id_credito': 9, 'valor': 10}], None, 'no válido'),
+    ([{'id_credito': 1, 'valor': 10}, {'id_credito': 1, 'valor': 10}], None, 'no válido'),
+    ([{'id_credito': 1, 'valor': 0}], None, 'mayor que cero'),
+    ([{'id_credito': 2, 'valor': 60}], None, 'excede el saldo pendiente del crédito 2'),
+    ([{'id_credito': 1, 'valor': 10}], Decimal('20'), 'no suma'),
+])
+def test_distribucion_rechaza_partes_invalidas(distribucion, valor_pago, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        _repartir_pago(_creditos('100', '50'), valor_pago, distribucion)
+
+
+def test_endpoint_reparte_y_actualiza_creditos_y_capital(app, client):
+    id_cliente = crear_cliente(client)
+    id_lote = crear_lote(client, capital=0)
+    crear_venta(client, id_lote, id_cliente, kilos=10, precio=10, tipo_pago='credito')
+    crear_venta(client, id_lote, id_cliente, kilos=5, precio=10, tipo_pago='credito')
+    
+    response = client.post(f'/api/pagos/cliente/{id_cliente}', json={'valor_pago': 120, 'fecha_pago': HOY})
+    
+    assert response.status_code == 201, response.get_json()
+    with app.app_context():
+        creditos = VentaCredito.query.order_by(VentaCredito.id_credito).all()
+        assert [(credito.estado_deuda, credito.valor_pendiente) for credito in creditos] == [
+            ('pagado', 0), ('parcial', 30)
+        ]
+        assert CapitalLote.query.filter_by(id_lote=id_lote).one().capital_actual == 120
+
+
+def test_endpoint_rechaza_pago_mayor_que_la_deuda(app, client):
+    id_cliente = crear_cliente(client)
+    crear_venta(client, crear_lote(client), id_cliente, kilos=1, precio=10, tipo_pago='credito')
+    
+    response = client.post(f'/api/pagos/cliente/{id_cliente}', json={'valor_pago': 11, 'fecha_pago': HOY})
+    
+    assert response.status_code == 400
+    with app.app_context():
+        assert VentaCredito.query.one().valor_pendiente == 10
@@ -0,0 +1,87 @@
+"""
+Reporte financiero: caché de rangos pasados y su invalidación por escrituras
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+import blueprints.reportes as reportes
+from conftest import crear_compra, crear_lote
+from models import db, CacheReporte, VersionReferencia
+from utils import CONJUNTO_REPORTES
+
+AYER = date.today() - timedelta(days=1)
+HACE_UNA_SEMANA = date.today() - timedelta(days=7)
+HACE_UN_MES = date.today() - timedelta(days=30)
+
+
+def _reporte(client, desde, hasta):
+    response = client.get(f'/api/reportes/financiero?desde={desde.isoformat()}&hasta={hasta.isoformat()}')
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_rango_pasado_se_sirve_desde_cache(client):
+    id_lote = crear_lote(client)
+    crear_compra(client, id_lote, fecha=AYER.isoformat())
+    
+    primero = _reporte(client, HACE_UNA_SEMANA, AYER)
+    segundo = _reporte(client, HACE_UNA_SEMANA, AYER)
+    
+    assert primero['cache'] is False
+    assert segundo['cache'] is True
+    assert segundo['data'] == primero['data']
+    assert segundo['data']['totales']['compras'] == 5000
+
+
+def test_rango_que_incluye_hoy_no_se_cachea(app, client):
+    crear_compra(client, crear_lote(client))
+    
+    assert _reporte(client, HACE_UNA_SEMANA, date.today())['cache'] is False
+    assert _reporte(client, HACE_UNA_SEMANA, date.today())['cache'] is False
+    with app.app_context():
+        assert CacheReporte.query.count() == 0
+
+
+def test_escritura_con_fecha_del_rango_invalida_el_reporte(client):
+    id_lote = crear_lote(client)
+    crear_compra(client, id_lote, fecha=AYER.isoformat())
+    _reporte(client, HACE_UNA_SEMANA, AYER)
+    
+    crear_compra(client, id_lote, fecha=(AYER - timedelta(days=2)).isoformat())
+    reporte = _reporte(client, HACE_UNA_SEMANA, AYER)
+    
+    assert reporte['cache'] is False
+    assert reporte['data']['totales']['compras'] == 10000
+
+
+def test_escritura_fuera_del_rango_conserva_el_reporte(app, client):
+    id_lote = crear_lote(client)
+    _reporte(client, HACE_UN_MES, HACE_UNA_SEMANA)
+    
+    crear_compra(client, id_lote, fecha=AYER.isoformat())
+    
+    assert _reporte(client, HACE_UN_MES, HACE_UNA_SEMANA)['cache'] is True
+    with app.app_context():
+        assert db.session.query(CacheReporte.clave).count() == 1
+
+
+def test_reporte_invalidado_mientras_se_calcula_no_se_guarda(app, client, monkeypatch):
+    calcular = reportes._calcular_reporte_financiero
+    
+    def calcular_con_escritura_concurrente(*args):
+        reporte = calcular(*args)
+        # Otro worker confirma una invalidación antes de que este guarde
+        db.session.rollback()
+        with db.engine.begin() as conexion:
+            conexion.execute(update(VersionReferencia).where(
+                VersionReferencia.conjunto == CONJUNTO_REPORTES
+            ).values(version=VersionReferencia.version + 1))
+        return reporte
+    
+    monkeypatch.setattr(reportes, '_calcular_reporte_financiero', calcular_con_escritura_concurrente)
+    
+    assert _reporte(client, HACE_UNA_SEMANA, AYER)['cache'] is False
+    with app.app_context():
+        assert CacheReporte.query.count() == 0
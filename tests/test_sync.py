@@ -0,0 +1,117 @@
+"""
+Sincronización incremental: tokens, números de cambio y marcas de borrado
+"""
+
+from conftest import crear_cliente, crear_lote, crear_venta
+from models import db, Cliente, Lote, RegistroEliminado, Venta
+
+
+def _sync(client, since=None, entidades=None):
+    parametros = {}
+    if since is not None:
+        parametros['since'] = since
+    if entidades:
+        parametros['entidades'] = entidades
+    response = client.get('/api/sync', query_string=parametros)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+
+def test_sin_token_devuelve_todo(client):
+    crear_cliente(client)
+    crear_lote(client)
+    
+    datos = _sync(client)
+    
+    assert datos['completo'] is True
+    assert len(datos['cambios']['clientes']) == 1
+    assert len(datos['cambios']['lotes']) == 1
+    assert int(datos['token']) > 0
+
+
+def test_token_devuelve_solo_lo_posterior(client):
+    crear_cliente(client, 'Juan Pérez')
+    token = _sync(client)['token']
+    
+    id_nuevo = crear_cliente(client, 'Ana Gómez')
+    datos = _sync(client, token)
+    
+    assert datos['completo'] is False
+    assert [cliente['id_cliente'] for cliente in datos['cambios']['clientes']] == [id_nuevo]
+    assert datos['cambios']['lotes'] == []
+    assert int(datos['token']) > int(token)
+    assert _sync(client, datos['token'])['cambios']['clientes'] == []
+
+
+def test_actualizacion_vuelve_a_sincronizarse(client):
+    id_cliente = crear_cliente(client)
+    token = _sync(client)['token']
+    
+    client.put(f'/api/clientes/{id_cliente}', json={'telefono': '3109876543'})
+    clientes = _sync(client, token)['cambios']['clientes']
+    
+    assert [cliente['telefono'] for cliente in clientes] == ['3109876543']
+
+
+def test_numeros_de_cambio_definitivos_y_en_orden_de_commit(app, client):
+    primero = crear_cliente(client, 'Juan Pérez')
+    id_lote = crear_lote(client)
+    segundo = crear_cliente(client, 'Ana Gómez')
+    crear_venta(client, id_lote, segundo)
+    
+    with app.app_context():
+        versiones = dict(db.session.query(Cliente.id_cliente, Cliente.version_sync))
+        lote = db.session.get(Lote, id_lote).version_sync
+        venta = db.session.query(Venta.version_sync).scalar()
+    
+    # El número provisional (negativo) se reemplaza al confirmar
+    assert min(versiones.values()) > 0
+    assert versiones[primero] < lote < versiones[segundo] < venta
+
+
+def test_borrado_deja_marca(app, client):
+    id_cliente = crear_cliente(client)
+    token = _sync(client)['token']
+    
+    assert client.delete(f'/api/clientes/{id_cliente}').status_code == 200
+    datos = _sync(client, token)
+    
+    assert datos['eliminados']['clientes'] == [id_cliente]
+    assert datos['cambios']['clientes'] == []
+    assert _sync(client, datos['token'])['eliminados']['clientes'] == []
+    with app.app_context():
+        assert RegistroEliminado.query.filter_by(tabla='clientes', id_registro=id_cliente).one().version_sync > 0
+
+
+def test_borrado_de_venta_a_credito_marca_venta_y_credito(client):
+    id_lote = crear_lote(client)
+    id_venta = crear_venta(client, id_lote, crear_cliente(client), tipo_pago='credito')
+    datos = _sync(client, entidades='creditos')
+    id_credito = datos['cambios']['creditos'][0]['id_credito']
+    
+    assert client.delete(f'/api/ventas/{id_venta}').status_code == 200
+    eliminados = _sync(client, datos['token'], 'ventas,creditos')['eliminados']
+    
+    assert eliminados == {'ventas': [id_venta], 'creditos': [id_credito]}
+
+
+def test_transaccion_revertida_no_consume_numero(app, client):
+    crear_cliente(client, 'Juan Pérez')
+    token = _sync(client)['token']
+    
+    with app.app_context():
+        db.session.add(Cliente(nombre='Revertido', telefono='3000000000'))
+        db.session.flush()
+        db.session.rollback()
+    
+    id_nuevo = crear_cliente(client, 'Ana Gómez')
+    datos = _sync(client, token)
+    
+    assert [cliente['id_cliente'] for cliente in datos['cambios']['clientes']] == [id_nuevo]
+    assert int(datos['token']) == int(token) + 1
+
+
+def test_token_no_valido(client):
+    response = client.get('/api/sync?since=abc')
+    
+    assert response.status_code == 400
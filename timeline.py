@@ -0,0 +1,131 @@
+"""
+Línea de tiempo de un lote
+Une movimientos, compras, ventas, pagos, mortalidad y cronograma del lote en una
+sola consulta UNION ALL ordenada por (fecha, tipo, id) y paginada por cursor.
+Cada rama lee un rango del índice (id_lote, fecha) de su tabla desde el cursor
+y se corta en el tamaño de la página, así una página no recorre todo el lote.
+"""
+
+import operator
+from collections import defaultdict
+from datetime import date
+from sqlalchemy import and_, literal, or_, select, union_all
+from models import (
+    db, MovimientoCapital, CompraMateriaPrima, Venta, VentaCredito, PagoCliente,
+    EventoCronograma, MortalidadLote
+)
+from archivo import MODELOS_ARCHIVO, lote_archivado
+
+# Tipo de evento -> (modelo activo, columna de fecha)
+TIPOS = {
+    'compra': (CompraMateriaPrima, 'fecha_compra'),
+    'cronograma': (EventoCronograma, 'fecha_programada'),
+    'movimiento': (MovimientoCapital, 'fecha_movimiento'),
+    'mortalidad': (MortalidadLote, 'fecha_registro'),
+    'pago': (PagoCliente, 'fecha_pago'),
+    'venta': (Venta, 'fecha_venta'),
+}
+
+
+def codificar_cursor(fecha, tipo, id_evento):
+    """Cursor de paginación: 'AAAA-MM-DD|tipo|id' del último evento de la página"""
+    return f'{fecha.isoformat()}|{tipo}|{id_evento}'
+
+
+def decodificar_cursor(cursor):
+    """(fecha, tipo, id) de un cursor; ValueError si no es válido"""
+    try:
+        fecha, tipo, id_evento = cursor.split('|')
+        fecha, id_evento = date.fromisoformat(fecha), int(id_evento)
+    except ValueError:
+        raise ValueError('Cursor no válido')
+    if tipo not in TIPOS:
+        raise ValueError('Cursor no válido')
+    return fecha, tipo, id_evento
+
+
+def _despues_de(tipo, fecha, pk, cursor, descendente):
+    """Filtro de la rama para los eventos que siguen al cursor en el orden (fecha, tipo, id).
+    
+    El tipo es constante en cada rama, así que la comparación se resuelve aquí y
+    en SQL queda solo un rango sobre (fecha, id).
+    """
+    sigue, sigue_o_igual = (operator.lt, operator.le) if descendente else (operator.gt, operator.ge)
+    fecha_cursor, tipo_cursor, id_cursor = cursor
+    if tipo == tipo_cursor:
+        return or_(sigue(fecha, fecha_cursor), and_(fecha == fecha_cursor, sigue(pk, id_cursor)))
+    if sigue(tipo, tipo_cursor):
+        return sigue_o_igual(fecha, fecha_cursor)
+    return sigue(fecha, fecha_cursor)
+
+
+def _rama(tipo, modelos, id_lote, cursor, limite, descendente):
+    """SELECT (fecha, tipo, id) de un tipo de evento, ya filtrado y cortado en la página"""
+    modelo, columna_fecha = TIPOS[tipo]
+    tabla = modelos[modelo].__table__
+    fecha = tabla.c[columna_fecha]
+    pk = tabla.primary_key.columns[0]
+    
+    consulta = select(fecha.label('fecha'), literal(tipo).label('tipo'), pk.label('id'))
+    if modelo is PagoCliente:
+        # Los pagos llegan al lote por crédito -> venta
+        creditos = modelos[VentaCredito].__table__
+        ventas = modelos[Venta].__table__
+        consulta = consulta.select_from(
+            tabla.join(creditos, creditos.c.id_credito == tabla.c.id_credito)
+            .join(ventas, ventas.c.id_venta == creditos.c.id_venta)
+        ).where(ventas.c.id_lote == id_lote)
+    else:
+        consulta = consulta.where(tabla.c.id_lote == id_lote)
+    
+    if cursor:
+        consulta = consulta.where(_despues_de(tipo, fecha, pk, cursor, descendente))
+    
+    orden = (fecha.desc(), pk.desc()) if descendente else (fecha, pk)
+    # Envuelta en subconsulta para que ORDER BY/LIMIT valgan dentro del UNION ALL
+    return select(consulta.order_by(*orden).limit(limite).subquery())
+
+
+def pagina_timeline(id_lote, tipos, cursor=None, limite=50, descendente=False):
+    """Una página de la línea de tiempo: (eventos, cursor siguiente o None)"""
+    # Un lote archivado se lee completo de las tablas *_archivo
+    if lote_archivado(id_lote):
+        modelos = MODELOS_ARCHIVO
+    else:
+        modelos = {modelo: modelo for modelo in MODELOS_ARCHIVO}
+    
+    timeline = union_all(*[
+        _rama(tipo, modelos, id_lote, cursor, limite + 1, descendente) for tipo in tipos
+    ]).subquery('timeline')
+    orden = [timeline.c.fecha, timeline.c.tipo, timeline.c.id]
+    if descendente:
+        orden = [columna.desc() for columna in orden]
+    filas = db.session.execute(select(timeline).order_by(*orden).limit(limite + 1)).all()
+    
+    siguiente = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        siguiente = codificar_cursor(*filas[-1])
+    
+    # Detalle de cada evento: una consulta por tipo presente en la página
+    ids_por_tipo = defaultdict(list)
+    for fila in filas:
+        ids_por_tipo[fila.tipo].append(fila.id)
+    
+    detalles = {}
+    for tipo, ids in ids_por_tipo.items():
+        modelo = modelos[TIPOS[tipo][0]]
+        pk = modelo.__table__.primary_key.columns[0]
+        for obj in modelo.query.filter(pk.in_(ids)).all():
+            detalles[(tipo, getattr(obj, pk.key))] = obj.to_dict()
+    
+    eventos = [
+        {
+            'tipo': fila.tipo,
+            'fecha': fila.fecha.isoformat(),
+            'id': fila.id,
+            'detalle': detalles.get((fila.tipo, fila.id))
+        }
+        for fila in filas
+    ]
+    return eventos, siguiente
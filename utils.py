@@ -0,0 +1,310 @@
+"""
+Utilidades compartidas por los blueprints
+Serialización, proyección de campos, formatos tabulares, caché de lotes cerrados,
+clase de consulta de las rutas y búsqueda normalizada
+"""
+
+from flask import Response, current_app, g, jsonify, request
+from datetime import datetime, date
+from decimal import Decimal
+from functools import wraps
+from urllib.parse import urlencode
+from sqlalchemy import and_
+from models import (
+    db, Lote, CacheRespuestaLote, CacheReporte, RegistroEliminado, TerminoBusqueda, permitir_escritura
+)
+from referencia import marcar_cambio_referencia
+
+try:
+    import msgpack
+except ImportError:  # Formato MessagePack opcional
+    msgpack = None
+
+
+# ============================================
+# SERIALIZACIÓN Y PROYECCIÓN DE CAMPOS
+# ============================================
+
+def serializar_valor(valor):
+    """Convierte Decimal y fechas a tipos JSON"""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def campos_solicitados(modelo):
+    """Columnas pedidas en ?fields=a,b,c (None si no se pidió proyección)"""
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    
+    columnas = modelo.__table__.columns
+    nombres = [nombre.strip() for nombre in fields.split(',') if nombre.strip()]
+    invalidos = [nombre for nombre in nombres if nombre not in columnas]
+    if invalidos:
+        raise ValueError(f"Campos no válidos: {', '.join(invalidos)}")
+    
+    return [columnas[nombre] for nombre in nombres]
+
+
+def serializar_listado(query, campos):
+    """Serializa un listado completo o, si hay campos, solo esas columnas del SELECT"""
+    if campos is None:
+        return [obj.to_dict() for obj in query.all()]
+    
+    nombres = [columna.key for columna in campos]
+    return [
+        {nombre: serializar_valor(valor) for nombre, valor in zip(nombres, fila)}
+        for fila in query.with_entities(*campos).all()
+    ]
+
+
+# ============================================
+# FORMATOS TABULARES (COLUMNAR / MESSAGEPACK)
+# ============================================
+
+MIME_COLUMNAR = 'application/vnd.pollo.columnar+json'
+MIME_MSGPACK = 'application/x-msgpack'
+
+
+def formato_tabular():
+    """Formato tabular negociado: 'columnar', 'msgpack' o None para el JSON de siempre"""
+    formato = request.args.get('formato')
+    if formato in ('columnar', 'msgpack'):
+        return formato
+    
+    # Solo cuenta el tipo nombrado explícitamente: */* (fetch, curl) recibe el JSON de siempre
+    explicitos = {valor: calidad for valor, calidad in request.accept_mimetypes if calidad > 0}
+    calidad_msgpack = explicitos.get(MIME_MSGPACK, 0)
+    calidad_columnar = explicitos.get(MIME_COLUMNAR, 0)
+    if calidad_msgpack and calidad_msgpack >= calidad_columnar:
+        return 'msgpack'
+    if calidad_columnar:
+        return 'columnar'
+    return None
+
+
+def respuesta_tabular(resultado, formato):
+    """Construye {'columns': [...], 'rows': [[...]]} directamente de las tuplas del resultado"""
+    return respuesta_filas(list(resultado.keys()), resultado, formato)
+
+
+def respuesta_filas(columnas, filas, formato):
+    """Como respuesta_tabular, para filas (tuplas) ya armadas en Python"""
+    filas = [[serializar_valor(valor) for valor in fila] for fila in filas]
+    cuerpo = {'success': True, 'data': {'columns': columnas, 'rows': filas}}
+    
+    if formato == 'msgpack':
+        if msgpack is None:
+            return jsonify({'success': False, 'error': 'MessagePack no está disponible en el servidor'}), 406
+        return Response(msgpack.packb(cuerpo), mimetype=MIME_MSGPACK), 200
+    
+    response = jsonify(cuerpo)
+    response.mimetype = MIME_COLUMNAR
+    return response, 200
+
+
+# ============================================
+# CACHÉ DE LOTES CERRADOS
+# ============================================
+
+def _cabecera_cache_lote(response):
+    response.headers['Cache-Control'] = f"public, max-age={current_app.config['CACHE_LOTE_CERRADO_MAX_AGE']}"
+    return response
+
+
+# Parámetros que cambian la respuesta cacheada; el resto (primaria, perfilar...) no forma la clave
+PARAMETROS_CACHE_LOTE = ('fields', 'formato')
+
+
+def _clave_cache_lote():
+    """Ruta más los parámetros de PARAMETROS_CACHE_LOTE; None si no cabe en la columna"""
+    parametros = [(nombre, request.args[nombre]) for nombre in PARAMETROS_CACHE_LOTE if nombre in request.args]
+    clave = f'{request.path}?{urlencode(parametros)}' if parametros else request.path
+    return clave if len(clave) <= CacheRespuestaLote.ruta.type.length else None
+
+
+def invalidar_cache_lote(id_lote):
+    """Elimina las respuestas cacheadas de un lote (se confirma con la transacción actual)"""
+    CacheRespuestaLote.query.filter_by(id_lote=id_lote).delete(synchronize_session=False)
+
+
+def cache_lote_cerrado(vista):
+    """Sirve desde caché las respuestas de lotes cerrados; las guarda en la primera lectura"""
+    @wraps(vista)
+    def envoltura(id_lote, *args, **kwargs):
+        ruta = _clave_cache_lote()
+        estado = db.session.query(Lote.estado).filter_by(id_lote=id_lote).scalar()
+        if ruta is None or estado != 'cerrado':
+            return vista(id_lote, *args, **kwargs)
+        
+        # Lo que se guarda se lee en la primaria: una réplica atrasada guardaría
+        # una respuesta anterior a un pago o borrado ya invalidado
+        g.usar_replica = False
+        
+        cacheada = CacheRespuestaLote.query.filter_by(id_lote=id_lote, ruta=ruta).first()
+        if cacheada:
+            return _cabecera_cache_lote(Response(cacheada.contenido, mimetype=cacheada.mimetype))
+        
+        response = current_app.make_response(vista(id_lote, *args, **kwargs))
+        if response.status_code != 200:
+            return response
+        
+        # Pudo reabrirse mientras se calculaba
+        estado = db.session.query(Lote.estado).filter_by(id_lote=id_lote).scalar()
+        if estado != 'cerrado':
+            return response
+        
+        try:
+            permitir_escritura()
+            db.session.add(CacheRespuestaLote(
+                id_lote=id_lote,
+                ruta=ruta,
+                contenido=response.get_data(as_text=True),
+                mimetype=response.mimetype
+            ))
+            db.session.commit()
+        except Exception:
+            # Otro worker pudo guardarla primero; la respuesta sigue siendo válida
+            db.session.rollback()
+        
+        return _cabecera_cache_lote(response)
+    return envoltura
+
+
+# ============================================
+# CACHÉ DE REPORTES
+# ============================================
+
+# Contador en versiones_referencia de las invalidaciones de reportes cacheados
+CONJUNTO_REPORTES = 'reportes'
+
+
+def invalidar_reportes(fecha, hasta=None):
+    """Elimina los reportes cacheados cuyo rango incluye una fecha modificada del libro
+    (o se cruza con el rango fecha..hasta)"""
+    hasta = hasta or fecha
+    # Solo se cachean rangos ya cerrados (hasta < hoy): una fecha de hoy no cae en
+    # ninguno. El contador sube antes del borrado y queda bloqueado hasta el commit,
+    # así un reporte calculado antes de este cambio no llega a guardarse.
+    if fecha < date.today():
+        marcar_cambio_referencia(CONJUNTO_REPORTES)
+    CacheReporte.query.filter(
+        CacheReporte.desde <= hasta,
+        CacheReporte.hasta >= fecha
+    ).delete(synchronize_session=False)
+
+
+# ============================================
+# SINCRONIZACIÓN INCREMENTAL
+# ============================================
+
+def registrar_eliminacion(tabla, id_registro):
+    """Deja una marca de borrado para que los clientes sincronizados eliminen su copia"""
+    db.session.add(RegistroEliminado(tabla=tabla, id_registro=id_registro))
+
+
+# ============================================
+# CLASE DE CONSULTA DE LA RUTA
+# ============================================
+
+def clase_consulta(clase):
+    """Marca la ruta como 'reporte' o 'exportacion' para su timeout de consultas"""
+    def decorador(vista):
+        vista.clase_consulta = clase
+        return vista
+    return decorador
+
+
+# ============================================
+# BÚSQUEDA (TYPEAHEAD)
+# ============================================
+
+def limite_busqueda():
+    """?limite= acotado a BUSQUEDA_LIMITE_MAXIMO; 0 o negativo no devuelve resultados"""
+    maximo = current_app.config['BUSQUEDA_LIMITE_MAXIMO']
+    limite = request.args.get('limite', current_app.config['BUSQUEDA_LIMITE'], type=int)
+    return max(0, min(limite, maximo))
+
+
+# Carácter -> siguiente en cualquier intercalación (letras y dígitos ASCII)
+_SIGUIENTE = {actual: siguiente for actual, siguiente in zip(
+    'abcdefghijklmnopqrstuvwxy012345678', 'bcdefghijklmnopqrstuvwxyz123456789'
+)}
+
+
+def _fin_de_prefijo(texto):
+    """Menor cadena mayor que todas las que empiezan con texto ('gomez' -> 'gomf'); None si no hay"""
+    base = texto.rstrip('z9')
+    if base and base[-1] in _SIGUIENTE:
+        return base[:-1] + _SIGUIENTE[base[-1]]
+    return None
+
+
+def _empieza_con(columna, texto):
+    """LIKE 'texto%' acotado además como rango [texto, fin del prefijo).
+    
+    El rango deja usar el índice a cualquier motor (el LIKE de SQLite ignora
+    mayúsculas y no usa índices); el LIKE sigue decidiendo la coincidencia.
+    """
+    escapado = texto.replace('/', '//').replace('%', '/%').replace('_', '/_')
+    condiciones = [columna >= texto, columna.like(escapado + '%', escape='/')]
+    fin = _fin_de_prefijo(texto)
+    if fin:
+        condiciones.append(columna < fin)
+    return and_(*condiciones)
+
+
+def buscar_normalizado(query, entidad, pk, orden, termino, limite, prefijos_extra=()):
+    """Busca por nombre normalizado (y columnas extra por prefijo) ordenando por relevancia.
+    
+    Cada fase es una consulta sobre un solo índice con su propio LIMIT y solo
+    corre si las anteriores no llenaron el límite:
+    1. Prefijo del nombre completo y, por separado, de cada prefijos_extra
+       [(columna, término)]; se unen ordenados por nombre.
+    2. Inicio de palabra vía terminos_busqueda (índice invertido), recorrido en
+       el orden del índice: la palabra más larga del término acota y las demás
+       filtran.
+    3. Solo si no hubo resultados y el término tiene BUSQUEDA_SUBCADENA_MINIMO
+       caracteres: subcadena en cualquier posición (recorre el índice del nombre).
+    
+    Con limite 0 no consulta nada.
+    """
+    if limite <= 0:
+        return []
+    
+    resultados = query.filter(_empieza_con(orden, termino)).order_by(orden).limit(limite).all()
+    for columna, valor in prefijos_extra:
+        if valor and len(resultados) < limite:
+            encontrados = [getattr(fila, pk.key) for fila in resultados]
+            resultados += query.filter(
+                _empieza_con(columna, valor), pk.notin_(encontrados)
+            ).order_by(columna).limit(limite - len(resultados)).all()
+    if prefijos_extra:
+        resultados.sort(key=lambda fila: getattr(fila, orden.key) or '')
+    
+    if len(resultados) < limite:
+        palabras = termino.split()
+        clave = max(palabras, key=len)
+        encontrados = {getattr(fila, pk.key) for fila in resultados}
+        por_palabra = query.join(TerminoBusqueda, and_(
+            TerminoBusqueda.entidad == entidad, TerminoBusqueda.id_registro == pk
+        )).filter(
+            _empieza_con(TerminoBusqueda.termino, clave),
+            *[orden.contains(palabra, autoescape=True) for palabra in palabras if palabra != clave],
+            pk.notin_(encontrados)
+        ).order_by(TerminoBusqueda.termino, TerminoBusqueda.id_termino).limit(limite - len(resultados)).all()
+        # Un registro con dos palabras que empiezan igual aparece dos veces
+        for fila in por_palabra:
+            if getattr(fila, pk.key) not in encontrados:
+                encontrados.add(getattr(fila, pk.key))
+                resultados.append(fila)
+    
+    if not resultados and len(termino) >= current_app.config['BUSQUEDA_SUBCADENA_MINIMO']:
+        resultados = query.filter(
+            orden.contains(termino, autoescape=True)
+        ).order_by(orden).limit(limite).all()
+    
+    return resultados